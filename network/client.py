@@ -0,0 +1,520 @@
+# Network Client .py
+
+import time
+import asyncio
+import threading
+
+from collections import deque
+
+from sdk.crdt           import c_sequence, c_replica, c_snapshot_loader
+from network.protocol   import *
+from network.operations import coalesce_operations, encode_batch, decode_batch
+from network.presence   import c_presence, PRESENCE_INTERVAL
+
+DEFAULT_HOST:       str     = "127.0.0.1"
+DEFAULT_PORT:       int     = 7420
+
+DEFAULT_CADENCE:    float   = 0.03      # Seconds between sends of local edits
+DRAIN_BUDGET:       float   = 0.004     # Max seconds per frame spent on applying remote operations
+RECONNECT_DELAY:    float   = 1.0       # Seconds between connection attempts
+
+
+class c_sync_client:
+    """
+        Client side sync pump.
+
+        Runs asyncio on a background thread. The ui thread and the
+        network thread only share 2 deques (append / popleft are atomic),
+        so neither side waits for the other :
+        - local operations are queued on edit and sent together each cadence
+        - received operations are applied on the ui thread in pre_draw,
+          limited by time per frame, so a burst is spread over frames
+        - presence (carets) has its own queue and is sent on its own interval
+
+        A client that starts with an empty document asks the server for
+        the stored document. Snapshot chunks are shown as they arrive,
+        remote operations wait until the catch up is done. The document
+        is read only while a snapshot is shown, until is_synced( ).
+
+        After a reconnect the client resumes : it sends its state vector
+        and gets the stored operations it missed, and sends again the
+        batches the server did not acknowledge.
+    """
+
+    _replica:       c_replica   # Replicated document
+    _room:          str         # Server room (document id)
+    _host:          str
+    _port:          int
+    _cadence:       float       # Seconds between sends
+
+    _outgoing:      deque       # Local operations lists (ui thread -> network thread)
+    _unacked:       deque       # Encoded batches sent and not acknowledged by the server (network thread)
+    _incoming:      deque       # Encoded remote operations (network thread -> ui thread)
+
+    _presence:          c_presence  # Local and peers presence
+    _presence_incoming: deque       # Presence messages (network thread -> ui thread)
+
+    _catch_up:      deque               # ( kind, payload ) join / snapshot chunks / synced marks (network thread -> ui thread)
+    _loader:        c_snapshot_loader   # Snapshot being received (None if none)
+    _is_synced:     bool                # Is the catch up done, remote operations are applied
+
+    _ui:            any         # c_ui the pump is attached to (can be None)
+    _views:         list        # Views with .visible_lines( ) used to decide on redraw
+    _touched:       list        # ( line, removed lines, inserted lines ) of remote edits while draining
+    _is_draining:   bool
+
+    _loop:          asyncio.AbstractEventLoop
+    _thread:        threading.Thread
+    _task:          asyncio.Task
+    _is_running:    bool
+    _is_connected:  bool
+
+    _sent:          int         # Sent frames
+    _received:      int         # Received frames
+    _applied:       int         # Applied frames
+
+    def __init__( self, replica: c_replica, room: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, cadence: float = DEFAULT_CADENCE ):
+        """
+            Constructor for sync client
+        """
+
+        self._replica       = replica
+        self._room          = room
+        self._host          = host
+        self._port          = port
+        self._cadence       = cadence
+
+        self._outgoing      = deque( )
+        self._unacked       = deque( )
+        self._incoming      = deque( )
+
+        self._presence          = c_presence( replica )
+        self._presence_incoming = deque( )
+
+        self._catch_up      = deque( )
+        self._loader        = None
+        self._is_synced     = False
+
+        self._ui            = None
+        self._views         = [ ]
+        self._touched       = [ ]
+        self._is_draining   = False
+
+        self._loop          = None
+        self._thread        = None
+        self._task          = None
+        self._is_running    = False
+        self._is_connected  = False
+
+        self._sent          = 0
+        self._received      = 0
+        self._applied       = 0
+
+        self._replica.set_event( "operation", self.__event_operation, f"SyncClient::{ id( self ) }" )
+        self._replica.document( ).set_event( "change", self.__event_document_change, f"SyncClient::{ id( self ) }" )
+
+    # region : Control
+
+    def attach( self, ui: any ) -> None:
+        """
+            Drain remote operations before each frame of c_ui
+        """
+
+        self._ui = ui
+        self._ui.set_event( "pre_draw", self.__event_pre_draw, f"SyncClient::{ id( self ) }" )
+
+    def watch( self, view: any ) -> None:
+        """
+            Redraw when remote edits touch visible lines of view
+        """
+
+        if not view in self._views:
+            self._views.append( view )
+
+    def unwatch( self, view: any ) -> None:
+
+        if view in self._views:
+            self._views.remove( view )
+
+    def start( self ) -> None:
+        """
+            Start the network thread
+        """
+
+        if self._is_running:
+            return
+
+        self._is_running    = True
+        self._thread        = threading.Thread( target=self.__thread, daemon=True )
+        self._thread.start( )
+
+    def stop( self ) -> None:
+        """
+            Stop the network thread
+        """
+
+        if not self._is_running:
+            return
+
+        self._is_running = False
+
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe( self._task.cancel )
+
+        self._thread.join( )
+        self._thread = None
+
+    def release( self ) -> None:
+        """
+            Stop and detach from the replica
+        """
+
+        self.stop( )
+
+        self._replica.unset_event( "operation", f"SyncClient::{ id( self ) }" )
+        self._replica.document( ).unset_event( "change", f"SyncClient::{ id( self ) }" )
+
+    def presence( self ) -> c_presence:
+        """
+            Returns presence of this document (pass it to the editor)
+        """
+
+        return self._presence
+
+    def is_connected( self ) -> bool:
+
+        return self._is_connected
+
+    def is_synced( self ) -> bool:
+        """
+            Did the client catch up with the stored document
+        """
+
+        return self._is_synced
+
+    def cadence( self, new_value: float = None ) -> float | None:
+        """
+            Returns / Sets seconds between sends of local edits
+        """
+
+        if new_value is None:
+            return self._cadence
+
+        self._cadence = new_value
+
+    def stats( self ) -> dict:
+        """
+            Returns sync traffic information
+        """
+
+        return {
+            "connected":    self._is_connected,
+            "synced":       self._is_synced,
+            "sent":         self._sent,
+            "received":     self._received,
+            "applied":      self._applied,
+            "outgoing":     len( self._outgoing ),
+            "incoming":     len( self._incoming ),
+            "unacked":      len( self._unacked )
+        }
+
+    # endregion
+
+    # region : UI thread
+
+    def drain( self ) -> int:
+        """
+            Apply received operations. returns applied frames count.
+            called each frame in pre_draw once attached
+        """
+
+        # Presence is small and latest wins, apply all of it
+        is_presence_changed = False
+
+        while self._presence_incoming:
+            if self._presence.apply( self._presence_incoming.popleft( ) ):
+                is_presence_changed = True
+
+        if is_presence_changed and self._ui is not None:
+            self._ui.request_redraw( )
+
+        deadline = time.perf_counter( ) + DRAIN_BUDGET
+
+        if not self._is_synced:
+            self.__drain_catch_up( deadline )
+
+            # Operations wait for the snapshot they build on
+            if not self._is_synced:
+                return 0
+
+        if not self._incoming:
+            return 0
+
+        count = 0
+
+        self._touched.clear( )
+        self._is_draining = True
+
+        try:
+            while self._incoming:
+                self._replica.apply( decode_batch( self._incoming.popleft( ) ) )
+                count += 1
+
+                # Leave the rest to next frames
+                if time.perf_counter( ) > deadline:
+                    break
+
+        finally:
+            self._is_draining = False
+
+        self._applied += count
+
+        if self._ui is not None and ( self._incoming or self.__touches_views( ) ):
+            self._ui.request_redraw( )
+
+        return count
+
+    def __drain_catch_up( self, deadline: float ) -> None:
+        """
+            Show received snapshot chunks, and restore the state once the catch up is done
+        """
+
+        if not self._catch_up:
+            return
+
+        while self._catch_up:
+            kind, payload = self._catch_up.popleft( )
+
+            if kind == MESSAGE_SYNCED:
+                if self._loader is not None:
+                    self._replica.restore( self._loader )
+                    self._loader = None
+
+                self._is_synced = True
+                break
+
+            # Reconnected, the server sends everything again. drop what was shown
+            if kind == MESSAGE_JOIN:
+                if self._loader is not None:
+                    self._replica.restore( c_sequence( ).snapshot( ) )
+                    self._loader = None
+
+                continue
+
+            if self._loader is None:
+                self._loader = c_snapshot_loader( )
+
+            # Decoded text is shown before the whole snapshot is here
+            text = self._loader.feed( payload )
+
+            if text:
+                self._replica.preview( text )
+
+            if time.perf_counter( ) > deadline:
+                break
+
+        if self._ui is not None:
+            self._ui.request_redraw( )
+
+    def __touches_views( self ) -> bool:
+        """
+            Did the drained edits change lines visible in a watched view
+        """
+
+        for view in self._views:
+            first, last = view.visible_lines( )
+
+            for line, removed_lines, inserted_lines in self._touched:
+                # Edit inside the view, or above it while lines count changed
+                if line < last and ( line >= first or removed_lines != inserted_lines ):
+                    return True
+
+        return False
+
+    def __event_pre_draw( self, event ) -> None:
+
+        self.drain( )
+
+    def __event_operation( self, event ) -> None:
+        """
+            Local edit. queue it for the next send
+        """
+
+        self._outgoing.append( event( "operations" ) )
+
+    def __event_document_change( self, event ) -> None:
+        """
+            Track lines changed by remote operations
+        """
+
+        if self._is_draining:
+            self._touched.append( ( event( "line" ), event( "removed_lines" ), event( "inserted_lines" ) ) )
+
+    # endregion
+
+    # region : Network thread
+
+    def __thread( self ) -> None:
+        """
+            Network thread entry
+        """
+
+        self._loop = asyncio.new_event_loop( )
+
+        try:
+            self._task = self._loop.create_task( self.__run( ) )
+            self._loop.run_until_complete( self._task )
+
+        except asyncio.CancelledError:
+            pass
+
+        finally:
+            self._loop.close( )
+            self._loop = None
+
+    async def __run( self ) -> None:
+        """
+            Connect and keep the connection while running
+        """
+
+        while self._is_running:
+            try:
+                reader, writer = await asyncio.open_connection( self._host, self._port )
+            except OSError:
+                await asyncio.sleep( RECONNECT_DELAY )
+                continue
+
+            sequence    = self._replica.sequence( )
+            flags       = 0
+            state       = None
+
+            # Empty document that was never synced, get the stored one
+            if not self._is_synced and len( sequence ) == 0:
+                flags = JOIN_CATCH_UP
+                self._catch_up.append( ( MESSAGE_JOIN, b"" ) )
+
+            # Reconnected, get what was sent while away
+            elif self._is_synced:
+                flags = JOIN_RESUME
+                state = sequence.state_vector( )
+
+            writer.write( pack_join( self._room, sequence.site( ), flags, state ) )
+
+            # Batches written to the closed connection may be lost, applying twice is harmless
+            for data in self._unacked:
+                writer.write( pack_frame( MESSAGE_OPERATIONS, data ) )
+
+            sender      = asyncio.get_running_loop( ).create_task( self.__send_loop( writer ) )
+            presence    = asyncio.get_running_loop( ).create_task( self.__presence_loop( writer ) )
+
+            try:
+                await self.__receive_loop( reader )
+
+            finally:
+                self._is_connected = False
+
+                sender.cancel( )
+                presence.cancel( )
+                writer.close( )
+
+            if self._is_running:
+                await asyncio.sleep( RECONNECT_DELAY )
+
+    async def __send_loop( self, writer: asyncio.StreamWriter ) -> None:
+        """
+            Send queued local operations once per cadence
+        """
+
+        outgoing = self._outgoing
+
+        while True:
+            await asyncio.sleep( self._cadence )
+
+            if not outgoing:
+                continue
+
+            operations = [ ]
+
+            while outgoing:
+                operations.extend( outgoing.popleft( ) )
+
+            # Keystrokes of the last cadence become few range operations
+            operations = coalesce_operations( operations )
+
+            if not operations:
+                continue
+
+            data = encode_batch( operations )
+
+            # Kept until the server acknowledges it
+            self._unacked.append( data )
+
+            writer.write( pack_frame( MESSAGE_OPERATIONS, data ) )
+            self._sent += 1
+
+            await writer.drain( )
+
+    async def __presence_loop( self, writer: asyncio.StreamWriter ) -> None:
+        """
+            Send latest local presence when it changed, at most each interval
+        """
+
+        sent_version = 0
+
+        while True:
+            await asyncio.sleep( PRESENCE_INTERVAL )
+
+            version, frame = self._presence.outgoing( )
+
+            if version == sent_version or frame is None:
+                continue
+
+            sent_version = version
+            writer.write( frame )
+
+    async def __receive_loop( self, reader: asyncio.StreamReader ) -> None:
+        """
+            Read frames until the connection is closed
+        """
+
+        incoming = self._incoming
+
+        while True:
+            frame = await read_frame( reader )
+
+            if frame is None:
+                return
+
+            kind, payload = frame
+
+            if kind == MESSAGE_OPERATIONS:
+                incoming.append( payload )
+                self._received += 1
+
+                # Wake the ui loop only for the first queued frame
+                if len( incoming ) == 1 and self._ui is not None:
+                    self._ui.wake( )
+
+            elif kind == MESSAGE_PRESENCE:
+                self._presence_incoming.append( payload )
+
+                if len( self._presence_incoming ) == 1 and self._ui is not None:
+                    self._ui.wake( )
+
+            elif kind == MESSAGE_SNAPSHOT or kind == MESSAGE_SYNCED:
+                if self._is_synced:
+                    continue
+
+                self._catch_up.append( ( kind, payload ) )
+
+                if len( self._catch_up ) == 1 and self._ui is not None:
+                    self._ui.wake( )
+
+            elif kind == MESSAGE_ACK:
+                for _ in range( min( unpack_ack( payload ), len( self._unacked ) ) ):
+                    self._unacked.popleft( )
+
+            elif kind == MESSAGE_WELCOME:
+                self._is_connected = True
+
+    # endregion
@@ -0,0 +1,213 @@
+# Network Operations .py
+
+import zlib
+
+from sdk.binary         import c_writer, c_reader
+from sdk.crdt           import OP_INSERT, OP_DELETE
+from network.protocol   import MAX_FRAME_SIZE
+
+BATCH_PLAIN:        int = 0     # Batch body is not compressed
+BATCH_ZLIB:         int = 1     # Batch body is zlib compressed
+
+MIN_COMPRESS_SIZE:  int = 96    # Smaller batches are never compressed
+COMPRESS_LEVEL:     int = 6
+
+ORIGIN_START:       int = 0     # Insert at document start
+ORIGIN_PREVIOUS:    int = 1     # Origin is the char before in the same site ( site, clock - 1 )
+ORIGIN_SAME_SITE:   int = 2     # Origin from the same site, clock delta
+ORIGIN_OTHER_SITE:  int = 3     # Origin from another site, site index and clock
+
+
+def coalesce_operations( operations: list ) -> list:
+    """
+        Merge operations of typing into range operations.
+
+        - consecutive chars typed by one site become one insert
+        - backspaces / deletes of adjacent ids become one delete
+        - backspace of text that is still in the batch removes it from the insert
+    """
+
+    result = [ ]
+
+    for operation in operations:
+        last = result and result[ -1 ] or None
+
+        if last is None:
+            result.append( operation )
+            continue
+
+        if operation[ 0 ] == OP_INSERT:
+            _, site, clock, origin, text = operation
+
+            # Typed right after the previous insert
+            if last[ 0 ] == OP_INSERT and last[ 1 ] == site and last[ 2 ] + len( last[ 4 ] ) == clock and origin == ( site, clock - 1 ):
+                result[ -1 ] = ( OP_INSERT, site, last[ 2 ], last[ 3 ], last[ 4 ] + text )
+                continue
+
+            result.append( operation )
+            continue
+
+        _, site, clock, length = operation
+
+        if last[ 0 ] == OP_DELETE and last[ 1 ] == site:
+            # Backspace. range ends where the previous one starts
+            if clock + length == last[ 2 ]:
+                result[ -1 ] = ( OP_DELETE, site, clock, length + last[ 3 ] )
+                continue
+
+            # Delete key. range starts where the previous one ends
+            if last[ 2 ] + last[ 3 ] == clock:
+                result[ -1 ] = ( OP_DELETE, site, last[ 2 ], last[ 3 ] + length )
+                continue
+
+        # Removes the end of an insert that was never sent, nobody else knows these ids
+        if last[ 0 ] == OP_INSERT and last[ 1 ] == site and last[ 2 ] <= clock and clock + length == last[ 2 ] + len( last[ 4 ] ):
+            keep = clock - last[ 2 ]
+
+            if keep == 0:
+                result.pop( )
+            else:
+                result[ -1 ] = ( OP_INSERT, site, last[ 2 ], last[ 3 ], last[ 4 ][ :keep ] )
+
+            continue
+
+        result.append( operation )
+
+    return result
+
+
+def encode_batch( operations: list ) -> bytes:
+    """
+        Encode operations batch.
+
+        Sites are written once in a table, clocks as signed delta from
+        the previous operation of the same site, and the body is
+        compressed with zlib only when it gets smaller
+    """
+
+    sites = { }
+
+    for operation in operations:
+        sites.setdefault( operation[ 1 ], len( sites ) )
+
+        if operation[ 0 ] == OP_INSERT and operation[ 3 ] is not None:
+            sites.setdefault( operation[ 3 ][ 0 ], len( sites ) )
+
+    writer = c_writer( )
+
+    writer.varint( len( sites ) )
+    for site in sites:
+        writer.varint( site )
+
+    writer.varint( len( operations ) )
+
+    # Expected next clock of each site
+    clocks = { }
+
+    for operation in operations:
+        kind    = operation[ 0 ]
+        site    = operation[ 1 ]
+        clock   = operation[ 2 ]
+
+        writer.varint( sites[ site ] << 1 | kind )
+        writer.signed( clock - clocks.get( site, 0 ) )
+
+        if kind == OP_INSERT:
+            origin  = operation[ 3 ]
+            text    = operation[ 4 ]
+
+            if origin is None:
+                writer.varint( ORIGIN_START )
+
+            elif origin == ( site, clock - 1 ):
+                writer.varint( ORIGIN_PREVIOUS )
+
+            elif origin[ 0 ] == site:
+                writer.varint( ORIGIN_SAME_SITE )
+                writer.signed( origin[ 1 ] - clock )
+
+            else:
+                writer.varint( ORIGIN_OTHER_SITE )
+                writer.varint( sites[ origin[ 0 ] ] )
+                writer.signed( origin[ 1 ] - clocks.get( origin[ 0 ], 0 ) )
+
+            writer.string( text )
+            clocks[ site ] = clock + len( text )
+
+        else:
+            writer.varint( operation[ 3 ] )
+            clocks[ site ] = clock + operation[ 3 ]
+
+    body = writer.get( )
+
+    if len( body ) >= MIN_COMPRESS_SIZE:
+        compressed = zlib.compress( body, COMPRESS_LEVEL )
+
+        if len( compressed ) < len( body ):
+            return bytes( ( BATCH_ZLIB, ) ) + compressed
+
+    return bytes( ( BATCH_PLAIN, ) ) + body
+
+
+def decode_batch( data: bytes ) -> list:
+    """
+        Decode operations batch created by encode_batch
+    """
+
+    if len( data ) == 0:
+        raise Exception( "Empty operations batch" )
+
+    flags   = data[ 0 ]
+    body    = data[ 1: ]
+
+    if flags == BATCH_ZLIB:
+        decompressor    = zlib.decompressobj( )
+        body            = decompressor.decompress( body, MAX_FRAME_SIZE )
+
+        if decompressor.unconsumed_tail:
+            raise Exception( "Operations batch is too big" )
+
+    elif flags != BATCH_PLAIN:
+        raise Exception( f"Unknown operations batch flags { flags }" )
+
+    reader  = c_reader( body )
+    sites   = [ reader.varint( ) for _ in range( reader.varint( ) ) ]
+
+    operations  = [ ]
+    clocks      = { }
+
+    for _ in range( reader.varint( ) ):
+        head    = reader.varint( )
+        kind    = head & 1
+        site    = sites[ head >> 1 ]
+        clock   = clocks.get( site, 0 ) + reader.signed( )
+
+        if kind == OP_INSERT:
+            origin_kind = reader.varint( )
+            origin      = None
+
+            if origin_kind == ORIGIN_PREVIOUS:
+                origin = ( site, clock - 1 )
+
+            elif origin_kind == ORIGIN_SAME_SITE:
+                origin = ( site, clock + reader.signed( ) )
+
+            elif origin_kind == ORIGIN_OTHER_SITE:
+                origin_site = sites[ reader.varint( ) ]
+                origin      = ( origin_site, clocks.get( origin_site, 0 ) + reader.signed( ) )
+
+            elif origin_kind != ORIGIN_START:
+                raise Exception( f"Unknown origin kind { origin_kind }" )
+
+            text = reader.string( )
+
+            operations.append( ( OP_INSERT, site, clock, origin, text ) )
+            clocks[ site ] = clock + len( text )
+
+        else:
+            length = reader.varint( )
+
+            operations.append( ( OP_DELETE, site, clock, length ) )
+            clocks[ site ] = clock + length
+
+    return operations
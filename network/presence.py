@@ -0,0 +1,127 @@
+# Network Presence .py
+
+from sdk.crdt           import c_sequence, c_replica
+from network.protocol   import *
+
+PRESENCE_INTERVAL:  float = 0.05    # Local presence is sent at most at 20 Hz
+
+
+class c_presence:
+    """
+        Presence of the users in a shared document.
+
+        Carets and selections are kept as CRDT char ids, so a peer
+        caret stays on the same char while other users edit before it.
+        Local presence is kept as the latest frame only, the network
+        thread sends it when it changed and at most each interval.
+    """
+
+    _sequence:      c_sequence  # Replication state to convert ids <-> offsets
+    _site:          int         # Local site
+
+    _peers:         dict        # site -> ( caret id, anchor id )
+
+    _local:         tuple       # Last local ( caret, anchor ) offsets
+    _local_ids:     tuple       # Last local ( caret, anchor ) ids
+    _outgoing:      tuple       # ( version, frame ) of latest local presence
+
+    def __init__( self, replica: c_replica ):
+        """
+            Constructor for presence
+        """
+
+        self._sequence  = replica.sequence( )
+        self._site      = self._sequence.site( )
+
+        self._peers     = { }
+
+        self._local     = None
+        self._local_ids = None
+        self._outgoing  = ( 0, None )
+
+    # region : Local
+
+    def local( self, caret: int, anchor: int = None ) -> None:
+        """
+            Update local caret and selection anchor (offsets).
+            cheap to call each frame, frame is built only after a change
+        """
+
+        if anchor is None:
+            anchor = caret
+
+        if self._local == ( caret, anchor ):
+            return
+
+        self._local = ( caret, anchor )
+
+        ids = ( self._sequence.anchor( caret ), self._sequence.anchor( anchor ) )
+
+        # Offsets moved because of edits before the caret, but it is on the same char
+        if ids == self._local_ids:
+            return
+
+        self._local_ids = ids
+
+        # Single assignment, read by the network thread
+        self._outgoing = ( self._outgoing[ 0 ] + 1, pack_presence( self._site, ids[ 0 ], ids[ 1 ] ) )
+
+    def outgoing( self ) -> tuple:
+        """
+            Returns ( version, frame ) of latest local presence
+        """
+
+        return self._outgoing
+
+    # endregion
+
+    # region : Peers
+
+    def apply( self, payload: bytes ) -> bool:
+        """
+            Apply presence message of a peer. returns True if something changed
+        """
+
+        state, site, caret, anchor = unpack_presence( payload )
+
+        if site == self._site:
+            return False
+
+        if state == PRESENCE_GONE:
+            return self._peers.pop( site, None ) is not None
+
+        if self._peers.get( site ) == ( caret, anchor ):
+            return False
+
+        self._peers[ site ] = ( caret, anchor )
+
+        return True
+
+    def peers( self ) -> list:
+        """
+            Returns [ ( site, caret offset, anchor offset ) ] of peers,
+            peers that point to chars we did not receive yet are skipped
+        """
+
+        result      = [ ]
+        resolve     = self._sequence.resolve
+
+        for site, ( caret, anchor ) in self._peers.items( ):
+            caret_offset    = resolve( caret )
+            anchor_offset   = resolve( anchor )
+
+            if caret_offset is None:
+                continue
+
+            if anchor_offset is None:
+                anchor_offset = caret_offset
+
+            result.append( ( site, caret_offset, anchor_offset ) )
+
+        return result
+
+    def __len__( self ) -> int:
+
+        return len( self._peers )
+
+    # endregion
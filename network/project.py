@@ -0,0 +1,861 @@
+# Network Project .py
+
+import os
+import mmap
+import asyncio
+import hashlib
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+
+from sdk.tree           import TREE_SEPARATOR
+from sdk.scanner        import c_project_scanner
+from network.protocol   import *
+
+DEFAULT_HOST:       str     = "127.0.0.1"
+DEFAULT_PORT:       int     = 7421
+
+HASH_SIZE:          int     = 16                # Bytes of content / node hashes
+MERKLE_BITS:        int     = 4                 # Children per node is 2 ** bits
+MERKLE_DEPTH:       int     = 4                 # Levels under the root, the last one are leaves (buckets of files)
+EMPTY_HASH:         bytes   = bytes( HASH_SIZE ) # Hash of a node without files
+
+POOL_MIN_FILES:     int     = 64                # Less changed files are hashed without the process pool
+POOL_CHUNK:         int     = 16                # Files per process pool task
+FILE_CHUNK:         int     = 1024 * 1024       # Bytes per file frame
+FILE_GET_BATCH:     int     = 256               # Paths per files request
+
+SYNC_INTERVAL:      float   = 2.0               # Seconds between trees compares of a connected peer
+RECONNECT_DELAY:    float   = 1.0               # Seconds between connection attempts
+
+SYNC_FOLDER:        str     = ".sync"           # Folder of the project where received files are written until complete (not scanned)
+
+
+def hash_file( path: str ) -> bytes | None:
+    """
+        Returns content hash of a file (None if it can not be read).
+        runs in pool processes, the file is mapped and not read into memory
+    """
+
+    hasher = hashlib.blake2b( digest_size=HASH_SIZE )
+
+    try:
+        with open( path, "rb" ) as file:
+            # Empty files can not be mapped
+            if os.fstat( file.fileno( ) ).st_size > 0:
+                with mmap.mmap( file.fileno( ), 0, access=mmap.ACCESS_READ ) as mapped:
+                    hasher.update( mapped )
+
+    except ( OSError, ValueError ):
+        return None
+
+    return hasher.digest( )
+
+
+def hash_files( paths: list, pool: ProcessPoolExecutor = None ) -> list:
+    """
+        Returns content hashes of files. many files are hashed on the pool
+    """
+
+    if pool is None or len( paths ) < POOL_MIN_FILES:
+        return [ hash_file( path ) for path in paths ]
+
+    return list( pool.map( hash_file, paths, chunksize=POOL_CHUNK ) )
+
+
+def is_project_path( path: str ) -> bool:
+    """
+        Is a path of a peer a relative path that stays inside the project (on any system)
+    """
+
+    if not path or "\\" in path or path[ 1:2 ] == ":" or os.path.isabs( path ):
+        return False
+
+    parts = path.split( TREE_SEPARATOR )
+
+    return not ( "" in parts or "." in parts or ".." in parts or parts[ 0 ] == SYNC_FOLDER )
+
+
+def bucket_of( path: str ) -> int:
+    """
+        Returns leaf of a path. a hash of the path, so leaves fill evenly
+    """
+
+    digest = hashlib.blake2b( encode_path( path ), digest_size=4 ).digest( )
+
+    return int.from_bytes( digest, "big" ) >> ( 32 - MERKLE_BITS * MERKLE_DEPTH )
+
+
+class c_merkle_tree:
+    """
+        Merkle tree of files content hashes.
+
+        Files go to leaves by a hash of their path, so the tree is
+        balanced whatever the folders look like, and a changed file
+        changes only the nodes above its leaf. A leaf hash covers its
+        ( path, content hash ) pairs, other nodes hash their children.
+        Nodes without files are not kept (EMPTY_HASH).
+
+        Trees of two peers are compared top down, only children with
+        different hashes are asked for, so finding k changed files of
+        n costs O(k log n) hashes in MERKLE_DEPTH + 1 round trips.
+    """
+
+    _files:     dict    # path -> ( ( mtime ns, size, inode ), content hash )
+    _leaves:    dict    # leaf -> { path : content hash }
+    _levels:    list    # level -> { prefix : node hash }. level 0 is the root, MERKLE_DEPTH the leaves
+
+    def __init__( self ):
+        """
+            Constructor for merkle tree
+        """
+
+        self._files     = { }
+        self._leaves    = { }
+        self._levels    = [ { } for _ in range( MERKLE_DEPTH + 1 ) ]
+
+    def stale( self, entries: dict ) -> tuple:
+        """
+            Returns ( changed, removed ) paths of entries ( path -> state ) against the tree
+        """
+
+        files   = self._files
+        changed = [ path for path, state in entries.items( ) if not path in files or files[ path ][ 0 ] != state ]
+        removed = [ path for path in files if not path in entries ]
+
+        return changed, removed
+
+    def update( self, files: list, removed: list = ( ) ) -> None:
+        """
+            Set files [ ( path, state, content hash ) ] and remove paths. hash None removes the file
+        """
+
+        dirty   = set( )
+        removed = list( removed )
+
+        for path, state, content_hash in files:
+            if content_hash is None:
+                removed.append( path )
+                continue
+
+            leaf = bucket_of( path )
+
+            self._files[ path ] = ( state, content_hash )
+            self._leaves.setdefault( leaf, { } )[ path ] = content_hash
+
+            dirty.add( leaf )
+
+        for path in removed:
+            if self._files.pop( path, None ) is None:
+                continue
+
+            leaf = bucket_of( path )
+
+            self._leaves[ leaf ].pop( path, None )
+            dirty.add( leaf )
+
+        self.__rehash( dirty )
+
+    def file( self, path: str ) -> tuple | None:
+        """
+            Returns ( state, content hash ) of a file (None if not in the tree)
+        """
+
+        return self._files.get( path )
+
+    def root( self ) -> bytes:
+
+        return self.hash( 0, 0 )
+
+    def hash( self, level: int, prefix: int ) -> bytes:
+
+        return self._levels[ level ].get( prefix, EMPTY_HASH )
+
+    def children( self, level: int, prefix: int ) -> list:
+        """
+            Returns [ ( child prefix, hash ) ] of the children with files
+        """
+
+        below   = self._levels[ level + 1 ]
+        first   = prefix << MERKLE_BITS
+
+        return [ ( child, below[ child ] ) for child in range( first, first + ( 1 << MERKLE_BITS ) ) if child in below ]
+
+    def entries( self, leaf: int ) -> list:
+        """
+            Returns [ ( path, content hash, mtime ns ) ] of a leaf
+        """
+
+        return [ ( path, content_hash, self._files[ path ][ 0 ][ 0 ] ) for path, content_hash in self._leaves.get( leaf, { } ).items( ) ]
+
+    def __len__( self ) -> int:
+
+        return len( self._files )
+
+    def __rehash( self, dirty: set ) -> None:
+        """
+            Hash changed leaves and the nodes above them
+        """
+
+        leaves = self._levels[ MERKLE_DEPTH ]
+
+        for leaf in dirty:
+            paths = self._leaves.get( leaf )
+
+            if not paths:
+                self._leaves.pop( leaf, None )
+                leaves.pop( leaf, None )
+                continue
+
+            # Sorted, the hash does not depend on the insert order
+            hasher = hashlib.blake2b( digest_size=HASH_SIZE )
+
+            for path in sorted( paths ):
+                hasher.update( encode_path( path ) )
+                hasher.update( b"\0" )
+                hasher.update( paths[ path ] )
+
+            leaves[ leaf ] = hasher.digest( )
+
+        for level in range( MERKLE_DEPTH - 1, -1, -1 ):
+            nodes   = self._levels[ level ]
+            dirty   = set( prefix >> MERKLE_BITS for prefix in dirty )
+
+            for prefix in dirty:
+                children = self.children( level, prefix )
+
+                if not children:
+                    nodes.pop( prefix, None )
+                    continue
+
+                hasher = hashlib.blake2b( digest_size=HASH_SIZE )
+
+                for child, child_hash in children:
+                    hasher.update( child.to_bytes( 4, "big" ) )
+                    hasher.update( child_hash )
+
+                nodes[ prefix ] = hasher.digest( )
+
+
+class c_project_link:
+    """
+        Connection to one peer
+    """
+
+    _writer:    asyncio.StreamWriter
+    _project:   str                 # Project name of the peer (None until received)
+    _requests:  int                 # Last request id
+    _pending:   dict                # request -> asyncio.Future of tree requests, or [ future, paths left ] of file requests
+    _incoming:  dict                # path -> [ temp file, hasher, request ] of files being received
+    _tasks:     list                # Running tasks of this peer (compares, sent files)
+
+    def __init__( self, writer: asyncio.StreamWriter ):
+        """
+            Constructor for project link
+        """
+
+        self._writer    = writer
+        self._project   = None
+        self._requests  = 0
+        self._pending   = { }
+        self._incoming  = { }
+        self._tasks     = [ ]
+
+    def writer( self ) -> asyncio.StreamWriter:
+
+        return self._writer
+
+    def project( self, new_project: str = None ) -> str | None:
+
+        if new_project is None:
+            return self._project
+
+        self._project = new_project
+
+    def request( self, value: any ) -> int:
+        """
+            Returns id of a new request. value is its future, or [ future, paths left ] for files
+        """
+
+        self._requests += 1
+        self._pending[ self._requests ] = value
+
+        return self._requests
+
+    def spawn( self, coroutine: any ) -> None:
+        """
+            Run coroutine until it ends or the link is closed
+        """
+
+        task = asyncio.get_running_loop( ).create_task( coroutine )
+
+        self._tasks.append( task )
+        task.add_done_callback( self._tasks.remove )
+
+    def pending( self ) -> dict:
+
+        return self._pending
+
+    def incoming( self ) -> dict:
+
+        return self._incoming
+
+    def close( self ) -> None:
+        """
+            Cancel requests and drop partly received files
+        """
+
+        for task in list( self._tasks ):
+            task.cancel( )
+
+        for value in self._pending.values( ):
+            future = value[ 0 ] if isinstance( value, list ) else value
+
+            if not future.done( ):
+                future.cancel( )
+
+        for temp, _, _ in self._incoming.values( ):
+            temp.close( )
+
+            try:
+                os.remove( temp.name )
+            except OSError:
+                pass
+
+        self._pending.clear( )
+        self._incoming.clear( )
+
+        self._writer.close( )
+
+
+class c_project_peer:
+    """
+        Shares the files of a project folder with other peers.
+
+        Each peer keeps a c_merkle_tree of the files its
+        c_project_scanner knows. Changed files are hashed again on a
+        process pool over memory mapped files, the others keep their
+        hash (same ( mtime, size, inode )).
+
+        While connected, each side asks the other for its tree top
+        down and pulls files that differ : missing ones, and ones where
+        the peer has the newer mtime (the bigger hash on a tie), so both
+        sides end with the same files. Deletions are not shared.
+        The tree stays in memory, so a peer that reconnects exchanges
+        only what changed meanwhile.
+
+        Runs asyncio on a background thread. A host listens for peers,
+        others connect to it and reconnect when the connection drops.
+    """
+
+    _scanner:       c_project_scanner   # Files of the project
+    _project:       str                 # Project name, peers of other projects are dropped
+    _host:          str
+    _port:          int
+    _is_host:       bool                # Listen for peers instead of connecting
+
+    _tree:          c_merkle_tree       # Local files hashes (used only on the network thread)
+    _version:       int                 # Scanner version the tree was updated to (None before the first update)
+    _pool:          ProcessPoolExecutor # Hashing processes (None until started)
+    _links:         dict                # c_project_link -> peer task
+
+    _loop:          asyncio.AbstractEventLoop
+    _thread:        threading.Thread
+    _task:          asyncio.Task
+    _server:        asyncio.Server      # Listening server of a host (None otherwise)
+    _listening:     threading.Event     # Set once a host listens
+    _update:        asyncio.Lock        # One tree update at a time
+    _is_running:    bool
+
+    _hashed:        int                 # Hashed files
+    _pulled:        int                 # Received files
+    _pushed:        int                 # Sent files
+    _compares:      int                 # Trees compares
+
+    def __init__( self, scanner: c_project_scanner, project: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, is_host: bool = False ):
+        """
+            Constructor for project peer.
+            a host can use port 0 to let the system choose a free port
+        """
+
+        self._scanner       = scanner
+        self._scanner.ignore( SYNC_FOLDER )
+
+        self._project       = project
+        self._host          = host
+        self._port          = port
+        self._is_host       = is_host
+
+        self._tree          = c_merkle_tree( )
+        self._version       = None
+        self._pool          = None
+        self._links         = { }
+
+        self._loop          = None
+        self._thread        = None
+        self._task          = None
+        self._server        = None
+        self._listening     = threading.Event( )
+        self._update        = None
+        self._is_running    = False
+
+        self._hashed        = 0
+        self._pulled        = 0
+        self._pushed        = 0
+        self._compares      = 0
+
+    # region : Control
+
+    def start( self ) -> None:
+        """
+            Start the network thread
+        """
+
+        if self._is_running:
+            return
+
+        self._pool          = ProcessPoolExecutor( )
+        self._is_running    = True
+        self._listening.clear( )
+
+        self._thread        = threading.Thread( target=self.__thread, daemon=True )
+        self._thread.start( )
+
+        # Port of a host is known once it listens
+        if self._is_host:
+            self._listening.wait( )
+
+    def stop( self ) -> None:
+        """
+            Stop the network thread. the tree is kept for the next start
+        """
+
+        if not self._is_running:
+            return
+
+        self._is_running = False
+
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe( self._task.cancel )
+
+        self._thread.join( )
+        self._thread = None
+
+        self._pool.shutdown( )
+        self._pool = None
+
+    def release( self ) -> None:
+
+        self.stop( )
+
+    def port( self ) -> int:
+        """
+            Returns port (the listening one of a host)
+        """
+
+        return self._port
+
+    def tree( self ) -> c_merkle_tree:
+
+        return self._tree
+
+    def is_connected( self ) -> bool:
+
+        return len( self._links ) > 0
+
+    def stats( self ) -> dict:
+        """
+            Returns sync information
+        """
+
+        return {
+            "peers":    len( self._links ),
+            "files":    len( self._tree ),
+            "hashed":   self._hashed,
+            "pulled":   self._pulled,
+            "pushed":   self._pushed,
+            "compares": self._compares
+        }
+
+    # endregion
+
+    # region : Network thread
+
+    def __thread( self ) -> None:
+        """
+            Network thread entry
+        """
+
+        self._loop = asyncio.new_event_loop( )
+
+        try:
+            self._task = self._loop.create_task( self.__run( ) )
+            self._loop.run_until_complete( self._task )
+
+        except asyncio.CancelledError:
+            pass
+
+        finally:
+            self._listening.set( )
+
+            self._loop.close( )
+            self._loop = None
+
+    async def __run( self ) -> None:
+        """
+            Listen (host) or connect while running
+        """
+
+        self._update = asyncio.Lock( )
+
+        if self._is_host:
+            self._server    = await asyncio.start_server( self.__handle_peer, self._host, self._port )
+            self._port      = self._server.sockets[ 0 ].getsockname( )[ 1 ]
+
+            self._listening.set( )
+
+            try:
+                await self._server.serve_forever( )
+
+            finally:
+                self._server.close( )
+                self._server = None
+
+                for link in list( self._links ):
+                    link.close( )
+
+                # Let peer loops see the closed streams and finish
+                await asyncio.gather( *self._links.values( ), return_exceptions=True )
+
+            return
+
+        while self._is_running:
+            try:
+                reader, writer = await asyncio.open_connection( self._host, self._port )
+            except OSError:
+                await asyncio.sleep( RECONNECT_DELAY )
+                continue
+
+            await self.__handle_peer( reader, writer )
+
+            if self._is_running:
+                await asyncio.sleep( RECONNECT_DELAY )
+
+    async def __handle_peer( self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter ) -> None:
+        """
+            Peer connection. trees are compared in the background while reading frames
+        """
+
+        link = c_project_link( writer )
+        self._links[ link ] = asyncio.current_task( )
+
+        writer.write( pack_project( self._project ) )
+
+        try:
+            await self.__receive_loop( link, reader )
+
+        except Exception:
+            # Invalid frame or connection error. drop only this peer
+            pass
+
+        finally:
+            self._links.pop( link, None )
+            link.close( )
+
+    async def __receive_loop( self, link: c_project_link, reader: asyncio.StreamReader ) -> None:
+        """
+            Read frames until the connection is closed
+        """
+
+        while True:
+            frame = await read_frame( reader )
+
+            if frame is None:
+                return
+
+            kind, payload = frame
+
+            if kind == MESSAGE_PROJECT:
+                if unpack_project( payload ) != self._project:
+                    return
+
+                link.project( self._project )
+                link.spawn( self.__compare_loop( link ) )
+
+            elif link.project( ) is None:
+                return
+
+            elif kind == MESSAGE_TREE_GET:
+                self.__send_tree( link, *unpack_tree_get( payload ) )
+
+            elif kind == MESSAGE_TREE:
+                request, level, nodes = unpack_tree( payload )
+                future = link.pending( ).pop( request, None )
+
+                if future is not None and not future.done( ):
+                    future.set_result( nodes )
+
+            elif kind == MESSAGE_FILE_GET:
+                # Not awaited, frames of the peer are read while sending
+                link.spawn( self.__send_files( link, *unpack_file_get( payload ) ) )
+
+            elif kind == MESSAGE_FILE:
+                self.__receive_file( link, *unpack_file( payload ) )
+
+    async def __compare_loop( self, link: c_project_link ) -> None:
+        """
+            Compare trees with the peer each interval, pull what differs
+        """
+
+        while True:
+            await self.__update_tree( )
+            await self.__compare( link )
+
+            # Changes on disk are found by the scanner, and show on the next compare
+            self._scanner.rescan( )
+
+            await asyncio.sleep( SYNC_INTERVAL )
+
+    async def __update_tree( self ) -> None:
+        """
+            Hash files that changed since the last update
+        """
+
+        async with self._update:
+            version = self._scanner.version( )
+
+            if version == self._version:
+                return
+
+            entries             = self._scanner.entries( )
+            changed, removed    = self._tree.stale( entries )
+
+            # Received files the scanner did not see yet are not removed
+            root    = self._scanner.root( )
+            removed = [ path for path in removed if not os.path.isfile( os.path.join( root, path ) ) ]
+
+            paths   = [ os.path.join( root, path ) for path in changed ]
+            hashes  = await asyncio.get_running_loop( ).run_in_executor( None, hash_files, paths, self._pool )
+
+            self._tree.update( [ ( path, entries.get( path ), content_hash ) for path, content_hash in zip( changed, hashes ) ], removed )
+
+            self._hashed    += len( changed )
+            self._version   = version
+
+    async def __compare( self, link: c_project_link ) -> None:
+        """
+            Walk the peer tree down where hashes differ, then pull wanted files
+        """
+
+        self._compares += 1
+
+        level       = 0
+        prefixes    = [ 0 ]
+        wanted      = [ ]
+
+        while prefixes:
+            future  = asyncio.get_running_loop( ).create_future( )
+            request = link.request( future )
+
+            link.writer( ).write( pack_tree_get( request, level, prefixes ) )
+
+            nodes       = await future
+            prefixes    = [ ]
+
+            for prefix, node_hash, items in nodes:
+                if node_hash == self._tree.hash( level, prefix ):
+                    continue
+
+                if level < MERKLE_DEPTH:
+                    local = dict( self._tree.children( level, prefix ) )
+                    prefixes.extend( child for child, child_hash in items if local.get( child ) != child_hash )
+                    continue
+
+                wanted.extend( path for path, content_hash, mtime in items if self.__is_wanted( path, content_hash, mtime ) )
+
+            level += 1
+
+        for start in range( 0, len( wanted ), FILE_GET_BATCH ):
+            paths   = wanted[ start:start + FILE_GET_BATCH ]
+            future  = asyncio.get_running_loop( ).create_future( )
+            request = link.request( [ future, set( paths ) ] )
+
+            link.writer( ).write( pack_file_get( request, paths ) )
+
+            await future
+
+        if wanted:
+            # Show received files in the tree view
+            self._scanner.rescan( )
+
+    def __is_wanted( self, path: str, content_hash: bytes, mtime: int ) -> bool:
+        """
+            Should the peer version of a file replace the local one
+        """
+
+        # Paths of a peer can not leave the project
+        if not is_project_path( path ):
+            return False
+
+        local = self._tree.file( path )
+
+        if local is None:
+            return True
+
+        state, local_hash = local
+
+        if local_hash == content_hash:
+            return False
+
+        if mtime != state[ 0 ]:
+            return mtime > state[ 0 ]
+
+        return content_hash > local_hash
+
+    def __send_tree( self, link: c_project_link, request: int, level: int, prefixes: list ) -> None:
+        """
+            Answer tree request with the hashes and children of nodes
+        """
+
+        tree    = self._tree
+        is_leaf = level >= MERKLE_DEPTH
+        nodes   = [ ]
+
+        for prefix in prefixes:
+            if is_leaf:
+                nodes.append( ( prefix, tree.hash( MERKLE_DEPTH, prefix ), tree.entries( prefix ) ) )
+            else:
+                nodes.append( ( prefix, tree.hash( level, prefix ), tree.children( level, prefix ) ) )
+
+        link.writer( ).write( pack_tree( request, level, is_leaf, nodes ) )
+
+    async def __send_files( self, link: c_project_link, request: int, paths: list ) -> None:
+        """
+            Send requested files in chunks. only files of the tree are sent
+        """
+
+        root    = self._scanner.root( )
+        real    = os.path.join( os.path.realpath( root ), "" )
+        writer  = link.writer( )
+
+        for path in paths:
+            target = os.path.join( root, path )
+
+            # Anything else, or a link that leads out of the project, is refused like a missing file
+            if not is_project_path( path ) or self._tree.file( path ) is None or not os.path.realpath( target ).startswith( real ):
+                writer.write( pack_file( request, path, 0, -1, 0, b"" ) )
+                continue
+
+            try:
+                with open( target, "rb" ) as file:
+                    stat    = os.fstat( file.fileno( ) )
+                    size    = stat.st_size
+                    offset  = 0
+
+                    # Empty file is one empty chunk
+                    while True:
+                        data = file.read( FILE_CHUNK )
+
+                        # File shrank while it was sent, the peer drops what it received
+                        if not data and offset < size:
+                            size = -1
+
+                        writer.write( pack_file( request, path, stat.st_mtime_ns, size, offset, data ) )
+                        await writer.drain( )
+
+                        offset += len( data )
+
+                        if size < 0 or offset >= size:
+                            break
+
+                if size >= 0:
+                    self._pushed += 1
+
+            except ConnectionError:
+                return
+
+            except OSError:
+                writer.write( pack_file( request, path, 0, -1, 0, b"" ) )
+
+    def __is_writable( self, root: str, target: str ) -> bool:
+        """
+            Does a received file land inside the project. its folder must resolve
+            inside the root, and the file itself must not be a link
+        """
+
+        real    = os.path.join( os.path.realpath( root ), "" )
+        folder  = os.path.join( os.path.realpath( os.path.dirname( target ) ), "" )
+
+        return folder.startswith( real ) and not os.path.islink( target )
+
+    def __receive_file( self, link: c_project_link, request: int, path: str, mtime: int, size: int, offset: int, data: bytes ) -> None:
+        """
+            Write chunk of a requested file. the file replaces the local one once complete
+        """
+
+        waiting = link.pending( ).get( request )
+
+        # Only requested paths are written
+        if waiting is None or not path in waiting[ 1 ]:
+            return
+
+        root    = self._scanner.root( )
+        target  = os.path.join( root, path )
+
+        # Checked before folders are created and before the file is replaced, a local link can lead out of the project
+        if size >= 0 and not self.__is_writable( root, target ):
+            size = -1
+
+        if size < 0:
+            # Missing on the peer, changed while it was sent, or not writable here. the next compare asks again
+            incoming = link.incoming( ).pop( path, None )
+
+            if incoming is not None:
+                incoming[ 0 ].close( )
+
+                try:
+                    os.remove( incoming[ 0 ].name )
+                except OSError:
+                    pass
+
+        else:
+            incoming = link.incoming( ).get( path )
+
+            if incoming is None:
+                # Written outside the project files, so the scanner does not see partial files
+                folder  = os.path.join( root, SYNC_FOLDER )
+                name    = f"{ id( link ) }-{ hashlib.blake2b( encode_path( path ), digest_size=8 ).hexdigest( ) }"
+
+                os.makedirs( folder, exist_ok=True )
+                os.makedirs( os.path.dirname( target ), exist_ok=True )
+
+                incoming = [ open( os.path.join( folder, name ), "wb" ), hashlib.blake2b( digest_size=HASH_SIZE ), request ]
+                link.incoming( )[ path ] = incoming
+
+            incoming[ 0 ].write( data )
+            incoming[ 1 ].update( data )
+
+            if offset + len( data ) < size:
+                return
+
+            link.incoming( ).pop( path )
+            incoming[ 0 ].close( )
+
+            # Replaced at once, with the peer mtime so the next compare sees the same version
+            os.replace( incoming[ 0 ].name, target )
+            os.utime( target, ns=( mtime, mtime ) )
+
+            stat = os.stat( target )
+            self._tree.update( [ ( path, ( stat.st_mtime_ns, stat.st_size, stat.st_ino ), incoming[ 1 ].digest( ) ) ] )
+
+            self._pulled += 1
+
+        waiting[ 1 ].discard( path )
+
+        if not waiting[ 1 ]:
+            link.pending( ).pop( request )
+
+            if not waiting[ 0 ].done( ):
+                waiting[ 0 ].set_result( True )
+
+    # endregion
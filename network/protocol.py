@@ -0,0 +1,373 @@
+# Network Protocol .py
+
+import struct
+import asyncio
+
+from sdk.binary import c_writer, c_reader
+
+# Frame : [ length : uint32 big endian ][ kind : uint8 ][ payload ]
+# length counts the kind byte and the payload
+FRAME_HEADER:       struct.Struct   = struct.Struct( ">IB" )
+FRAME_LENGTH:       struct.Struct   = struct.Struct( ">I" )
+
+MAX_FRAME_SIZE:     int = 16 * 1024 * 1024  # Bigger frames close the connection
+
+MESSAGE_JOIN:       int = 1     # client -> server : room, site
+MESSAGE_WELCOME:    int = 2     # server -> client : clients in the room
+MESSAGE_OPERATIONS: int = 3     # both directions  : encoded CRDT operations (relayed as is)
+MESSAGE_LEAVE:      int = 4     # client -> server : leave the room
+MESSAGE_PRESENCE:   int = 5     # both directions  : caret / selection of a site (latest one wins)
+MESSAGE_SNAPSHOT:   int = 6     # server -> client : chunk of the stored document snapshot
+MESSAGE_SYNCED:     int = 7     # server -> client : catch up is done, next operations are live
+MESSAGE_PROJECT:    int = 8     # peer <-> peer    : shared project name
+MESSAGE_TREE_GET:   int = 9     # peer <-> peer    : merkle nodes request
+MESSAGE_TREE:       int = 10    # peer <-> peer    : hashes and children / files of requested nodes
+MESSAGE_FILE_GET:   int = 11    # peer <-> peer    : files request
+MESSAGE_FILE:       int = 12    # peer <-> peer    : chunk of a requested file
+MESSAGE_ACK:        int = 13    # server -> client : operations frames received from the client
+
+JOIN_CATCH_UP:      int = 1     # Join flag : send stored document before live operations
+JOIN_RESUME:        int = 2     # Join flag : send stored operations missing from the client state vector
+
+PRESENCE_UPDATE:    int = 0     # Site moved its caret or selection
+PRESENCE_GONE:      int = 1     # Site left the room
+
+
+def pack_frame( kind: int, payload: bytes = b"" ) -> bytes:
+    """
+        Returns framed message
+    """
+
+    return FRAME_HEADER.pack( len( payload ) + 1, kind ) + payload
+
+
+async def read_frame( reader: asyncio.StreamReader ) -> tuple | None:
+    """
+        Read one framed message. returns ( kind, payload ), None once the stream is closed
+    """
+
+    try:
+        header = await reader.readexactly( FRAME_LENGTH.size )
+    except ( asyncio.IncompleteReadError, ConnectionError ):
+        return None
+
+    length = FRAME_LENGTH.unpack( header )[ 0 ]
+
+    if length == 0 or length > MAX_FRAME_SIZE:
+        raise Exception( f"Invalid frame length { length }" )
+
+    try:
+        data = await reader.readexactly( length )
+    except ( asyncio.IncompleteReadError, ConnectionError ):
+        return None
+
+    return data[ 0 ], data[ 1: ]
+
+
+def pack_join( room: str, site: int, flags: int = 0, state: dict = None ) -> bytes:
+    """
+        Returns join message. state is the client state vector ( site -> next clock ) of JOIN_RESUME
+    """
+
+    writer = c_writer( )
+    writer.string( room )
+    writer.varint( site )
+    writer.varint( flags )
+
+    if flags & JOIN_RESUME:
+        writer.varint( len( state ) )
+
+        for state_site, clock in state.items( ):
+            writer.varint( state_site )
+            writer.varint( clock )
+
+    return pack_frame( MESSAGE_JOIN, writer.get( ) )
+
+
+def unpack_join( payload: bytes ) -> tuple:
+    """
+        Returns ( room, site, flags, state ) of join message. state is None without JOIN_RESUME
+    """
+
+    reader  = c_reader( payload )
+    room    = reader.string( )
+    site    = reader.varint( )
+
+    # Older clients do not send flags
+    flags = not reader.is_done( ) and reader.varint( ) or 0
+    state = None
+
+    if flags & JOIN_RESUME:
+        state = { }
+
+        for _ in range( reader.varint( ) ):
+            state_site          = reader.varint( )
+            state[ state_site ] = reader.varint( )
+
+    return room, site, flags, state
+
+
+def pack_ack( count: int ) -> bytes:
+    """
+        Returns acknowledge of count operations frames
+    """
+
+    writer = c_writer( )
+    writer.varint( count )
+
+    return pack_frame( MESSAGE_ACK, writer.get( ) )
+
+
+def unpack_ack( payload: bytes ) -> int:
+
+    return c_reader( payload ).varint( )
+
+
+def pack_welcome( clients: int ) -> bytes:
+    """
+        Returns welcome message
+    """
+
+    writer = c_writer( )
+    writer.varint( clients )
+
+    return pack_frame( MESSAGE_WELCOME, writer.get( ) )
+
+
+def unpack_welcome( payload: bytes ) -> int:
+    """
+        Returns clients count of welcome message
+    """
+
+    return c_reader( payload ).varint( )
+
+
+def pack_presence( site: int, caret: tuple | None, anchor: tuple | None ) -> bytes:
+    """
+        Returns presence message. caret / anchor are CRDT char ids (None for document start)
+    """
+
+    writer = c_writer( )
+    writer.varint( PRESENCE_UPDATE )
+    writer.varint( site )
+
+    for reference in ( caret, anchor ):
+        if reference is None:
+            writer.varint( 0 )
+        else:
+            writer.varint( reference[ 0 ] + 1 )
+            writer.varint( reference[ 1 ] )
+
+    return pack_frame( MESSAGE_PRESENCE, writer.get( ) )
+
+
+def pack_presence_gone( site: int ) -> bytes:
+    """
+        Returns presence message of a site that left
+    """
+
+    writer = c_writer( )
+    writer.varint( PRESENCE_GONE )
+    writer.varint( site )
+
+    return pack_frame( MESSAGE_PRESENCE, writer.get( ) )
+
+
+def unpack_presence( payload: bytes ) -> tuple:
+    """
+        Returns ( state, site, caret, anchor ) of presence message
+    """
+
+    reader  = c_reader( payload )
+    state   = reader.varint( )
+    site    = reader.varint( )
+
+    if state == PRESENCE_GONE:
+        return state, site, None, None
+
+    references = [ ]
+
+    for _ in range( 2 ):
+        reference_site = reader.varint( )
+
+        if reference_site == 0:
+            references.append( None )
+        else:
+            references.append( ( reference_site - 1, reader.varint( ) ) )
+
+    return state, site, references[ 0 ], references[ 1 ]
+
+
+def encode_path( path: str ) -> bytes:
+    """
+        Returns bytes of a file path. names that are not utf-8 keep their bytes
+    """
+
+    return path.encode( "utf-8", errors="surrogateescape" )
+
+
+def decode_path( data: bytes ) -> str:
+
+    return data.decode( "utf-8", errors="surrogateescape" )
+
+
+def pack_project( name: str ) -> bytes:
+    """
+        Returns project message
+    """
+
+    writer = c_writer( )
+    writer.string( name )
+
+    return pack_frame( MESSAGE_PROJECT, writer.get( ) )
+
+
+def unpack_project( payload: bytes ) -> str:
+    """
+        Returns project name of project message
+    """
+
+    return c_reader( payload ).string( )
+
+
+def pack_tree_get( request: int, level: int, prefixes: list ) -> bytes:
+    """
+        Returns merkle nodes request. prefixes are nodes of one level
+    """
+
+    writer = c_writer( )
+    writer.varint( request )
+    writer.varint( level )
+    writer.varint( len( prefixes ) )
+
+    for prefix in prefixes:
+        writer.varint( prefix )
+
+    return pack_frame( MESSAGE_TREE_GET, writer.get( ) )
+
+
+def unpack_tree_get( payload: bytes ) -> tuple:
+    """
+        Returns ( request, level, prefixes ) of merkle nodes request
+    """
+
+    reader  = c_reader( payload )
+    request = reader.varint( )
+    level   = reader.varint( )
+
+    return request, level, [ reader.varint( ) for _ in range( reader.varint( ) ) ]
+
+
+def pack_tree( request: int, level: int, is_leaf: bool, nodes: list ) -> bytes:
+    """
+        Returns merkle nodes message.
+        nodes : [ ( prefix, hash, items ) ], items are [ ( child prefix, hash ) ],
+        or [ ( path, hash, mtime ) ] for leaves
+    """
+
+    writer = c_writer( )
+    writer.varint( request )
+    writer.varint( level )
+    writer.varint( is_leaf and 1 or 0 )
+    writer.varint( len( nodes ) )
+
+    for prefix, node_hash, items in nodes:
+        writer.varint( prefix )
+        writer.bytes( node_hash )
+        writer.varint( len( items ) )
+
+        if is_leaf:
+            for path, item_hash, mtime in items:
+                writer.bytes( encode_path( path ) )
+                writer.bytes( item_hash )
+                writer.signed( mtime )
+        else:
+            for child, item_hash in items:
+                writer.varint( child )
+                writer.bytes( item_hash )
+
+    return pack_frame( MESSAGE_TREE, writer.get( ) )
+
+
+def unpack_tree( payload: bytes ) -> tuple:
+    """
+        Returns ( request, level, nodes ) of merkle nodes message
+    """
+
+    reader  = c_reader( payload )
+    request = reader.varint( )
+    level   = reader.varint( )
+    is_leaf = reader.varint( ) == 1
+    nodes   = [ ]
+
+    for _ in range( reader.varint( ) ):
+        prefix      = reader.varint( )
+        node_hash   = reader.bytes( )
+        items       = [ ]
+
+        for _ in range( reader.varint( ) ):
+            if is_leaf:
+                items.append( ( decode_path( reader.bytes( ) ), reader.bytes( ), reader.signed( ) ) )
+            else:
+                items.append( ( reader.varint( ), reader.bytes( ) ) )
+
+        nodes.append( ( prefix, node_hash, items ) )
+
+    return request, level, nodes
+
+
+def pack_file_get( request: int, paths: list ) -> bytes:
+    """
+        Returns files request
+    """
+
+    writer = c_writer( )
+    writer.varint( request )
+    writer.varint( len( paths ) )
+
+    for path in paths:
+        writer.bytes( encode_path( path ) )
+
+    return pack_frame( MESSAGE_FILE_GET, writer.get( ) )
+
+
+def unpack_file_get( payload: bytes ) -> tuple:
+    """
+        Returns ( request, paths ) of files request
+    """
+
+    reader  = c_reader( payload )
+    request = reader.varint( )
+
+    return request, [ decode_path( reader.bytes( ) ) for _ in range( reader.varint( ) ) ]
+
+
+def pack_file( request: int, path: str, mtime: int, size: int, offset: int, data: bytes ) -> bytes:
+    """
+        Returns file chunk message. size is -1 for a file that could not be read
+    """
+
+    writer = c_writer( )
+    writer.varint( request )
+    writer.bytes( encode_path( path ) )
+    writer.signed( mtime )
+    writer.signed( size )
+    writer.varint( offset )
+    writer.raw( data )
+
+    return pack_frame( MESSAGE_FILE, writer.get( ) )
+
+
+def unpack_file( payload: bytes ) -> tuple:
+    """
+        Returns ( request, path, mtime, size, offset, data ) of file chunk message
+    """
+
+    reader  = c_reader( payload )
+    request = reader.varint( )
+    path    = decode_path( reader.bytes( ) )
+    mtime   = reader.signed( )
+    size    = reader.signed( )
+    offset  = reader.varint( )
+
+    return request, path, mtime, size, offset, payload[ reader.position( ): ]
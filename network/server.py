@@ -0,0 +1,644 @@
+# Network Server .py
+
+import asyncio
+
+from network.protocol   import *
+from network.storage    import c_storage, read_records, close_maps
+from network.operations import encode_batch
+
+DEFAULT_HOST:       str     = "127.0.0.1"
+DEFAULT_PORT:       int     = 7420
+
+BROADCAST_TICK:     float   = 0.004             # Messages of a room are sent together once per tick (seconds)
+PRESENCE_TICK:      float   = 0.05              # Presence of a room is sent at most at 20 Hz
+
+HIGH_WATER:         int     = 256 * 1024        # Transport buffer size that pauses writes to a client
+LOW_WATER:          int     = 64 * 1024         # Transport buffer size that resumes them
+MAX_BACKLOG:        int     = 4 * 1024 * 1024   # Bytes kept for a paused client before it is dropped
+
+CATCH_UP_CHUNK:     int     = 64 * 1024         # Bytes per snapshot / log tail frame sent to a joining client
+RESUME_BATCH:       int     = 4096              # Operations per frame sent to a resuming client
+
+
+class c_connection:
+    """
+        Server side client connection.
+
+        Writes are not awaited. Once the transport buffer is above
+        the high water mark, new data is kept in a bounded backlog
+        until the client reads, and a client that falls too far behind
+        is disconnected instead of growing the server memory.
+    """
+
+    _reader:        asyncio.StreamReader
+    _writer:        asyncio.StreamWriter
+
+    _room:          any     # c_room the client is in (None before join)
+    _site:          int     # Client CRDT site
+
+    _backlog:       list    # Data waiting while the client is paused
+    _backlog_size:  int     # Bytes in backlog
+    _is_paused:     bool    # Is transport buffer above the high water mark
+    _is_closed:     bool
+
+    def __init__( self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter ):
+        """
+            Constructor for connection
+        """
+
+        self._reader        = reader
+        self._writer        = writer
+
+        self._room          = None
+        self._site          = 0
+
+        self._backlog       = [ ]
+        self._backlog_size  = 0
+        self._is_paused     = False
+        self._is_closed     = False
+
+        self._writer.transport.set_write_buffer_limits( high=HIGH_WATER, low=LOW_WATER )
+
+    def room( self, new_room: any = None ) -> any:
+        """
+            Returns / Sets the room of the client
+        """
+
+        if new_room is None:
+            return self._room
+
+        self._room = new_room
+
+    def site( self, new_site: int = None ) -> int | None:
+        """
+            Returns / Sets client CRDT site
+        """
+
+        if new_site is None:
+            return self._site
+
+        self._site = new_site
+
+    def send( self, data: bytes ) -> bool:
+        """
+            Queue data to the client. returns False if the client was dropped
+        """
+
+        if self._is_closed:
+            return False
+
+        if self._is_paused:
+            self._backlog.append( data )
+            self._backlog_size += len( data )
+
+            # Client does not read. drop it, it can join again and catch up
+            if self._backlog_size > MAX_BACKLOG:
+                self.close( )
+                return False
+
+            return True
+
+        self._writer.write( data )
+
+        if self._writer.transport.get_write_buffer_size( ) > HIGH_WATER:
+            self._is_paused = True
+            asyncio.get_running_loop( ).create_task( self.__drain( ) )
+
+        return True
+
+    def is_paused( self ) -> bool:
+        """
+            Is the client behind
+        """
+
+        return self._is_paused
+
+    async def writable( self ) -> bool:
+        """
+            Wait until the client reads what was sent. returns False if it was closed
+        """
+
+        # Let other clients run between big writes
+        await asyncio.sleep( 0 )
+
+        while self._is_paused and not self._is_closed:
+            await asyncio.sleep( BROADCAST_TICK )
+
+        return not self._is_closed
+
+    def is_closed( self ) -> bool:
+
+        return self._is_closed
+
+    def close( self ) -> None:
+        """
+            Close the connection
+        """
+
+        if self._is_closed:
+            return
+
+        self._is_closed = True
+
+        self._backlog.clear( )
+        self._backlog_size = 0
+
+        # Close waits for the buffer to be sent, a client that does not read would never let it
+        if self._writer.transport.get_write_buffer_size( ) > 0:
+            self._writer.transport.abort( )
+        else:
+            self._writer.close( )
+
+    async def __drain( self ) -> None:
+        """
+            Wait until the client reads, then send the backlog
+        """
+
+        while self._is_paused and not self._is_closed:
+            try:
+                await self._writer.drain( )
+            except ConnectionError:
+                self.close( )
+                return
+
+            if self._is_closed:
+                return
+
+            data                = b"".join( self._backlog )
+            self._backlog       = [ ]
+            self._backlog_size  = 0
+
+            if data:
+                self._writer.write( data )
+
+            self._is_paused = self._writer.transport.get_write_buffer_size( ) > HIGH_WATER
+
+
+class c_room:
+    """
+        Room of clients that edit the same document
+    """
+
+    _name:          str     # Document id
+    _clients:       dict    # Clients in the room ( c_connection -> None, keeps join order )
+    _frames:        list    # [ ( sender, frame ) ] to broadcast on the next tick
+    _is_scheduled:  bool    # Is broadcast scheduled
+
+    _presence:      dict    # sender -> latest presence frame
+    _is_presence_scheduled: bool
+
+    def __init__( self, name: str ):
+        """
+            Constructor for room
+        """
+
+        self._name          = name
+        self._clients       = { }
+        self._frames        = [ ]
+        self._is_scheduled  = False
+
+        self._presence      = { }
+        self._is_presence_scheduled = False
+
+    def name( self ) -> str:
+
+        return self._name
+
+    def clients( self ) -> list:
+        """
+            Returns connections in the room
+        """
+
+        return list( self._clients )
+
+    def __len__( self ) -> int:
+
+        return len( self._clients )
+
+
+class c_server:
+    """
+        Collaboration server.
+
+        One room per document. Operations from a client are relayed
+        as is to the other clients of its room. Frames received during
+        a tick are joined and written once per client.
+
+        Presence (carets) is a separate channel : only the latest frame
+        of each client is kept, it is sent on a slower tick and skipped
+        for clients that are behind.
+
+        With storage, relayed operations are also appended to the
+        document log, and written to disk once per tick. A client that
+        joins with JOIN_CATCH_UP gets the stored snapshot and the log
+        after it in chunks, so joining depends on the document size and
+        not on its history. It is in the room already, so operations
+        relayed meanwhile reach it too (applying twice is harmless).
+
+        A client that reconnects joins with JOIN_RESUME and its state
+        vector, and gets the stored operations it is missing. Received
+        operations frames are acknowledged once per tick, after they
+        are written, so a client resends only frames that were lost.
+    """
+
+    _host:          str
+    _port:          int
+    _tick:          float
+    _storage:       c_storage   # Documents storage (None to only relay)
+
+    _server:        asyncio.Server
+    _rooms:         dict    # name -> c_room
+    _connections:   dict    # c_connection -> client task
+
+    _messages:      int     # Relayed frames count (per recipient)
+    _bytes:         int     # Relayed bytes
+    _dropped:       int     # Clients dropped because of backpressure
+
+    def __init__( self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, tick: float = BROADCAST_TICK, storage: c_storage = None ):
+        """
+            Constructor for server.
+            use port 0 to let the system choose a free port
+        """
+
+        self._host          = host
+        self._port          = port
+        self._tick          = tick
+        self._storage       = storage
+
+        self._server        = None
+        self._rooms         = { }
+        self._connections   = { }
+
+        self._messages      = 0
+        self._bytes         = 0
+        self._dropped       = 0
+
+    async def start( self ) -> None:
+        """
+            Start listening
+        """
+
+        self._server = await asyncio.start_server( self.__handle_client, self._host, self._port )
+
+        # Real port when 0 was given
+        self._port = self._server.sockets[ 0 ].getsockname( )[ 1 ]
+
+    async def stop( self ) -> None:
+        """
+            Close all connections and stop listening
+        """
+
+        if self._server is None:
+            return
+
+        self._server.close( )
+
+        for connection in list( self._connections ):
+            connection.close( )
+
+        # Let client loops see the closed streams and finish
+        await asyncio.gather( *self._connections.values( ), return_exceptions=True )
+
+        await self._server.wait_closed( )
+        self._server = None
+
+        if self._storage is not None:
+            self._storage.close( )
+
+    def run( self ) -> None:
+        """
+            Start and serve until interrupted (blocking)
+        """
+
+        async def serve( ):
+            await self.start( )
+            await self._server.serve_forever( )
+
+        try:
+            asyncio.run( serve( ) )
+        except KeyboardInterrupt:
+            pass
+
+    def port( self ) -> int:
+        """
+            Returns listening port
+        """
+
+        return self._port
+
+    def storage( self ) -> c_storage:
+        """
+            Returns documents storage (None if not stored)
+        """
+
+        return self._storage
+
+    def rooms( self ) -> dict:
+        """
+            Returns active rooms
+        """
+
+        return self._rooms
+
+    def stats( self ) -> dict:
+        """
+            Returns server traffic information
+        """
+
+        return {
+            "rooms":        len( self._rooms ),
+            "clients":      len( self._connections ),
+            "messages":     self._messages,
+            "bytes":        self._bytes,
+            "dropped":      self._dropped
+        }
+
+    # region : Clients
+
+    async def __handle_client( self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter ) -> None:
+        """
+            Client connection loop
+        """
+
+        connection = c_connection( reader, writer )
+        self._connections[ connection ] = asyncio.current_task( )
+
+        try:
+            while not connection.is_closed( ):
+                frame = await read_frame( reader )
+
+                if frame is None:
+                    break
+
+                kind, payload = frame
+
+                if kind == MESSAGE_OPERATIONS:
+                    room: c_room = connection.room( )
+
+                    if room is not None:
+                        self.__queue( room, connection, pack_frame( kind, payload ) )
+
+                        if self._storage is not None:
+                            self._storage.append( room.name( ), payload )
+
+                elif kind == MESSAGE_PRESENCE:
+                    room: c_room = connection.room( )
+
+                    if room is not None:
+                        self.__queue_presence( room, connection, pack_frame( kind, payload ) )
+
+                elif kind == MESSAGE_JOIN:
+                    room, site, flags, state = unpack_join( payload )
+
+                    self.__join( connection, room, site )
+
+                    if flags & JOIN_CATCH_UP:
+                        await self.__catch_up( connection )
+
+                    elif flags & JOIN_RESUME:
+                        await self.__resume( connection, state )
+
+                    connection.send( pack_frame( MESSAGE_SYNCED ) )
+
+                elif kind == MESSAGE_LEAVE:
+                    self.__leave( connection )
+
+        except Exception:
+            # Invalid frame or connection error. drop only this client
+            pass
+
+        finally:
+            self.__leave( connection )
+            self._connections.pop( connection, None )
+
+            connection.close( )
+
+    def __join( self, connection: c_connection, name: str, site: int ) -> None:
+        """
+            Add client to a room
+        """
+
+        self.__leave( connection )
+
+        room: c_room = self._rooms.get( name )
+
+        if room is None:
+            room = c_room( name )
+            self._rooms[ name ] = room
+
+        room._clients[ connection ] = None
+
+        connection.room( room )
+        connection.site( site )
+
+        connection.send( pack_welcome( len( room ) ) )
+
+    async def __catch_up( self, connection: c_connection ) -> None:
+        """
+            Stream stored document to a client that joined, paced by the client reads
+        """
+
+        if self._storage is None:
+            return
+
+        snapshot, logs = self._storage.map( connection.room( ).name( ) )
+
+        try:
+            if snapshot is not None:
+                for start in range( 0, len( snapshot ), CATCH_UP_CHUNK ):
+                    if not connection.send( pack_frame( MESSAGE_SNAPSHOT, snapshot[ start:start + CATCH_UP_CHUNK ] ) ):
+                        return
+
+                    if not await connection.writable( ):
+                        return
+
+            # Log records are already operations batches, send them as they are
+            frames  = [ ]
+            size    = 0
+
+            for log in logs:
+                for payload in read_records( log ):
+                    frame = pack_frame( MESSAGE_OPERATIONS, payload )
+
+                    frames.append( frame )
+                    size += len( frame )
+
+                    if size < CATCH_UP_CHUNK:
+                        continue
+
+                    if not connection.send( b"".join( frames ) ) or not await connection.writable( ):
+                        return
+
+                    frames  = [ ]
+                    size    = 0
+
+            if frames:
+                connection.send( b"".join( frames ) )
+
+        finally:
+            close_maps( snapshot, logs )
+
+    async def __resume( self, connection: c_connection, state: dict ) -> None:
+        """
+            Send stored operations a reconnected client is missing.
+            without storage, what was relayed while it was away is lost
+        """
+
+        if self._storage is None:
+            return
+
+        # Whole state, the missing part can be folded into a snapshot already
+        operations = self._storage.load( connection.room( ).name( ) ).operations_since( state )
+
+        for start in range( 0, len( operations ), RESUME_BATCH ):
+            if not connection.send( pack_frame( MESSAGE_OPERATIONS, encode_batch( operations[ start:start + RESUME_BATCH ] ) ) ):
+                return
+
+            if not await connection.writable( ):
+                return
+
+    def __leave( self, connection: c_connection ) -> None:
+        """
+            Remove client from its room
+        """
+
+        room: c_room = connection.room( )
+
+        if room is None:
+            return
+
+        room._clients.pop( connection, None )
+        connection._room = None
+
+        # Let others remove the caret
+        if len( room ) > 0:
+            self.__queue_presence( room, connection, pack_presence_gone( connection.site( ) ) )
+
+        self.__release_room( room )
+
+    def __release_room( self, room: c_room ) -> None:
+        """
+            Forget empty room once nothing is scheduled for it
+        """
+
+        if len( room ) > 0 or room._is_scheduled or room._is_presence_scheduled:
+            return
+
+        # Same name can already belong to a new room
+        if self._rooms.get( room.name( ) ) is room:
+            del self._rooms[ room.name( ) ]
+
+    # endregion
+
+    # region : Broadcast
+
+    def __queue( self, room: c_room, sender: c_connection, frame: bytes ) -> None:
+        """
+            Queue frame to the next room broadcast
+        """
+
+        room._frames.append( ( sender, frame ) )
+
+        if room._is_scheduled:
+            return
+
+        room._is_scheduled = True
+        asyncio.get_running_loop( ).call_later( self._tick, self.__broadcast, room )
+
+    def __broadcast( self, room: c_room ) -> None:
+        """
+            Send frames of the last tick to every client in the room, except their senders
+        """
+
+        frames              = room._frames
+        room._frames        = [ ]
+        room._is_scheduled  = False
+
+        # One write per tick, not per frame
+        if self._storage is not None:
+            self._storage.flush( room.name( ) )
+
+        if len( room ) == 0:
+            return self.__release_room( room )
+
+        # Senders know what reached the server, the rest is sent again after a reconnect
+        senders = { }
+
+        for sender, _ in frames:
+            senders[ sender ] = senders.get( sender, 0 ) + 1
+
+        for sender, count in senders.items( ):
+            if not sender.is_closed( ):
+                sender.send( pack_ack( count ) )
+
+        # Most clients did not send anything, they get the same joined data
+        everything  = b"".join( frame for _, frame in frames )
+
+        for client in room.clients( ):
+            if client.is_closed( ):
+                continue
+
+            data    = everything
+            count   = len( frames )
+
+            if client in senders:
+                others  = [ frame for sender, frame in frames if sender is not client ]
+                data    = b"".join( others )
+                count   = len( others )
+
+            if not data:
+                continue
+
+            if not client.send( data ):
+                self._dropped += 1
+                continue
+
+            self._messages  += count
+            self._bytes     += len( data )
+
+    def __queue_presence( self, room: c_room, sender: c_connection, frame: bytes ) -> None:
+        """
+            Keep latest presence of sender for the next presence tick
+        """
+
+        room._presence[ sender ] = frame
+
+        if room._is_presence_scheduled:
+            return
+
+        room._is_presence_scheduled = True
+        asyncio.get_running_loop( ).call_later( PRESENCE_TICK, self.__broadcast_presence, room )
+
+    def __broadcast_presence( self, room: c_room ) -> None:
+        """
+            Send latest presence of each sender to the other clients
+        """
+
+        presence                    = room._presence
+        room._presence              = { }
+        room._is_presence_scheduled = False
+
+        if len( room ) == 0:
+            return self.__release_room( room )
+
+        everything = b"".join( presence.values( ) )
+
+        for client in room.clients( ):
+            # Presence can be dropped, edits of a client that is behind are more important
+            if client.is_closed( ) or client.is_paused( ):
+                continue
+
+            data = everything
+
+            if client in presence:
+                data = b"".join( frame for sender, frame in presence.items( ) if sender is not client )
+
+            if data:
+                client.send( data )
+                self._bytes += len( data )
+
+    # endregion
+
+
+if __name__ == "__main__":
+    c_server( ).run( )
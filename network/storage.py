@@ -0,0 +1,447 @@
+# Network Storage .py
+
+import os
+import mmap
+import queue
+import struct
+import threading
+
+from urllib.parse import quote
+
+from sdk.crdt           import c_sequence
+from network.operations import decode_batch
+
+RECORD_HEADER:      struct.Struct   = struct.Struct( ">I" )     # Log record : [ length : uint32 ][ operations batch ]
+
+COMPACT_SIZE:       int = 4 * 1024 * 1024   # Log size that starts compaction
+
+SNAPSHOT_SUFFIX:    str = ".snapshot"
+LOG_SUFFIX:         str = ".log"
+TEMP_SUFFIX:        str = ".tmp"
+
+
+def read_records( data: bytes ) -> any:
+    """
+        Yield operations batches of a log
+    """
+
+    position    = 0
+    size        = len( data )
+
+    while position + RECORD_HEADER.size <= size:
+        length  = RECORD_HEADER.unpack_from( data, position )[ 0 ]
+        start   = position + RECORD_HEADER.size
+
+        # Record cut by a crash while it was written
+        if start + length > size:
+            return
+
+        yield data[ start:start + length ]
+        position = start + length
+
+
+def records_end( data: bytes ) -> int:
+    """
+        Returns size of the complete records at the start of a log
+    """
+
+    position    = 0
+    size        = len( data )
+
+    while position + RECORD_HEADER.size <= size:
+        end = position + RECORD_HEADER.size + RECORD_HEADER.unpack_from( data, position )[ 0 ]
+
+        if end > size:
+            break
+
+        position = end
+
+    return position
+
+
+def close_maps( snapshot: mmap.mmap | None, logs: list ) -> None:
+    """
+        Close mappings returned by c_storage.map
+    """
+
+    if snapshot is not None:
+        snapshot.close( )
+
+    for log in logs:
+        log.close( )
+
+
+class c_stored_document:
+    """
+        Files state of a stored document
+    """
+
+    _directory:     str     # Document files directory
+    _generation:    int     # Generation of the log that is appended
+    _log:           any     # Open log file
+    _log_size:      int     # Bytes in the open log
+    _is_dirty:      bool    # Was the log written since the last flush
+    _is_compacting: bool    # Is a compaction of this document queued / running
+
+    def __init__( self, directory: str ):
+        """
+            Constructor for stored document
+        """
+
+        self._directory     = directory
+        self._generation    = 0
+        self._log           = None
+        self._log_size      = 0
+        self._is_dirty      = False
+        self._is_compacting = False
+
+        os.makedirs( directory, exist_ok=True )
+
+        snapshots, logs = self.generations( )
+
+        # Continue the newest generation
+        self._generation = max( snapshots + logs, default=0 )
+
+        self.open_log( )
+
+    def directory( self ) -> str:
+
+        return self._directory
+
+    def generation( self ) -> int:
+
+        return self._generation
+
+    def path( self, generation: int, suffix: str ) -> str:
+        """
+            Returns path of a generation file
+        """
+
+        return os.path.join( self._directory, str( generation ).zfill( 8 ) + suffix )
+
+    def generations( self ) -> tuple:
+        """
+            Returns sorted ( [ snapshot generations ], [ log generations ] ) on disk
+        """
+
+        snapshots   = [ ]
+        logs        = [ ]
+
+        for file_name in os.listdir( self._directory ):
+            name, suffix = os.path.splitext( file_name )
+
+            if not name.isdigit( ):
+                continue
+
+            if suffix == SNAPSHOT_SUFFIX:
+                snapshots.append( int( name ) )
+
+            elif suffix == LOG_SUFFIX:
+                logs.append( int( name ) )
+
+        return sorted( snapshots ), sorted( logs )
+
+    def open_log( self ) -> None:
+        """
+            Open log of the current generation for appends. a record cut by a crash is dropped
+        """
+
+        path = self.path( self._generation, LOG_SUFFIX )
+
+        self._log       = open( path, "ab" )
+        self._log_size  = self._log.tell( )
+
+        if self._log_size == 0:
+            return
+
+        # Record cut by a crash, appends after it would be read as its payload
+        with open( path, "rb" ) as file:
+            end = records_end( file.read( ) )
+
+        if end < self._log_size:
+            self._log.truncate( end )
+            self._log_size = end
+
+    def rotate( self ) -> int:
+        """
+            Start the next log. returns the generation that was closed
+        """
+
+        self.close( )
+
+        closed              = self._generation
+        self._generation    += 1
+
+        self.open_log( )
+
+        return closed
+
+    def append( self, payload: bytes ) -> None:
+        """
+            Append operations batch to the log (buffered until flush)
+        """
+
+        self._log.write( RECORD_HEADER.pack( len( payload ) ) )
+        self._log.write( payload )
+
+        self._log_size  += RECORD_HEADER.size + len( payload )
+        self._is_dirty  = True
+
+    def flush( self ) -> None:
+
+        if self._is_dirty:
+            self._log.flush( )
+            self._is_dirty = False
+
+    def close( self ) -> None:
+
+        if self._log is not None:
+            self._log.close( )
+            self._log       = None
+            self._is_dirty  = False
+
+
+class c_storage:
+    """
+        Shared documents storage.
+
+        Each document is a directory of numbered files :
+        - N.snapshot : c_sequence snapshot of everything before log N
+        - N.log      : append only operations batches received after it
+
+        Reads use mmap. Once a log passes the compact size, appends move
+        to the next log and a background thread folds the closed log
+        into the next snapshot, then removes the old files. So opening
+        a document loads one snapshot and replays a short tail, and
+        the disk usage does not grow with the edits history.
+    """
+
+    _root:          str     # Storage directory
+    _compact_size:  int     # Log size that starts compaction
+
+    _documents:     dict    # name -> c_stored_document
+    _lock:          threading.Lock  # Guards files that are replaced / removed by the compactor
+
+    _jobs:          queue.Queue     # ( document, generation ) to compact
+    _thread:        threading.Thread
+
+    _compactions:   int     # Finished compactions
+
+    def __init__( self, root: str, compact_size: int = COMPACT_SIZE ):
+        """
+            Constructor for storage
+        """
+
+        self._root          = root
+        self._compact_size  = compact_size
+
+        self._documents     = { }
+        self._lock          = threading.Lock( )
+
+        self._jobs          = queue.Queue( )
+        self._thread        = threading.Thread( target=self.__compactor, daemon=True )
+
+        self._compactions   = 0
+
+        os.makedirs( root, exist_ok=True )
+
+        self._thread.start( )
+
+    # region : Documents
+
+    def append( self, name: str, payload: bytes ) -> None:
+        """
+            Append operations batch to a document
+        """
+
+        document = self.__document( name )
+        document.append( payload )
+
+        if document._log_size >= self._compact_size and not document._is_compacting:
+            document.flush( )
+
+            document._is_compacting = True
+            self._jobs.put( ( document, document.rotate( ) ) )
+
+    def load( self, name: str, site: int = None ) -> c_sequence:
+        """
+            Returns document state : latest snapshot and the logs after it
+        """
+
+        document = self.__document( name )
+        document.flush( )
+
+        with self._lock:
+            return self.__read( document, document.generation( ), site )
+
+    def map( self, name: str ) -> tuple:
+        """
+            Returns ( snapshot, [ logs ] ) read only mappings of the stored document,
+            to stream it without loading. close them with close_maps
+        """
+
+        document = self.__document( name )
+        document.flush( )
+
+        with self._lock:
+            return self.__map_files( document, document.generation( ) )
+
+    def flush( self, name: str = None ) -> None:
+        """
+            Write buffered appends of a document (all documents if None)
+        """
+
+        if name is None:
+            for document in self._documents.values( ):
+                document.flush( )
+
+            return
+
+        document = self._documents.get( name )
+
+        if document is not None:
+            document.flush( )
+
+    def close( self ) -> None:
+        """
+            Wait for compactions and close all documents
+        """
+
+        self._jobs.join( )
+
+        for document in self._documents.values( ):
+            document.close( )
+
+        self._documents.clear( )
+
+    def stats( self ) -> dict:
+        """
+            Returns storage information
+        """
+
+        return {
+            "documents":    len( self._documents ),
+            "compactions":  self._compactions,
+            "pending":      self._jobs.qsize( )
+        }
+
+    def __document( self, name: str ) -> c_stored_document:
+
+        document = self._documents.get( name )
+
+        if document is None:
+            document = c_stored_document( os.path.join( self._root, quote( name, safe="" ) ) )
+            self._documents[ name ] = document
+
+        return document
+
+    # endregion
+
+    # region : Files
+
+    def __read( self, document: c_stored_document, generation: int, site: int = None ) -> c_sequence:
+        """
+            Build state from the newest snapshot up to generation and the logs until generation
+        """
+
+        sequence        = c_sequence( site )
+        snapshot, logs  = self.__map_files( document, generation )
+
+        try:
+            if snapshot is not None:
+                sequence.restore( snapshot )
+
+            for log in logs:
+                for payload in read_records( log ):
+                    sequence.apply( decode_batch( payload ) )
+
+        finally:
+            close_maps( snapshot, logs )
+
+        return sequence
+
+    def __map_files( self, document: c_stored_document, generation: int ) -> tuple:
+        """
+            Returns ( snapshot, [ logs ] ) read only mappings of the newest snapshot
+            up to generation and the logs after it. empty files are skipped
+        """
+
+        snapshots, logs = document.generations( )
+
+        snapshots   = [ number for number in snapshots if number <= generation ]
+        first       = snapshots and snapshots[ -1 ] or 0
+
+        snapshot    = snapshots and self.__map( document.path( first, SNAPSHOT_SUFFIX ) ) or None
+        mapped      = [ ]
+
+        for number in logs:
+            if first <= number <= generation:
+                log = self.__map( document.path( number, LOG_SUFFIX ) )
+
+                if log is not None:
+                    mapped.append( log )
+
+        return snapshot, mapped
+
+    def __map( self, path: str ) -> mmap.mmap | None:
+        """
+            Returns read only mapping of a file (None if empty)
+        """
+
+        with open( path, "rb" ) as file:
+            # Empty files can not be mapped
+            if os.fstat( file.fileno( ) ).st_size == 0:
+                return None
+
+            # Mapping stays valid after the file is closed
+            return mmap.mmap( file.fileno( ), 0, access=mmap.ACCESS_READ )
+
+    def __compactor( self ) -> None:
+        """
+            Compaction thread
+        """
+
+        while True:
+            document, generation = self._jobs.get( )
+
+            try:
+                self.__compact( document, generation )
+                self._compactions += 1
+
+            except Exception:
+                # Files stay as they are, the next compaction retries with more logs
+                pass
+
+            finally:
+                document._is_compacting = False
+                self._jobs.task_done( )
+
+    def __compact( self, document: c_stored_document, generation: int ) -> None:
+        """
+            Fold logs until generation into snapshot generation + 1
+        """
+
+        # Closed logs and snapshots do not change, the lock is needed only to remove them
+        snapshot = self.__read( document, generation ).snapshot( )
+
+        path = document.path( generation + 1, SNAPSHOT_SUFFIX )
+
+        with open( path + TEMP_SUFFIX, "wb" ) as file:
+            file.write( snapshot )
+            file.flush( )
+            os.fsync( file.fileno( ) )
+
+        with self._lock:
+            os.replace( path + TEMP_SUFFIX, path )
+
+            snapshots, logs = document.generations( )
+
+            for number in snapshots:
+                if number <= generation:
+                    os.remove( document.path( number, SNAPSHOT_SUFFIX ) )
+
+            for number in logs:
+                if number <= generation:
+                    os.remove( document.path( number, LOG_SUFFIX ) )
+
+    # endregion
@@ -0,0 +1,170 @@
+# SDK Binary .py
+
+class c_writer:
+    """
+        Binary writer.
+
+        Unsigned integers are written as varints (7 bits per byte),
+        so small numbers take a single byte.
+    """
+
+    _data:  bytearray   # Written bytes
+
+    def __init__( self ):
+        """
+            Constructor for writer
+        """
+
+        self._data = bytearray( )
+
+    def varint( self, value: int ) -> None:
+        """
+            Write unsigned integer
+        """
+
+        if value < 0:
+            raise Exception( "Varint value cannot be negative" )
+
+        data = self._data
+
+        while value > 0x7F:
+            data.append( ( value & 0x7F ) | 0x80 )
+            value >>= 7
+
+        data.append( value )
+
+    def signed( self, value: int ) -> None:
+        """
+            Write signed integer (zigzag, small negative numbers stay small)
+        """
+
+        self.varint( value << 1 if value >= 0 else ( ( -value ) << 1 ) - 1 )
+
+    def bytes( self, value: bytes ) -> None:
+        """
+            Write length prefixed bytes
+        """
+
+        self.varint( len( value ) )
+        self._data += value
+
+    def string( self, value: str ) -> None:
+        """
+            Write length prefixed utf-8 string
+        """
+
+        self.bytes( value.encode( "utf-8" ) )
+
+    def raw( self, value: bytes ) -> None:
+        """
+            Write bytes without length
+        """
+
+        self._data += value
+
+    def get( self ) -> bytes:
+        """
+            Returns written data
+        """
+
+        return bytes( self._data )
+
+    def __len__( self ) -> int:
+
+        return len( self._data )
+
+
+class c_reader:
+    """
+        Binary reader for data written by c_writer
+    """
+
+    _data:      bytes   # Read data
+    _position:  int     # Read position
+
+    def __init__( self, data: bytes, position: int = 0 ):
+        """
+            Constructor for reader
+        """
+
+        self._data      = data
+        self._position  = position
+
+    def varint( self ) -> int:
+        """
+            Read unsigned integer
+        """
+
+        data        = self._data
+        position    = self._position
+        result      = 0
+        shift       = 0
+
+        while True:
+            if position >= len( data ):
+                raise Exception( "Unexpected end of data while reading varint" )
+
+            byte        = data[ position ]
+            position    += 1
+
+            result |= ( byte & 0x7F ) << shift
+            shift  += 7
+
+            if byte < 0x80:
+                break
+
+        self._position = position
+
+        return result
+
+    def signed( self ) -> int:
+        """
+            Read signed integer
+        """
+
+        value = self.varint( )
+
+        return value >> 1 if not value & 1 else -( ( value + 1 ) >> 1 )
+
+    def bytes( self ) -> bytes:
+        """
+            Read length prefixed bytes
+        """
+
+        return self.raw( self.varint( ) )
+
+    def string( self ) -> str:
+        """
+            Read length prefixed utf-8 string
+        """
+
+        return self.bytes( ).decode( "utf-8" )
+
+    def raw( self, length: int ) -> bytes:
+        """
+            Read bytes without length
+        """
+
+        end = self._position + length
+
+        if end > len( self._data ):
+            raise Exception( "Unexpected end of data while reading bytes" )
+
+        value           = self._data[ self._position:end ]
+        self._position  = end
+
+        return value
+
+    def position( self ) -> int:
+        """
+            Returns read position
+        """
+
+        return self._position
+
+    def is_done( self ) -> bool:
+        """
+            Was all the data read
+        """
+
+        return self._position >= len( self._data )
@@ -0,0 +1,1379 @@
+# SDK CRDT .py
+
+import random
+import bisect
+
+from sdk.event      import c_event
+from sdk.binary     import c_writer, c_reader
+from sdk.document   import c_document
+
+OP_INSERT:          int = 0     # ( OP_INSERT, site, clock, origin, text )
+OP_DELETE:          int = 1     # ( OP_DELETE, site, clock, length )
+
+ORIGIN_START:       int = 0     # Encoded origin kinds
+ORIGIN_SAME_SITE:   int = 1
+ORIGIN_OTHER_SITE:  int = 2
+
+ROOT_SITE:          int = 0     # Site of the initial document text
+MAX_BLOCK_LENGTH:   int = 1024  # Typing stops extending a block after this length
+
+SNAPSHOT_VERSION:   int = 1     # Version of c_sequence.snapshot format
+
+
+class c_block:
+    """
+        Sequence block.
+
+        Run of chars inserted by one site with consecutive clocks,
+        char i has id ( site, clock + i ). Each block is also a node in
+        a treap ordered by sequence position, that keeps total (with
+        deleted) and visible lengths of its subtree.
+    """
+
+    __slots__ = ( "site", "clock", "text", "is_deleted", "priority", "left", "right", "parent", "size", "visible" )
+
+    site:       int     # Inserting site
+    clock:      int     # Clock of the first char
+    text:       str     # Block text
+    is_deleted: bool    # Is the whole block deleted (tombstone)
+
+    priority:   float   # Treap priority
+    left:       any     # Left child (before)
+    right:      any     # Right child (after)
+    parent:     any     # Parent node (None for root)
+    size:       int     # Subtree length including deleted blocks
+    visible:    int     # Subtree visible length
+
+    def __init__( self, site: int, clock: int, text: str, is_deleted: bool = False ):
+
+        self.site       = site
+        self.clock      = clock
+        self.text       = text
+        self.is_deleted = is_deleted
+
+        self.priority   = random.random( )
+        self.left       = None
+        self.right      = None
+        self.parent     = None
+        self.size       = len( text )
+        self.visible    = not is_deleted and len( text ) or 0
+
+    def update( self ) -> None:
+        """
+            Recalculate subtree aggregates and children parents
+        """
+
+        size    = len( self.text )
+        visible = not self.is_deleted and size or 0
+
+        if self.left is not None:
+            size    += self.left.size
+            visible += self.left.visible
+
+            self.left.parent = self
+
+        if self.right is not None:
+            size    += self.right.size
+            visible += self.right.visible
+
+            self.right.parent = self
+
+        self.size       = size
+        self.visible    = visible
+
+
+class c_sequence:
+    """
+        Sequence CRDT (RGA).
+
+        Each char has a unique id ( site, clock ) and is placed right after
+        the char it was inserted after (origin). Concurrent inserts after
+        the same origin are ordered by Lamport time ( clock, site ),
+        deleted chars stay as tombstones. So all sites that received
+        the same operations have the same text, in any order.
+
+        Chars are kept in blocks, blocks in a treap with visible lengths,
+        and each site has a sorted index of its blocks by clock.
+        Local edits and remote integrations are O(log n).
+    """
+
+    _site:      int     # This site id
+    _clock:     int     # Lamport clock. next local clock
+
+    _root:      c_block # Blocks tree root
+    _sites:     dict    # site -> ( [ first clocks ], [ blocks ] ) sorted by clock
+    _pending:   list    # Remote operations that wait for their dependencies
+
+    def __init__( self, site: int = None, text: str = "" ):
+        """
+            Constructor for sequence.
+            all sites must be created with the same initial text
+        """
+
+        self._site      = site is not None and site or random.getrandbits( 31 ) + 1
+        self._clock     = 0
+
+        self._root      = None
+        self._sites     = { }
+        self._pending   = [ ]
+
+        self.__load( text )
+
+    def site( self ) -> int:
+        """
+            Returns this site id
+        """
+
+        return self._site
+
+    def clock( self ) -> int:
+        """
+            Returns current Lamport clock
+        """
+
+        return self._clock
+
+    # region : Local
+
+    def insert( self, offset: int, text: str, before: tuple = None ) -> tuple | None:
+        """
+            Insert text at visible offset. returns the operation.
+            before is the id of a deleted char the text goes right before,
+            the visible offset alone puts it before all the deleted chars there
+        """
+
+        if not text:
+            return None
+
+        offset = max( 0, min( offset, len( self ) ) )
+        origin = None
+
+        found = before is not None and self.__find( before[ 0 ], before[ 1 ] ) or None
+
+        # Origin is the char before the deleted one, deleted or not
+        if found is not None and found[ 0 ].is_deleted:
+            block, index = found
+
+            if index > 0:
+                origin = ( block.site, block.clock + index - 1 )
+
+            else:
+                previous = self.__previous( block )
+
+                if previous is not None:
+                    origin = ( previous.site, previous.clock + len( previous.text ) - 1 )
+
+        elif offset > 0:
+            block, index    = self.__find_visible( offset - 1 )
+            origin          = ( block.site, block.clock + index )
+
+        operation = ( OP_INSERT, self._site, self._clock, origin, text )
+        self.__integrate_insert( operation )
+
+        return operation
+
+    def delete( self, offset: int, length: int ) -> list:
+        """
+            Delete visible range. returns the operations
+        """
+
+        offset = max( 0, min( offset, len( self ) ) )
+        length = max( 0, min( length, len( self ) - offset ) )
+
+        if length == 0:
+            return [ ]
+
+        operations  = [ ]
+        block, k    = self.__find_visible( offset )
+        is_adjacent = False
+
+        # Collect ids first, integration splits the blocks
+        while block is not None and length > 0:
+            if not block.is_deleted:
+                count = min( len( block.text ) - k, length )
+                clock = block.clock + k
+
+                last = operations and operations[ -1 ] or None
+
+                # One range only for chars next to each other, undo restores a range in one place
+                if is_adjacent and last[ 1 ] == block.site and last[ 2 ] + last[ 3 ] == clock:
+                    operations[ -1 ] = ( OP_DELETE, block.site, last[ 2 ], last[ 3 ] + count )
+                else:
+                    operations.append( ( OP_DELETE, block.site, clock, count ) )
+
+                length -= count
+
+            is_adjacent = not block.is_deleted
+
+            block   = self.__next( block )
+            k       = 0
+
+        for operation in operations:
+            self.__integrate_delete( operation )
+
+        return operations
+
+    # endregion
+
+    # region : Remote
+
+    def apply( self, operations: list ) -> list:
+        """
+            Integrate remote operations.
+            returns visible edits [ ( offset, removed length, inserted text ) ]
+            in the order they must be applied to a plain text copy
+        """
+
+        edits = [ ]
+
+        for operation in operations:
+            self.__apply_operation( operation, edits )
+
+        return edits
+
+    def pending( self ) -> int:
+        """
+            Returns count of operations that wait for their dependencies
+        """
+
+        return len( self._pending )
+
+    def anchor( self, offset: int ) -> tuple | None:
+        """
+            Returns id of the char before visible offset (None at document start).
+            unlike offsets, ids stay valid after other edits
+        """
+
+        offset = min( offset, len( self ) )
+
+        if offset <= 0:
+            return None
+
+        block, index = self.__find_visible( offset - 1 )
+
+        return block.site, block.clock + index
+
+    def resolve( self, anchor: tuple | None ) -> int | None:
+        """
+            Returns visible offset right after the anchor char (None if the id is unknown)
+        """
+
+        if anchor is None:
+            return 0
+
+        found = self.__find( anchor[ 0 ], anchor[ 1 ] )
+
+        if found is None:
+            return None
+
+        block, index = found
+        offset = self.__visible_before( block )
+
+        # Deleted anchor resolves to where it was
+        if not block.is_deleted:
+            offset += index + 1
+
+        return offset
+
+    def visible_ranges( self, site: int, clock: int, length: int ) -> list:
+        """
+            Returns [ ( offset, length ) ] of the visible chars with ids ( site, clock ) .. ( site, clock + length - 1 ).
+            ranges are in document order, chars inserted by others between them split the ranges
+        """
+
+        entry = self._sites.get( site )
+
+        if entry is None:
+            return [ ]
+
+        clocks, blocks = entry
+
+        position    = max( bisect.bisect_right( clocks, clock ) - 1, 0 )
+        end         = clock + length
+        ranges      = [ ]
+
+        while position < len( blocks ) and blocks[ position ].clock < end:
+            block       = blocks[ position ]
+            position    += 1
+
+            first   = max( clock, block.clock )
+            last    = min( end, block.clock + len( block.text ) )
+
+            if first >= last or block.is_deleted:
+                continue
+
+            offset = self.__visible_before( block ) + first - block.clock
+
+            if ranges and ranges[ -1 ][ 0 ] + ranges[ -1 ][ 1 ] == offset:
+                ranges[ -1 ] = ( ranges[ -1 ][ 0 ], ranges[ -1 ][ 1 ] + last - first )
+            else:
+                ranges.append( ( offset, last - first ) )
+
+        return ranges
+
+    def state_vector( self ) -> dict:
+        """
+            Returns { site : next clock } of all integrated inserts
+        """
+
+        result = { }
+
+        # Copied at once, the network thread of a client reads it while the ui thread edits
+        for site, ( clocks, blocks ) in list( self._sites.items( ) ):
+            last = blocks[ -1 ]
+            result[ site ] = last.clock + len( last.text )
+
+        return result
+
+    def operations_since( self, state: dict ) -> list:
+        """
+            Returns operations a site with state vector ( site -> next clock ) is missing.
+            inserts of newer chars, and deletes of all tombstones (deletes are not in state vectors)
+        """
+
+        operations  = [ ]
+        previous    = None      # Id of the char before the block
+        stack       = [ ]
+        node        = self._root
+
+        while stack or node is not None:
+            while node is not None:
+                stack.append( node )
+                node = node.left
+
+            node    = stack.pop( )
+            known   = state.get( node.site, 0 ) - node.clock
+
+            # Origin is the char right before, the receiver has it or gets it first.
+            # chars placed after it are older than the missing ones, so it lands at the same place
+            if known < len( node.text ):
+                known   = max( known, 0 )
+                origin  = ( node.site, node.clock + known - 1 ) if known > 0 else previous
+
+                operations.append( ( OP_INSERT, node.site, node.clock + known, origin, node.text[ known: ] ) )
+
+            if node.is_deleted:
+                operations.append( ( OP_DELETE, node.site, node.clock, len( node.text ) ) )
+
+            previous    = ( node.site, node.clock + len( node.text ) - 1 )
+            node        = node.right
+
+        return operations
+
+    def __apply_operation( self, operation: tuple, edits: list ) -> None:
+        """
+            Integrate one operation, and the pending ones it unblocks
+        """
+
+        if operation[ 0 ] == OP_INSERT:
+            edit = self.__integrate_insert( operation )
+
+            if edit is False:
+                self._pending.append( operation )
+                return
+
+            if edit is not None:
+                edits.append( edit )
+
+            self.__retry_pending( edits )
+            return
+
+        remaining = self.__integrate_delete( operation, edits )
+
+        if remaining is not None:
+            self._pending.append( remaining )
+
+    def __retry_pending( self, edits: list ) -> None:
+        """
+            Integrate pending operations until nothing changes
+        """
+
+        while self._pending:
+            pending         = self._pending
+            self._pending   = [ ]
+
+            for operation in pending:
+                if operation[ 0 ] == OP_INSERT:
+                    edit = self.__integrate_insert( operation )
+
+                    if edit is False:
+                        self._pending.append( operation )
+
+                    elif edit is not None:
+                        edits.append( edit )
+
+                else:
+                    remaining = self.__integrate_delete( operation, edits )
+
+                    if remaining is not None:
+                        self._pending.append( remaining )
+
+            # Nothing was integrated in this pass
+            if len( self._pending ) == len( pending ):
+                break
+
+    # endregion
+
+    # region : Integration
+
+    def __integrate_insert( self, operation: tuple ) -> tuple | bool | None:
+        """
+            Place inserted text in the sequence.
+            returns visible edit, None if already integrated, False if origin is unknown
+        """
+
+        _, site, clock, origin, text = operation
+
+        if self.__find( site, clock ) is not None:
+            return None
+
+        block   = None
+        index   = -1
+
+        if origin is not None:
+            found = self.__find( origin[ 0 ], origin[ 1 ] )
+
+            if found is None:
+                return False
+
+            block, index = found
+
+        stamp = ( clock, site )
+
+        # Skip newer inserts after the same origin (and everything after them)
+        while True:
+            if block is not None and index < len( block.text ) - 1:
+                if ( block.clock + index + 1, block.site ) < stamp:
+                    break
+
+                # Rest of the block has bigger stamps too
+                index = len( block.text ) - 1
+                continue
+
+            # Sequence can be empty, __first( ) is None then
+            following = self.__first( ) if block is None else self.__next( block )
+
+            if following is None or ( following.clock, following.site ) < stamp:
+                break
+
+            block   = following
+            index   = len( following.text ) - 1
+
+        if block is not None and index < len( block.text ) - 1:
+            self.__split_block( block, index + 1 )
+
+        self._clock = max( self._clock, clock + len( text ) )
+
+        # Typing continues the block (same site, next clock, right after it)
+        if block is not None and block.site == site and block.clock + len( block.text ) == clock and not block.is_deleted and len( block.text ) + len( text ) <= MAX_BLOCK_LENGTH:
+            offset = self.__visible_before( block ) + len( block.text )
+
+            block.text += text
+            self.__grow_path( block, len( text ) )
+
+            return offset, 0, text
+
+        new_block = c_block( site, clock, text )
+
+        self.__insert_after( block, new_block )
+        self.__index( new_block )
+
+        return self.__visible_before( new_block ), 0, text
+
+    def __integrate_delete( self, operation: tuple, edits: list = None ) -> tuple | None:
+        """
+            Mark ids range as deleted.
+            returns the operation part that can not be integrated yet (None if done)
+        """
+
+        _, site, clock, length = operation
+
+        end = clock + length
+
+        while clock < end:
+            found = self.__find( site, clock )
+
+            if found is None:
+                return OP_DELETE, site, clock, end - clock
+
+            block, index = found
+
+            if index > 0:
+                block = self.__split_block( block, index )
+
+            count = min( len( block.text ), end - clock )
+
+            if count < len( block.text ):
+                self.__split_block( block, count )
+
+            if not block.is_deleted:
+                if edits is not None:
+                    edits.append( ( self.__visible_before( block ), count, "" ) )
+
+                block.is_deleted = True
+                self.__grow_path( block, 0, -count )
+
+            clock += count
+
+        return None
+
+    # endregion
+
+    # region : Access
+
+    def get( self ) -> str:
+        """
+            Returns visible text
+        """
+
+        parts   = [ ]
+        stack   = [ ]
+        node    = self._root
+
+        # In order walk without recursion
+        while stack or node is not None:
+            while node is not None:
+                stack.append( node )
+                node = node.left
+
+            node = stack.pop( )
+
+            if not node.is_deleted:
+                parts.append( node.text )
+
+            node = node.right
+
+        return "".join( parts )
+
+    def blocks( self ) -> int:
+        """
+            Returns blocks count (including tombstones)
+        """
+
+        return sum( len( blocks ) for _, blocks in self._sites.values( ) )
+
+    def __len__( self ) -> int:
+
+        if self._root is None:
+            return 0
+
+        return self._root.visible
+
+    # endregion
+
+    # region : Snapshot
+
+    def snapshot( self ) -> bytes:
+        """
+            Returns full replication state (blocks with tombstones, clock, pending operations).
+            deleted text is not kept, only its length
+        """
+
+        writer = c_writer( )
+        writer.varint( SNAPSHOT_VERSION )
+        writer.varint( self._clock )
+
+        writer.varint( len( self._sites ) )
+
+        sites = { }
+        for site in self._sites:
+            sites[ site ] = len( sites )
+            writer.varint( site )
+
+        writer.varint( self.blocks( ) )
+
+        # Blocks in sequence order. clocks as delta from the previous block of the site
+        clocks  = { }
+        stack   = [ ]
+        node    = self._root
+
+        while stack or node is not None:
+            while node is not None:
+                stack.append( node )
+                node = node.left
+
+            node = stack.pop( )
+
+            writer.varint( sites[ node.site ] << 1 | node.is_deleted )
+            writer.signed( node.clock - clocks.get( node.site, 0 ) )
+
+            if node.is_deleted:
+                writer.varint( len( node.text ) )
+            else:
+                writer.string( node.text )
+
+            clocks[ node.site ] = node.clock + len( node.text )
+
+            node = node.right
+
+        writer.bytes( encode_operations( self._pending ) )
+
+        return writer.get( )
+
+    def restore( self, data: any ) -> None:
+        """
+            Replace state with a snapshot (bytes or finished c_snapshot_loader).
+            O(n), the tree is built without rotations
+        """
+
+        loader = data
+
+        if type( data ) is not c_snapshot_loader:
+            loader = c_snapshot_loader( )
+            loader.feed( data )
+
+        if not loader.is_done( ):
+            raise Exception( "Snapshot is not complete" )
+
+        blocks = loader.blocks( )
+
+        self._clock     = loader.clock( )
+        self._root      = self.__build( blocks )
+        self._sites     = { }
+        self._pending   = loader.pending( )
+
+        for block in sorted( blocks, key=lambda block: ( block.site, block.clock ) ):
+            entry = self._sites.get( block.site )
+
+            if entry is None:
+                entry = ( [ ], [ ] )
+                self._sites[ block.site ] = entry
+
+            entry[ 0 ].append( block.clock )
+            entry[ 1 ].append( block )
+
+    def __build( self, blocks: list ) -> c_block | None:
+        """
+            Build treap of ordered blocks in linear time
+        """
+
+        # Right spine of the tree built so far
+        spine = [ ]
+
+        for block in blocks:
+            last = None
+
+            while spine and spine[ -1 ].priority < block.priority:
+                last = spine.pop( )
+
+            block.left = last
+
+            if spine:
+                spine[ -1 ].right = block
+
+            spine.append( block )
+
+        if not spine:
+            return None
+
+        root = spine[ 0 ]
+
+        # Children before parents for aggregates
+        order = [ ]
+        stack = [ root ]
+
+        while stack:
+            node = stack.pop( )
+            order.append( node )
+
+            if node.left is not None:
+                stack.append( node.left )
+
+            if node.right is not None:
+                stack.append( node.right )
+
+        for node in reversed( order ):
+            node.update( )
+
+        root.parent = None
+
+        return root
+
+    # endregion
+
+    # region : Blocks
+
+    def __load( self, text: str ) -> None:
+        """
+            Set up initial text as root site blocks
+        """
+
+        if not text:
+            return
+
+        for start in range( 0, len( text ), MAX_BLOCK_LENGTH ):
+            block = c_block( ROOT_SITE, start, text[ start:start + MAX_BLOCK_LENGTH ] )
+
+            self._root = self.__merge( self._root, block )
+            self.__index( block )
+
+        self._root.parent = None
+        self._clock = len( text )
+
+    def __find( self, site: int, clock: int ) -> tuple | None:
+        """
+            Returns ( block, index in block ) of a char id
+        """
+
+        entry = self._sites.get( site )
+
+        if entry is None:
+            return None
+
+        clocks, blocks = entry
+
+        position = bisect.bisect_right( clocks, clock ) - 1
+
+        if position < 0:
+            return None
+
+        block = blocks[ position ]
+
+        if clock >= block.clock + len( block.text ):
+            return None
+
+        return block, clock - block.clock
+
+    def __index( self, block: c_block ) -> None:
+        """
+            Add block to its site index
+        """
+
+        entry = self._sites.get( block.site )
+
+        if entry is None:
+            entry = ( [ ], [ ] )
+            self._sites[ block.site ] = entry
+
+        clocks, blocks = entry
+
+        # Usually the newest block of a site
+        if not clocks or block.clock > clocks[ -1 ]:
+            clocks.append( block.clock )
+            blocks.append( block )
+            return
+
+        position = bisect.bisect_left( clocks, block.clock )
+
+        clocks.insert( position, block.clock )
+        blocks.insert( position, block )
+
+    def __split_block( self, block: c_block, index: int ) -> c_block:
+        """
+            Cut block at index. returns the new block with the rest
+        """
+
+        tail = c_block( block.site, block.clock + index, block.text[ index: ], block.is_deleted )
+
+        removed     = len( block.text ) - index
+        block.text  = block.text[ :index ]
+
+        self.__grow_path( block, -removed, not block.is_deleted and -removed or 0 )
+
+        self.__insert_after( block, tail )
+        self.__index( tail )
+
+        return tail
+
+    def __find_visible( self, offset: int ) -> tuple:
+        """
+            Returns ( block, index in block ) of visible char at offset
+        """
+
+        node = self._root
+
+        while node is not None:
+            left_visible = node.left is not None and node.left.visible or 0
+
+            if offset < left_visible:
+                node = node.left
+                continue
+
+            offset -= left_visible
+
+            own = not node.is_deleted and len( node.text ) or 0
+
+            if offset < own:
+                return node, offset
+
+            offset  -= own
+            node    = node.right
+
+        return None, 0
+
+    def __visible_before( self, block: c_block ) -> int:
+        """
+            Returns visible length before the block
+        """
+
+        visible = block.left is not None and block.left.visible or 0
+        node    = block
+
+        while node.parent is not None:
+            parent = node.parent
+
+            if node is parent.right:
+                visible += parent.left is not None and parent.left.visible or 0
+
+                if not parent.is_deleted:
+                    visible += len( parent.text )
+
+            node = parent
+
+        return visible
+
+    def __size_before( self, block: c_block ) -> int:
+        """
+            Returns total length (with tombstones) before the block
+        """
+
+        size    = block.left is not None and block.left.size or 0
+        node    = block
+
+        while node.parent is not None:
+            parent = node.parent
+
+            if node is parent.right:
+                size += ( parent.left is not None and parent.left.size or 0 ) + len( parent.text )
+
+            node = parent
+
+        return size
+
+    def __grow_path( self, block: c_block, size: int, visible: int = None ) -> None:
+        """
+            Add to subtree lengths from block up to the root
+        """
+
+        if visible is None:
+            visible = size
+
+        node = block
+
+        while node is not None:
+            node.size       += size
+            node.visible    += visible
+
+            node = node.parent
+
+    def __first( self ) -> c_block | None:
+        """
+            Returns first block of the sequence
+        """
+
+        node = self._root
+
+        if node is None:
+            return None
+
+        while node.left is not None:
+            node = node.left
+
+        return node
+
+    def __next( self, block: c_block ) -> c_block | None:
+        """
+            Returns block after this one
+        """
+
+        if block.right is not None:
+            node = block.right
+
+            while node.left is not None:
+                node = node.left
+
+            return node
+
+        node = block
+
+        while node.parent is not None and node is node.parent.right:
+            node = node.parent
+
+        return node.parent
+
+    def __previous( self, block: c_block ) -> c_block | None:
+        """
+            Returns block before this one
+        """
+
+        if block.left is not None:
+            node = block.left
+
+            while node.right is not None:
+                node = node.right
+
+            return node
+
+        node = block
+
+        while node.parent is not None and node is node.parent.left:
+            node = node.parent
+
+        return node.parent
+
+    def __insert_after( self, block: c_block | None, new_block: c_block ) -> None:
+        """
+            Insert new block right after block (at start if None)
+        """
+
+        size = 0
+
+        if block is not None:
+            size = self.__size_before( block ) + len( block.text )
+
+        left, right = self.__split( self._root, size )
+
+        self._root = self.__merge( self.__merge( left, new_block ), right )
+        self._root.parent = None
+
+    # endregion
+
+    # region : Tree
+
+    def __split( self, node: c_block, size: int ) -> tuple:
+        """
+            Split tree into ( blocks of first size chars, rest ).
+            size must be on a block boundary
+        """
+
+        if node is None:
+            return None, None
+
+        left_size = node.left is not None and node.left.size or 0
+
+        if size <= left_size:
+            left, right = self.__split( node.left, size )
+
+            node.left = right
+            node.update( )
+
+            if left is not None:
+                left.parent = None
+
+            return left, node
+
+        left, right = self.__split( node.right, size - left_size - len( node.text ) )
+
+        node.right = left
+        node.update( )
+
+        if right is not None:
+            right.parent = None
+
+        return node, right
+
+    def __merge( self, left: c_block, right: c_block ) -> c_block:
+        """
+            Merge 2 trees where all of left comes before right
+        """
+
+        if left is None:
+            return right
+
+        if right is None:
+            return left
+
+        if left.priority > right.priority:
+            left.right = self.__merge( left.right, right )
+            left.update( )
+
+            return left
+
+        right.left = self.__merge( left, right.left )
+        right.update( )
+
+        return right
+
+    # endregion
+
+
+class c_snapshot_loader:
+    """
+        Incremental c_sequence snapshot reader.
+
+        Chunks can be cut anywhere. Blocks are decoded as soon as
+        they are complete, so the text can be shown while the rest
+        of the snapshot is still received.
+    """
+
+    _buffer:    bytes   # Received data that is not decoded yet
+    _stage:     int     # 0 header, 1 blocks, 2 pending operations, 3 done
+
+    _version:   int     # Snapshot format version
+    _clock:     int     # Sequence clock
+    _sites:     list    # Sites table
+    _clocks:    dict    # site -> end clock of its previous block
+    _remaining: int     # Blocks left to decode
+    _blocks:    list    # Decoded blocks in sequence order
+    _pending:   list    # Pending operations of the snapshot
+
+    def __init__( self ):
+        """
+            Constructor for snapshot loader
+        """
+
+        self._buffer    = b""
+        self._stage     = 0
+
+        self._version   = SNAPSHOT_VERSION
+        self._clock     = 0
+        self._sites     = [ ]
+        self._clocks    = { }
+        self._remaining = 0
+        self._blocks    = [ ]
+        self._pending   = [ ]
+
+    def feed( self, chunk: bytes ) -> str:
+        """
+            Add received data. returns visible text of the blocks it completed
+        """
+
+        data    = self._buffer + bytes( chunk )
+        reader  = c_reader( data )
+        parts   = [ ]
+
+        while self._stage < 3:
+            start = reader.position( )
+
+            # Incomplete item raises, it is read again with the next chunk
+            try:
+                self.__read_item( reader, parts )
+
+            except Exception:
+                reader = c_reader( data, start )
+                break
+
+            if self._version != SNAPSHOT_VERSION:
+                raise Exception( f"Unsupported snapshot version { self._version }" )
+
+        self._buffer = data[ reader.position( ): ]
+
+        return "".join( parts )
+
+    def is_done( self ) -> bool:
+
+        return self._stage == 3
+
+    def clock( self ) -> int:
+
+        return self._clock
+
+    def blocks( self ) -> list:
+
+        return self._blocks
+
+    def pending( self ) -> list:
+
+        return self._pending
+
+    def __read_item( self, reader: c_reader, parts: list ) -> None:
+        """
+            Read header, one block, or the pending operations
+        """
+
+        if self._stage == 0:
+            version = reader.varint( )
+            clock   = reader.varint( )
+            sites   = [ reader.varint( ) for _ in range( reader.varint( ) ) ]
+            count   = reader.varint( )
+
+            self._version   = version
+            self._clock     = clock
+            self._sites     = sites
+            self._remaining = count
+            self._stage     = 1
+
+        elif self._stage == 1:
+            if self._remaining == 0:
+                self._stage = 2
+                return
+
+            head        = reader.varint( )
+            site        = self._sites[ head >> 1 ]
+            clock       = self._clocks.get( site, 0 ) + reader.signed( )
+            is_deleted  = bool( head & 1 )
+
+            # Text of tombstones is never read, only its length
+            if is_deleted:
+                text = "\0" * reader.varint( )
+            else:
+                text = reader.string( )
+                parts.append( text )
+
+            self._blocks.append( c_block( site, clock, text, is_deleted ) )
+            self._clocks[ site ] = clock + len( text )
+            self._remaining -= 1
+
+        else:
+            self._pending   = decode_operations( reader.bytes( ) )
+            self._stage     = 3
+
+
+class c_replica:
+    """
+        Document replica.
+
+        Binds c_sequence to a c_document. Local document edits are turned
+        into operations ("operation" event), and remote operations are
+        applied to the document as plain edits.
+    """
+
+    _document:      c_document  # Replicated document
+    _sequence:      c_sequence  # Replication state
+    _is_applying:   bool        # Are remote edits being applied now
+    _before:        tuple       # Deleted char id the next local insert goes right before (None if any)
+
+    _events:        dict        # Replica events
+
+    def __init__( self, document: c_document, site: int = None ):
+        """
+            Constructor for replica.
+            all replicas must start from the same document text
+        """
+
+        self._document      = document
+        self._sequence      = c_sequence( site, document.get( ) )
+        self._is_applying   = False
+        self._before        = None
+
+        self._events = { }
+        self._events[ "operation" ] = c_event( )
+
+        self._document.set_event( "change", self.__event_document_change, f"Replica::{ id( self ) }" )
+
+    def release( self ) -> None:
+        """
+            Detach from the document
+        """
+
+        self._document.unset_event( "change", f"Replica::{ id( self ) }" )
+
+    def document( self ) -> c_document:
+        """
+            Returns replicated document
+        """
+
+        return self._document
+
+    def sequence( self ) -> c_sequence:
+        """
+            Returns replication state
+        """
+
+        return self._sequence
+
+    def preview( self, text: str ) -> None:
+        """
+            Append text of a snapshot that is still loading, without operations.
+            restore( ) makes the replication state match it. the document is
+            read only until then, local edits would have no state to build on
+        """
+
+        self._is_applying = True
+        self._document.read_only( False )
+
+        try:
+            self._document.insert( len( self._document ), text )
+
+        finally:
+            self._document.read_only( True )
+            self._is_applying = False
+
+    def restore( self, snapshot: any ) -> None:
+        """
+            Replace replication state with a snapshot (bytes or finished c_snapshot_loader).
+            the document is changed only if its text differs
+        """
+
+        self._sequence.restore( snapshot )
+        self._document.read_only( False )
+
+        text = self._sequence.get( )
+
+        if self._document.get( ) == text:
+            return
+
+        self._is_applying = True
+
+        try:
+            self._document.replace( 0, len( self._document ), text )
+
+        finally:
+            self._is_applying = False
+
+    def insert_before( self, anchor: tuple, text: str ) -> int | None:
+        """
+            Insert text where a deleted char was, right before it.
+            undo restores deleted text with it. returns the offset (None if the id is unknown)
+        """
+
+        offset = self._sequence.resolve( anchor )
+
+        if offset is None:
+            return None
+
+        self._before = anchor
+
+        try:
+            self._document.insert( offset, text )
+
+        finally:
+            self._before = None
+
+        return offset
+
+    def apply( self, data: bytes | list ) -> None:
+        """
+            Apply remote operations (encoded or list)
+        """
+
+        operations = data
+
+        if type( data ) is not list:
+            operations = decode_operations( data )
+
+        edits = self._sequence.apply( operations )
+
+        self._is_applying = True
+
+        try:
+            for offset, removed, text in edits:
+                if removed > 0:
+                    self._document.delete( offset, removed )
+
+                if text:
+                    self._document.insert( offset, text )
+
+        finally:
+            self._is_applying = False
+
+    def set_event( self, event_index: str, function: any, function_name: str ) -> None:
+        """
+            Register function for replica event.
+
+            "operation" receives : operations (list), data (encoded bytes)
+        """
+
+        if not event_index in self._events:
+            return
+
+        event: c_event = self._events[ event_index ]
+        event.set( function, function_name, True )
+
+    def unset_event( self, event_index: str, function_name: str ) -> None:
+        """
+            Remove function from replica event
+        """
+
+        if not event_index in self._events:
+            return
+
+        event: c_event = self._events[ event_index ]
+        event.unset( function_name )
+
+    def __event_document_change( self, event ) -> None:
+        """
+            Local document edit. create operations for it
+        """
+
+        if self._is_applying:
+            return
+
+        offset      = event( "offset" )
+        removed     = event( "removed" )
+        inserted    = event( "inserted" )
+
+        operations = [ ]
+
+        if removed > 0:
+            operations.extend( self._sequence.delete( offset, removed ) )
+
+        if inserted > 0:
+            operations.append( self._sequence.insert( offset, self._document.get( offset, offset + inserted ), self._before ) )
+
+        if not operations:
+            return
+
+        event: c_event = self._events[ "operation" ]
+
+        event + ( "operations", operations )
+        event + ( "data",       encode_operations( operations ) )
+
+        event.invoke( )
+
+
+def encode_operations( operations: list ) -> bytes:
+    """
+        Encode operations to compact binary update
+    """
+
+    writer = c_writer( )
+    writer.varint( len( operations ) )
+
+    for operation in operations:
+        writer.varint( operation[ 0 ] )
+
+        if operation[ 0 ] == OP_INSERT:
+            _, site, clock, origin, text = operation
+
+            writer.varint( site )
+            writer.varint( clock )
+
+            # Typing after own text only needs the origin clock
+            if origin is None:
+                writer.varint( ORIGIN_START )
+
+            elif origin[ 0 ] == site:
+                writer.varint( ORIGIN_SAME_SITE )
+                writer.varint( origin[ 1 ] )
+
+            else:
+                writer.varint( ORIGIN_OTHER_SITE )
+                writer.varint( origin[ 0 ] )
+                writer.varint( origin[ 1 ] )
+
+            writer.string( text )
+
+        else:
+            _, site, clock, length = operation
+
+            writer.varint( site )
+            writer.varint( clock )
+            writer.varint( length )
+
+    return writer.get( )
+
+
+def decode_operations( data: bytes ) -> list:
+    """
+        Decode binary update created by encode_operations
+    """
+
+    reader      = c_reader( data )
+    operations  = [ ]
+
+    for _ in range( reader.varint( ) ):
+        kind = reader.varint( )
+
+        if kind == OP_INSERT:
+            site    = reader.varint( )
+            clock   = reader.varint( )
+            origin  = None
+
+            origin_kind = reader.varint( )
+
+            if origin_kind == ORIGIN_SAME_SITE:
+                origin = ( site, reader.varint( ) )
+
+            elif origin_kind == ORIGIN_OTHER_SITE:
+                origin = ( reader.varint( ), reader.varint( ) )
+
+            operations.append( ( OP_INSERT, site, clock, origin, reader.string( ) ) )
+
+        elif kind == OP_DELETE:
+            operations.append( ( OP_DELETE, reader.varint( ), reader.varint( ), reader.varint( ) ) )
+
+        else:
+            raise Exception( f"Unknown operation kind { kind }" )
+
+    return operations
@@ -0,0 +1,604 @@
+# SDK Document .py
+
+import random
+import bisect
+import itertools
+
+from sdk.event import c_event
+
+ADD_CHUNK_SIZE: int = 4096  # Max size of an add buffer chunk that typing can extend
+
+BUFFER_ORIGINAL: int = 0    # Index of the original (file) buffer
+
+
+class c_piece:
+    """
+        Piece table node.
+
+        Points to a slice of one of the buffers, and is also a node
+        in a treap ordered by document offset. Each node keeps the length
+        and newlines count of its whole subtree.
+    """
+
+    __slots__ = ( "buffer", "start", "length", "newlines", "priority", "left", "right", "size", "lines" )
+
+    buffer:     int     # Buffer index
+    start:      int     # Start offset in the buffer
+    length:     int     # Piece length
+    newlines:   int     # Newlines in this piece
+
+    priority:   float   # Treap priority
+    left:       any     # Left child (text before)
+    right:      any     # Right child (text after)
+    size:       int     # Subtree text length
+    lines:      int     # Subtree newlines count
+
+    def __init__( self, buffer: int, start: int, length: int, newlines: int ):
+
+        self.buffer     = buffer
+        self.start      = start
+        self.length     = length
+        self.newlines   = newlines
+
+        self.priority   = random.random( )
+        self.left       = None
+        self.right      = None
+        self.size       = length
+        self.lines      = newlines
+
+    def update( self ) -> None:
+        """
+            Recalculate subtree aggregates from children
+        """
+
+        size    = self.length
+        lines   = self.newlines
+
+        if self.left is not None:
+            size    += self.left.size
+            lines   += self.left.lines
+
+        if self.right is not None:
+            size    += self.right.size
+            lines   += self.right.lines
+
+        self.size   = size
+        self.lines  = lines
+
+
+class c_document:
+    """
+        Document object
+
+        Piece table over an immutable original buffer and append-only
+        add buffers. Pieces are kept in a balanced tree (treap) with
+        length and newlines counts, so insert / delete at any offset and
+        offset <-> ( line, column ) are O(log n) and no edit copies the text.
+    """
+
+    _buffers:       list    # [ original, add chunk, add chunk, ... ]
+    _newlines:      list    # Sorted newline offsets of each buffer
+    _root:          c_piece # Pieces tree root
+    _is_read_only:  bool    # Are insert / delete refused
+
+    _events:        dict    # Document events
+
+    def __init__( self, text: str = "" ):
+        """
+            Constructor for document object
+        """
+
+        self._events = { }
+        self._events[ "change" ] = c_event( )
+
+        self._is_read_only = False
+
+        self.__reset( text )
+
+    def __reset( self, text: str ) -> None:
+        """
+            Set up document with new original text
+        """
+
+        self._buffers   = [ text ]
+        self._newlines  = [ self.__find_newlines( text ) ]
+        self._root      = None
+
+        if text:
+            self._root = c_piece( BUFFER_ORIGINAL, 0, len( text ), len( self._newlines[ 0 ] ) )
+
+    def load( self, path: str, encoding: str = "utf-8" ) -> None:
+        """
+            Load file as the original buffer
+        """
+
+        with open( path, "r", encoding=encoding, newline="" ) as file:
+            text = file.read( )
+
+        removed         = len( self )
+        removed_lines   = self.line_count( ) - 1
+
+        self.__reset( text )
+        # Replaced text is not kept, removed_text is None
+        self.__invoke_change( 0, removed, len( text ), 0, removed_lines, self.line_count( ) - 1, None )
+
+    # region : Edit
+
+    def insert( self, offset: int, text: str ) -> None:
+        """
+            Insert text at specific offset
+        """
+
+        if not text or self._is_read_only:
+            return
+
+        offset      = max( 0, min( offset, len( self ) ) )
+        line        = self.line_at( offset )
+        newlines    = text.count( "\n" )
+
+        # Typing right after the previous insert just extends the last piece
+        if not self.__extend( offset, text, newlines ):
+            buffer, start = self.__append( text )
+
+            piece = c_piece( buffer, start, len( text ), newlines )
+
+            left, right = self.__split( self._root, offset )
+            self._root  = self.__merge( self.__merge( left, piece ), right )
+
+        self.__invoke_change( offset, 0, len( text ), line, 0, newlines )
+
+    def delete( self, offset: int, length: int ) -> str:
+        """
+            Delete text range and returns the deleted text
+        """
+
+        if self._is_read_only:
+            return ""
+
+        offset = max( 0, min( offset, len( self ) ) )
+        length = max( 0, min( length, len( self ) - offset ) )
+
+        if length == 0:
+            return ""
+
+        line = self.line_at( offset )
+
+        left, right     = self.__split( self._root, offset )
+        middle, right   = self.__split( right, length )
+
+        deleted     = self.__collect( middle, 0, length )
+        removed     = middle is not None and middle.lines or 0
+
+        self._root  = self.__merge( left, right )
+
+        self.__invoke_change( offset, length, 0, line, removed, 0, deleted )
+
+        return deleted
+
+    def replace( self, offset: int, length: int, text: str ) -> str:
+        """
+            Replace text range with new text. returns the replaced text
+        """
+
+        deleted = self.delete( offset, length )
+        self.insert( offset, text )
+
+        return deleted
+
+    # endregion
+
+    # region : Access
+
+    def get( self, start: int = 0, end: int = None ) -> str:
+        """
+            Returns text in range [start, end)
+        """
+
+        if end is None or end > len( self ):
+            end = len( self )
+
+        start = max( start, 0 )
+
+        if start >= end:
+            return ""
+
+        return self.__collect( self._root, start, end )
+
+    def line_count( self ) -> int:
+        """
+            Returns number of lines
+        """
+
+        if self._root is None:
+            return 1
+
+        return self._root.lines + 1
+
+    def line_start( self, line: int ) -> int:
+        """
+            Returns offset of the first char in line
+        """
+
+        if line <= 0:
+            return 0
+
+        if line >= self.line_count( ):
+            return len( self )
+
+        # Find the line-th newline, the line starts right after it
+        node    = self._root
+        offset  = 0
+
+        while node is not None:
+            left_lines = node.left is not None and node.left.lines or 0
+            left_size  = node.left is not None and node.left.size or 0
+
+            if line <= left_lines:
+                node = node.left
+                continue
+
+            line -= left_lines
+
+            if line <= node.newlines:
+                newlines    = self._newlines[ node.buffer ]
+                first       = bisect.bisect_left( newlines, node.start )
+
+                return offset + left_size + newlines[ first + line - 1 ] - node.start + 1
+
+            line    -= node.newlines
+            offset  += left_size + node.length
+            node    = node.right
+
+        return len( self )
+
+    def line_end( self, line: int ) -> int:
+        """
+            Returns offset of the line end (the newline char or document end)
+        """
+
+        if line + 1 >= self.line_count( ):
+            return len( self )
+
+        return self.line_start( line + 1 ) - 1
+
+    def line( self, line: int ) -> str:
+        """
+            Returns text of a line without the newline
+        """
+
+        return self.get( self.line_start( line ), self.line_end( line ) )
+
+    def line_at( self, offset: int ) -> int:
+        """
+            Returns line index of specific offset
+        """
+
+        node    = self._root
+        line    = 0
+
+        while node is not None:
+            left_size  = node.left is not None and node.left.size or 0
+
+            if offset < left_size:
+                node = node.left
+                continue
+
+            left_lines = node.left is not None and node.left.lines or 0
+            offset -= left_size
+
+            if offset < node.length:
+                return line + left_lines + self.__count_newlines( node.buffer, node.start, node.start + offset )
+
+            line    += left_lines + node.newlines
+            offset  -= node.length
+            node    = node.right
+
+        return line
+
+    def position( self, offset: int ) -> tuple:
+        """
+            Returns ( line, column ) of specific offset
+        """
+
+        offset  = max( 0, min( offset, len( self ) ) )
+        line    = self.line_at( offset )
+
+        return line, offset - self.line_start( line )
+
+    def offset( self, line: int, column: int ) -> int:
+        """
+            Returns offset of ( line, column ). column is clamped to the line
+        """
+
+        line    = max( 0, min( line, self.line_count( ) - 1 ) )
+        start   = self.line_start( line )
+
+        return start + max( 0, min( column, self.line_end( line ) - start ) )
+
+    def is_read_only( self ) -> bool:
+
+        return self._is_read_only
+
+    def read_only( self, new_value: bool = None ) -> bool | None:
+        """
+            Returns / Sets if insert / delete are refused
+        """
+
+        if new_value is None:
+            return self._is_read_only
+
+        self._is_read_only = new_value
+
+    def __len__( self ) -> int:
+
+        if self._root is None:
+            return 0
+
+        return self._root.size
+
+    # endregion
+
+    # region : Events
+
+    def set_event( self, event_index: str, function: any, function_name: str ) -> None:
+        """
+            Register function for document event.
+
+            "change" receives : offset, removed, inserted (lengths),
+                                line, removed_lines, inserted_lines,
+                                removed_text (None when the whole document was loaded)
+        """
+
+        if not event_index in self._events:
+            return
+
+        event: c_event = self._events[ event_index ]
+        event.set( function, function_name, True )
+
+    def unset_event( self, event_index: str, function_name: str ) -> None:
+        """
+            Remove function from document event
+        """
+
+        if not event_index in self._events:
+            return
+
+        event: c_event = self._events[ event_index ]
+        event.unset( function_name )
+
+    def __invoke_change( self, offset: int, removed: int, inserted: int, line: int, removed_lines: int, inserted_lines: int, removed_text: str | None = "" ) -> None:
+        """
+            Invoke change event
+        """
+
+        event: c_event = self._events[ "change" ]
+
+        event + ( "document",       self )
+        event + ( "offset",         offset )
+        event + ( "removed",        removed )
+        event + ( "inserted",       inserted )
+        event + ( "line",           line )
+        event + ( "removed_lines",  removed_lines )
+        event + ( "inserted_lines", inserted_lines )
+        event + ( "removed_text",   removed_text )
+
+        event.invoke( )
+
+    # endregion
+
+    # region : Buffers
+
+    def __find_newlines( self, text: str ) -> list:
+        """
+            Returns sorted offsets of all newlines in text
+        """
+
+        if not "\n" in text:
+            return [ ]
+
+        # Accumulate line lengths, done in C by split / accumulate
+        ends = list( itertools.accumulate( len( line ) + 1 for line in text.split( "\n" ) ) )
+        ends.pop( )
+
+        return [ end - 1 for end in ends ]
+
+    def __count_newlines( self, buffer: int, start: int, end: int ) -> int:
+        """
+            Returns newlines count in buffer range [start, end)
+        """
+
+        newlines = self._newlines[ buffer ]
+
+        return bisect.bisect_left( newlines, end ) - bisect.bisect_left( newlines, start )
+
+    def __append( self, text: str ) -> tuple:
+        """
+            Append text to the add buffer, returns ( buffer, start )
+        """
+
+        last = len( self._buffers ) - 1
+
+        # Original buffer is never changed and big chunks are not copied again
+        if last == BUFFER_ORIGINAL or len( self._buffers[ last ] ) + len( text ) > ADD_CHUNK_SIZE:
+            self._buffers.append( text )
+            self._newlines.append( self.__find_newlines( text ) )
+
+            return last + 1, 0
+
+        start = len( self._buffers[ last ] )
+
+        self._buffers[ last ] += text
+        self._newlines[ last ].extend( start + offset for offset in self.__find_newlines( text ) )
+
+        return last, start
+
+    def __extend( self, offset: int, text: str, newlines: int ) -> bool:
+        """
+            Try to extend the piece that ends at offset, if it ends at the add buffer end
+        """
+
+        if offset == 0:
+            return False
+
+        last = len( self._buffers ) - 1
+        if last == BUFFER_ORIGINAL or len( self._buffers[ last ] ) + len( text ) > ADD_CHUNK_SIZE:
+            return False
+
+        # Find the piece that holds the char before offset
+        node    = self._root
+        target  = offset - 1
+
+        while node is not None:
+            left_size = node.left is not None and node.left.size or 0
+
+            if target < left_size:
+                node = node.left
+                continue
+
+            target -= left_size
+
+            if target < node.length:
+                break
+
+            target  -= node.length
+            node    = node.right
+
+        if node is None or node.buffer != last or target != node.length - 1:
+            return False
+
+        if node.start + node.length != len( self._buffers[ last ] ):
+            return False
+
+        self.__append( text )
+
+        # Update the piece and every subtree size on the path to it
+        node    = self._root
+        target  = offset - 1
+
+        while node is not None:
+            node.size   += len( text )
+            node.lines  += newlines
+
+            left_size = node.left is not None and node.left.size or 0
+
+            if target < left_size:
+                node = node.left
+                continue
+
+            target -= left_size
+
+            if target < node.length:
+                node.length     += len( text )
+                node.newlines   += newlines
+                break
+
+            target  -= node.length
+            node    = node.right
+
+        return True
+
+    # endregion
+
+    # region : Tree
+
+    def __split( self, node: c_piece, offset: int ) -> tuple:
+        """
+            Split tree into ( first offset chars, rest )
+        """
+
+        if node is None:
+            return None, None
+
+        left_size = node.left is not None and node.left.size or 0
+
+        if offset <= left_size:
+            left, right = self.__split( node.left, offset )
+
+            node.left = right
+            node.update( )
+
+            return left, node
+
+        if offset >= left_size + node.length:
+            left, right = self.__split( node.right, offset - left_size - node.length )
+
+            node.right = left
+            node.update( )
+
+            return node, right
+
+        # Offset is inside this piece, cut it to 2 pieces
+        cut = offset - left_size
+
+        tail = c_piece(
+            node.buffer,
+            node.start + cut,
+            node.length - cut,
+            self.__count_newlines( node.buffer, node.start + cut, node.start + node.length )
+        )
+
+        node.length     = cut
+        node.newlines   -= tail.newlines
+
+        tail.right  = node.right
+        tail.update( )
+
+        node.right  = None
+        node.update( )
+
+        return node, tail
+
+    def __merge( self, left: c_piece, right: c_piece ) -> c_piece:
+        """
+            Merge 2 trees where all of left comes before right
+        """
+
+        if left is None:
+            return right
+
+        if right is None:
+            return left
+
+        if left.priority > right.priority:
+            left.right = self.__merge( left.right, right )
+            left.update( )
+
+            return left
+
+        right.left = self.__merge( left, right.left )
+        right.update( )
+
+        return right
+
+    def __collect( self, node: c_piece, start: int, end: int ) -> str:
+        """
+            Returns text in range [start, end) of a subtree
+        """
+
+        parts = [ ]
+        self.__collect_parts( node, 0, start, end, parts )
+
+        return "".join( parts )
+
+    def __collect_parts( self, node: c_piece, base: int, start: int, end: int, parts: list ) -> None:
+        """
+            In order walk that skips subtrees outside the range
+        """
+
+        if node is None or base >= end or base + node.size <= start:
+            return
+
+        left_size = node.left is not None and node.left.size or 0
+
+        self.__collect_parts( node.left, base, start, end, parts )
+
+        piece_start = base + left_size
+        cut_start   = max( start - piece_start, 0 )
+        cut_end     = min( end - piece_start, node.length )
+
+        if cut_start < cut_end:
+            parts.append( self._buffers[ node.buffer ][ node.start + cut_start:node.start + cut_end ] )
+
+        self.__collect_parts( node.right, piece_start + node.length, start, end, parts )
+
+    # endregion
@@ -0,0 +1,356 @@
+# SDK Fenwick .py
+
+import array
+import bisect
+import itertools
+
+LINES_BLOCK:    int = 256   # Wanted lines per block of c_line_heights (blocks split at twice this size)
+
+
+class c_fenwick_tree:
+    """
+        Fenwick (binary indexed) tree of numbers.
+
+        Prefix sums, point updates, appends and search by prefix sum
+        are O(log n). Built from a list in O(n).
+    """
+
+    _values:    list    # Item values
+    _tree:      list    # 1 based partial sums, node i covers ( i - lowbit( i ), i ]
+
+    def __init__( self, values: list = None ):
+        """
+            Constructor for fenwick tree
+        """
+
+        self.build( values is not None and values or [ ] )
+
+    def build( self, values: list ) -> None:
+        """
+            Replace all items. O(n)
+        """
+
+        self._values    = list( values )
+        self._tree      = [ 0 ] + self._values
+
+        tree = self._tree
+        size = len( tree )
+
+        # Each node adds itself to its parent once
+        for index in range( 1, size ):
+            parent = index + ( index & -index )
+
+            if parent < size:
+                tree[ parent ] += tree[ index ]
+
+    def add( self, index: int, delta: float ) -> None:
+        """
+            Add delta to item
+        """
+
+        self._values[ index ] += delta
+
+        tree    = self._tree
+        size    = len( tree )
+        index   += 1
+
+        while index < size:
+            tree[ index ] += delta
+            index += index & -index
+
+    def set( self, index: int, value: float ) -> None:
+        """
+            Set item value
+        """
+
+        delta = value - self._values[ index ]
+
+        if delta != 0:
+            self.add( index, delta )
+
+    def get( self, index: int ) -> float:
+
+        return self._values[ index ]
+
+    def append( self, value: float ) -> None:
+        """
+            Add item at the end
+        """
+
+        index = len( self._values ) + 1
+
+        # New node covers ( index - lowbit, index ], it is the item and the sums of earlier nodes in range
+        node    = value
+        lowbit  = index & -index
+        child   = index - 1
+
+        while child > index - lowbit:
+            node    += self._tree[ child ]
+            child   -= child & -child
+
+        self._values.append( value )
+        self._tree.append( node )
+
+    def prefix( self, index: int ) -> float:
+        """
+            Returns sum of items [0, index)
+        """
+
+        tree    = self._tree
+        result  = 0
+
+        while index > 0:
+            result  += tree[ index ]
+            index   -= index & -index
+
+        return result
+
+    def total( self ) -> float:
+
+        return self.prefix( len( self._values ) )
+
+    def find( self, value: float ) -> tuple:
+        """
+            Returns ( index, value left inside the item ) of the item that contains value.
+            items count if value is after all items
+        """
+
+        tree    = self._tree
+        size    = len( tree )
+        index   = 0
+        step    = 1 << ( size.bit_length( ) )
+
+        # Binary lifting, largest index with prefix <= value
+        while step > 0:
+            next_index = index + step
+
+            if next_index < size and tree[ next_index ] <= value:
+                index = next_index
+                value -= tree[ next_index ]
+
+            step >>= 1
+
+        return index, value
+
+    def __len__( self ) -> int:
+
+        return len( self._values )
+
+
+class c_line_heights:
+    """
+        Heights of lines for y <-> line lookups.
+
+        Lines are kept in blocks (arrays of heights), and Fenwick trees
+        over the blocks give the y of a block and the block of a line.
+        Changing the height of one line is O(log n), inserting or
+        removing lines changes one block, queries are O(log n) plus a
+        search inside one block.
+    """
+
+    _default:   float   # Height of new lines
+
+    _blocks:    list    # [ array of heights ]
+    _heights:   c_fenwick_tree  # Height of each block
+    _counts:    c_fenwick_tree  # Lines in each block
+
+    def __init__( self, count: int = 1, default: float = 1 ):
+        """
+            Constructor for line heights
+        """
+
+        self._default = default
+        self.reset( count )
+
+    def reset( self, count: int, default: float = None ) -> None:
+        """
+            Set all lines to the default height
+        """
+
+        if default is not None:
+            self._default = default
+
+        self._blocks = [ ]
+
+        for start in range( 0, count, LINES_BLOCK ):
+            self._blocks.append( array.array( "d", [ self._default ] ) * min( LINES_BLOCK, count - start ) )
+
+        self.__rebuild( )
+
+    def default( self ) -> float:
+
+        return self._default
+
+    # region : Edit
+
+    def set( self, line: int, height: float ) -> None:
+        """
+            Set height of a line. O(log n)
+        """
+
+        block, index = self.__locate( line )
+        heights = self._blocks[ block ]
+
+        delta = height - heights[ index ]
+
+        if delta == 0:
+            return
+
+        heights[ index ] = height
+        self._heights.add( block, delta )
+
+    def insert( self, line: int, count: int ) -> None:
+        """
+            Insert count lines with the default height before line
+        """
+
+        if count <= 0:
+            return
+
+        if not self._blocks:
+            return self.reset( count )
+
+        block, index = self.__locate( min( line, len( self ) ) )
+        heights = self._blocks[ block ]
+
+        heights[ index:index ] = array.array( "d", [ self._default ] ) * count
+
+        if len( heights ) > LINES_BLOCK * 2:
+            return self.__split( block )
+
+        self._heights.add( block, self._default * count )
+        self._counts.add( block, count )
+
+    def remove( self, line: int, count: int ) -> None:
+        """
+            Remove count lines starting at line
+        """
+
+        count = min( count, len( self ) - line )
+
+        while count > 0:
+            block, index = self.__locate( line )
+            heights = self._blocks[ block ]
+
+            removed = min( count, len( heights ) - index )
+            height  = sum( heights[ index:index + removed ] )
+
+            del heights[ index:index + removed ]
+            count -= removed
+
+            if not heights:
+                del self._blocks[ block ]
+                self.__rebuild( )
+                continue
+
+            self._heights.add( block, -height )
+            self._counts.add( block, -removed )
+
+    def resize( self, count: int ) -> None:
+        """
+            Add / remove lines at the end to have count lines
+        """
+
+        size = len( self )
+
+        if count > size:
+            self.insert( size, count - size )
+
+        elif count < size:
+            self.remove( count, size - count )
+
+    # endregion
+
+    # region : Access
+
+    def height( self, line: int ) -> float:
+
+        block, index = self.__locate( line )
+
+        return self._blocks[ block ][ index ]
+
+    def y( self, line: int ) -> float:
+        """
+            Returns top of a line (total height for line == len)
+        """
+
+        if line >= len( self ):
+            return self.total( )
+
+        block, index = self.__locate( line )
+
+        return self._heights.prefix( block ) + sum( self._blocks[ block ][ :index ] )
+
+    def line_at( self, y: float ) -> tuple:
+        """
+            Returns ( line, y inside the line ) at y. clamped to the lines
+        """
+
+        if not self._blocks:
+            return 0, 0
+
+        if y < 0:
+            return 0, y
+
+        block, inside = self._heights.find( y )
+
+        if block >= len( self._blocks ):
+            last = len( self ) - 1
+            return last, y - self.y( last )
+
+        heights = self._blocks[ block ]
+
+        # Sums inside the block are done in C
+        ends    = list( itertools.accumulate( heights ) )
+        index   = min( bisect.bisect_right( ends, inside ), len( heights ) - 1 )
+
+        start = index > 0 and ends[ index - 1 ] or 0
+
+        return self._counts.prefix( block ) + index, inside - start
+
+    def total( self ) -> float:
+
+        return self._heights.total( )
+
+    def __len__( self ) -> int:
+
+        return int( self._counts.total( ) )
+
+    # endregion
+
+    # region : Blocks
+
+    def __locate( self, line: int ) -> tuple:
+        """
+            Returns ( block, index in block ) of a line
+        """
+
+        block, index = self._counts.find( line )
+
+        # Line after the last one belongs to the end of the last block
+        if block >= len( self._blocks ):
+            block = len( self._blocks ) - 1
+            index = len( self._blocks[ block ] )
+
+        return block, int( index )
+
+    def __split( self, block: int ) -> None:
+        """
+            Split big block into blocks of the wanted size
+        """
+
+        heights = self._blocks[ block ]
+        parts   = [ heights[ start:start + LINES_BLOCK ] for start in range( 0, len( heights ), LINES_BLOCK ) ]
+
+        self._blocks[ block:block + 1 ] = parts
+        self.__rebuild( )
+
+    def __rebuild( self ) -> None:
+        """
+            Build block trees. O(blocks)
+        """
+
+        self._heights   = c_fenwick_tree( [ sum( heights ) for heights in self._blocks ] )
+        self._counts    = c_fenwick_tree( [ len( heights ) for heights in self._blocks ] )
+
+    # endregion
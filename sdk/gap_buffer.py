@@ -0,0 +1,243 @@
+# SDK Gap Buffer .py
+
+import bisect
+
+class c_gap_buffer:
+    """
+        Gap buffer object
+
+        Text is stored as 2 stacks around the gap (the edit point),
+        so insert / delete at the gap are amortized O(1) and moving
+        the gap costs only the distance it moves.
+
+        Each char can also carry a width. Both sides keep running sums
+        of the widths, so x offset of any index is O(1) and finding
+        index by x offset is O(log n).
+    """
+
+    _before:        list    # Chars before the gap
+    _after:         list    # Chars after the gap (reversed, last char first)
+    _before_sum:    list    # _before_sum[ i ] = width of the first i chars
+    _after_sum:     list    # _after_sum[ j ]  = width of the last j chars
+    _text:          str     # Cached string (None after an edit)
+
+    def __init__( self, text: str = "", widths: list = None ):
+        """
+            Constructor for gap buffer
+        """
+
+        self._before        = [ ]
+        self._after         = [ ]
+        self._before_sum    = [ 0.0 ]
+        self._after_sum     = [ 0.0 ]
+        self._text          = ""
+
+        if text:
+            self.insert( text, widths )
+
+    # region : Edit
+
+    def gap( self ) -> int:
+        """
+            Returns gap index
+        """
+
+        return len( self._before )
+
+    def move( self, index: int ) -> None:
+        """
+            Move the gap to specific index
+        """
+
+        index = max( 0, min( index, len( self ) ) )
+
+        before      = self._before
+        after       = self._after
+        before_sum  = self._before_sum
+        after_sum   = self._after_sum
+
+        while len( before ) > index:
+            width = before_sum.pop( ) - before_sum[ -1 ]
+
+            after.append( before.pop( ) )
+            after_sum.append( after_sum[ -1 ] + width )
+
+        while len( before ) < index:
+            width = after_sum.pop( ) - after_sum[ -1 ]
+
+            before.append( after.pop( ) )
+            before_sum.append( before_sum[ -1 ] + width )
+
+    def insert( self, text: str, widths: list = None ) -> None:
+        """
+            Insert text at the gap. widths is optional width for each char
+        """
+
+        if not text:
+            return
+
+        self._before.extend( text )
+
+        before_sum  = self._before_sum
+        offset      = before_sum[ -1 ]
+
+        if widths is None:
+            before_sum.extend( [ offset ] * len( text ) )
+        else:
+            for width in widths:
+                offset += width
+                before_sum.append( offset )
+
+        self._text = None
+
+    def delete_before( self, count: int = 1 ) -> str:
+        """
+            Delete chars before the gap (backspace). returns deleted text
+        """
+
+        count = min( count, len( self._before ) )
+        if count <= 0:
+            return ""
+
+        deleted = "".join( self._before[ -count: ] )
+
+        del self._before[ -count: ]
+        del self._before_sum[ -count: ]
+
+        self._text = None
+
+        return deleted
+
+    def delete_after( self, count: int = 1 ) -> str:
+        """
+            Delete chars after the gap (delete key). returns deleted text
+        """
+
+        count = min( count, len( self._after ) )
+        if count <= 0:
+            return ""
+
+        deleted = "".join( reversed( self._after[ -count: ] ) )
+
+        del self._after[ -count: ]
+        del self._after_sum[ -count: ]
+
+        self._text = None
+
+        return deleted
+
+    def clear( self ) -> None:
+        """
+            Remove all the text
+        """
+
+        self._before.clear( )
+        self._after.clear( )
+
+        self._before_sum    = [ 0.0 ]
+        self._after_sum     = [ 0.0 ]
+        self._text          = ""
+
+    # endregion
+
+    # region : Access
+
+    def get( self ) -> str:
+        """
+            Returns the text. built once and cached until next edit
+        """
+
+        if self._text is None:
+            self._text = "".join( self._before ) + "".join( reversed( self._after ) )
+
+        return self._text
+
+    def char( self, index: int ) -> str:
+        """
+            Returns char at specific index
+        """
+
+        if index < len( self._before ):
+            return self._before[ index ]
+
+        return self._after[ len( self ) - index - 1 ]
+
+    def __len__( self ) -> int:
+
+        return len( self._before ) + len( self._after )
+
+    # endregion
+
+    # region : Widths
+
+    def width( self ) -> float:
+        """
+            Returns width of all the text
+        """
+
+        return self._before_sum[ -1 ] + self._after_sum[ -1 ]
+
+    def offset( self, index: int ) -> float:
+        """
+            Returns x offset of specific index
+        """
+
+        gap = len( self._before )
+
+        if index <= gap:
+            return self._before_sum[ max( index, 0 ) ]
+
+        after_count = max( len( self ) - index, 0 )
+
+        return self.width( ) - self._after_sum[ after_count ]
+
+    def index_at( self, x: float ) -> int:
+        """
+            Returns index closest to x offset (binary search)
+        """
+
+        length = len( self )
+
+        # Find the char that contains x
+        if x < self._before_sum[ -1 ]:
+            index = bisect.bisect_right( self._before_sum, x ) - 1
+        else:
+            # Right side sums grow from the end, offset( i ) = width - _after_sum[ length - i ]
+            after_count = bisect.bisect_left( self._after_sum, self.width( ) - x )
+            index       = length - after_count
+
+        if index < 0:
+            return 0
+
+        if index >= length:
+            return length
+
+        # Passed the middle of the char, select after it
+        if x >= ( self.offset( index ) + self.offset( index + 1 ) ) * 0.5:
+            return index + 1
+
+        return index
+
+    def measure( self, function: any ) -> None:
+        """
+            Measure all chars widths again with function( char ) -> width
+        """
+
+        before_sum  = [ 0.0 ]
+        offset      = 0.0
+
+        for char in self._before:
+            offset += function( char )
+            before_sum.append( offset )
+
+        after_sum   = [ 0.0 ]
+        offset      = 0.0
+
+        for char in self._after:
+            offset += function( char )
+            after_sum.append( offset )
+
+        self._before_sum    = before_sum
+        self._after_sum     = after_sum
+
+    # endregion
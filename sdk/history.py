@@ -0,0 +1,609 @@
+# SDK History .py
+
+import os
+import time
+import zlib
+import array
+import bisect
+import shutil
+import tempfile
+
+from sdk.binary     import c_writer, c_reader
+from sdk.crdt       import c_replica, OP_INSERT
+
+RECORD_INSERT:      int = 0     # Text was inserted, undo deletes it
+RECORD_DELETE:      int = 1     # Text was deleted, undo inserts it back
+
+RECORD_SIZE:        int = 33    # Bytes of a record in the columns (kind + 4 int64)
+
+HISTORY_MEMORY:     int = 4 * 1024 * 1024   # History bytes kept in memory before old groups are spilled to disk
+HISTORY_DISK:       int = 64 * 1024 * 1024  # Spilled bytes kept on disk before the oldest groups are dropped
+GROUP_TIME:         float = 1.0             # Max seconds between edits of one group
+
+SEGMENT_SUFFIX:     str = ".segment"
+
+
+class c_history:
+    """
+        Undo / redo history of a document.
+
+        Records are kept in columns of arrays, and the deleted text of
+        all records in one bytearray, so each edit costs a few bytes
+        and no objects. Edits are grouped while they continue from the
+        previous one (typing, backspace runs, replace) within group time.
+
+        Once the memory limit is reached, the oldest half is compressed
+        to a segment file, and segments are read back when undo reaches
+        them. The oldest segments are dropped above the disk limit.
+
+        With a replica (shared document) only local edits are recorded,
+        by CRDT char ids instead of offsets. Undo resolves the ids, so
+        it applies to where the text is now, after remote edits.
+        Text restored by undo gets new ids, the old ids are remapped to
+        them so older records still find it.
+
+        The document needs replace( offset, length, text ), and the
+        "change" event of c_document. Objects without it call record( ).
+    """
+
+    _document:      any         # Document the history applies to
+    _replica:       c_replica   # Replica of a shared document (None if local)
+
+    _kinds:         array.array # Record kind
+    _sites:         array.array # Char site of shared records (0 if local)
+    _positions:     array.array # Offset, or char clock of shared records
+    _lengths:       array.array # Chars count
+    _ends:          array.array # End of the record deleted text in _text
+    _text:          bytearray   # Deleted text of all records (utf-8)
+    _groups:        array.array # First record of each group
+
+    _redo:          list        # [ [ ( kind, site, position, length, text ) ] ] undone groups, last is the next redo
+    _remap:         dict        # { site : ( [ clock ], [ ( clock, length, new site, new clock ) ] ) } deleted ids restored with new ids (shared)
+
+    _group_time:    float       # Time of the last recorded edit
+    _group_caret:   int         # Document offset after the last recorded edit (None to break the group)
+    _group_kind:    int         # Kind of the last recorded edit
+    _group_depth:   int         # Open begin_group calls
+    _is_group_new:  bool        # Must the next edit start a group
+
+    _operations:    list        # Local operations of the edit being recorded (shared)
+    _capture:       list        # Records of edits made by undo / redo (None if not applying)
+
+    _directory:     str         # Spill directory (None until the first spill)
+    _is_own_directory: bool     # Was the directory created by the history
+    _segments:      list        # [ ( path, size ) ] oldest first
+    _spilled:       int         # Written segments count, numbers the next one
+    _memory_limit:  int
+    _disk_limit:    int
+
+    def __init__( self, document: any, replica: c_replica = None, memory_limit: int = HISTORY_MEMORY, disk_limit: int = HISTORY_DISK, directory: str = None ):
+        """
+            Constructor for history.
+            create it after the replica, it must see the operations before the edits
+        """
+
+        self._document      = document
+        self._replica       = replica
+
+        self._memory_limit  = memory_limit
+        self._disk_limit    = disk_limit
+        self._directory     = directory
+        self._is_own_directory = False
+        self._segments      = [ ]
+        self._spilled       = 0
+
+        self._operations    = None
+        self._capture       = None
+
+        self.clear( )
+
+        if hasattr( document, "set_event" ):
+            document.set_event( "change", self.__event_document_change, f"History::{ id( self ) }" )
+
+        if replica is not None:
+            replica.set_event( "operation", self.__event_operation, f"History::{ id( self ) }" )
+
+    def release( self ) -> None:
+        """
+            Detach from the document and remove spilled segments
+        """
+
+        if hasattr( self._document, "unset_event" ):
+            self._document.unset_event( "change", f"History::{ id( self ) }" )
+
+        if self._replica is not None:
+            self._replica.unset_event( "operation", f"History::{ id( self ) }" )
+
+        self.__remove_segments( )
+
+        if self._is_own_directory and self._directory is not None:
+            shutil.rmtree( self._directory, ignore_errors=True )
+            self._directory = None
+
+    def clear( self ) -> None:
+        """
+            Forget all history
+        """
+
+        self._kinds     = array.array( "b" )
+        self._sites     = array.array( "q" )
+        self._positions = array.array( "q" )
+        self._lengths   = array.array( "q" )
+        self._ends      = array.array( "q" )
+        self._text      = bytearray( )
+        self._groups    = array.array( "q" )
+
+        self._redo      = [ ]
+        self._remap     = { }
+
+        self._group_time    = 0
+        self._group_caret   = None
+        self._group_kind    = RECORD_INSERT
+        self._group_depth   = 0
+        self._is_group_new  = False
+
+        self.__remove_segments( )
+
+    def stats( self ) -> dict:
+        """
+            Returns history information
+        """
+
+        return {
+            "records":  len( self._kinds ),
+            "groups":   len( self._groups ),
+            "redo":     len( self._redo ),
+            "memory":   self.__memory( ),
+            "segments": len( self._segments ),
+            "disk":     sum( size for _, size in self._segments )
+        }
+
+    # region : Groups
+
+    def begin_group( self ) -> None:
+        """
+            Following edits are one group until end_group
+        """
+
+        if self._group_depth == 0:
+            self._is_group_new = True
+
+        self._group_depth += 1
+
+    def end_group( self ) -> None:
+
+        self._group_depth = max( self._group_depth - 1, 0 )
+
+        if self._group_depth == 0:
+            self.break_group( )
+
+    def break_group( self ) -> None:
+        """
+            Next edit starts a new group (caret moved, focus lost)
+        """
+
+        self._group_caret = None
+
+    # endregion
+
+    # region : Undo
+
+    def can_undo( self ) -> bool:
+
+        return len( self._groups ) > 0 or len( self._segments ) > 0
+
+    def can_redo( self ) -> bool:
+
+        return len( self._redo ) > 0
+
+    def undo( self ) -> int | None:
+        """
+            Undo the last group. returns the offset after the restored edit (None if nothing to undo)
+        """
+
+        if not self._groups and self._segments:
+            self.__load_segment( )
+
+        if not self._groups:
+            return None
+
+        start   = self._groups.pop( )
+        records = [ self.__read( index ) for index in range( start, len( self._kinds ) ) ]
+
+        self.__truncate( start )
+
+        captured, caret = self.__apply_inverse( records )
+
+        if captured:
+            self._redo.append( captured )
+
+        return caret
+
+    def redo( self ) -> int | None:
+        """
+            Redo the last undone group. returns the offset after the edit (None if nothing to redo)
+        """
+
+        if not self._redo:
+            return None
+
+        captured, caret = self.__apply_inverse( self._redo.pop( ) )
+
+        if captured:
+            self._groups.append( len( self._kinds ) )
+
+            for record in captured:
+                self.__write( *record )
+
+            self.__limit_memory( )
+
+        return caret
+
+    def __apply_inverse( self, records: list ) -> tuple:
+        """
+            Apply inverse of records, last first. returns ( records of the applied edits, caret )
+        """
+
+        self._capture   = [ ]
+        caret           = None
+
+        try:
+            for kind, site, position, length, text in reversed( records ):
+                if self._replica is None:
+                    ranges = kind == RECORD_INSERT and [ ( position, length ) ] or [ ]
+                    offset = position
+
+                # Chars ids to where they are now
+                elif kind == RECORD_INSERT:
+                    ranges = self.__visible_ranges( site, position, length )
+                    offset = ranges[ 0 ][ 0 ] if ranges else None
+
+                else:
+                    ranges = [ ]
+                    offset = self._replica.sequence( ).resolve( ( site, position ) )
+
+                # Inserted chars that others deleted are not there anymore
+                if offset is None:
+                    continue
+
+                if kind == RECORD_INSERT:
+                    # Last range first, offsets before it stay valid
+                    for start, count in reversed( ranges ):
+                        self._document.replace( start, count, "" )
+
+                    caret = offset
+
+                elif self._replica is None:
+                    self._document.replace( offset, 0, text )
+
+                    caret = offset + len( text )
+
+                else:
+                    # Right before the deleted chars, offset alone can put it before others deleted there
+                    self._replica.insert_before( ( site, position ), text )
+
+                    caret = offset + len( text )
+
+                    # Last captured record is the insert of the restored text
+                    if self._capture and self._capture[ -1 ][ 0 ] == RECORD_INSERT:
+                        _, new_site, new_clock, _, _ = self._capture[ -1 ]
+                        self.__remap( site, position, length, new_site, new_clock )
+
+            return self._capture, caret
+
+        finally:
+            self._capture = None
+            self.break_group( )
+
+    def __remap( self, site: int, clock: int, length: int, new_site: int, new_clock: int ) -> None:
+        """
+            Deleted chars ( site, clock ) .. were restored as ( new_site, new_clock ) ..
+        """
+
+        clocks, targets = self._remap.setdefault( site, ( [ ], [ ] ) )
+
+        # Restored ids are deleted for good, ranges of a site never overlap
+        position = bisect.bisect_right( clocks, clock )
+
+        clocks.insert( position, clock )
+        targets.insert( position, ( clock, length, new_site, new_clock ) )
+
+    def __visible_ranges( self, site: int, clock: int, length: int ) -> list:
+        """
+            Returns [ ( offset, length ) ] of the visible chars of the ids, and of the chars that restored them
+        """
+
+        ranges  = self._replica.sequence( ).visible_ranges( site, clock, length )
+        entry   = self._remap.get( site )
+
+        if entry is None:
+            return ranges
+
+        clocks, targets = entry
+
+        position    = max( bisect.bisect_right( clocks, clock ) - 1, 0 )
+        end         = clock + length
+
+        while position < len( targets ) and targets[ position ][ 0 ] < end:
+            first_clock, count, new_site, new_clock = targets[ position ]
+            position += 1
+
+            first   = max( clock, first_clock )
+            last    = min( end, first_clock + count )
+
+            if first < last:
+                ranges.extend( self.__visible_ranges( new_site, new_clock + first - first_clock, last - first ) )
+
+        # Document order, restored chars can be next to the others
+        merged = [ ]
+
+        for offset, count in sorted( ranges ):
+            if merged and merged[ -1 ][ 0 ] + merged[ -1 ][ 1 ] == offset:
+                merged[ -1 ] = ( merged[ -1 ][ 0 ], merged[ -1 ][ 1 ] + count )
+            else:
+                merged.append( ( offset, count ) )
+
+        return merged
+
+    # endregion
+
+    # region : Record
+
+    def record( self, offset: int, removed: str, inserted: str ) -> None:
+        """
+            Record a local edit. called by the document change event,
+            or by owners of objects without events
+        """
+
+        if removed:
+            self.__add( RECORD_DELETE, 0, offset, len( removed ), removed, offset )
+
+        if inserted:
+            self.__add( RECORD_INSERT, 0, offset, len( inserted ), "", offset )
+
+    def __add( self, kind: int, site: int, position: int, length: int, text: str, offset: int, size: int = None ) -> None:
+        """
+            Add record to the current group or start a new one.
+            size is the chars count of the whole edit when it has few records
+        """
+
+        if size is None:
+            size = length
+
+        # Edits of undo / redo become the inverse group
+        if self._capture is not None:
+            self._capture.append( ( kind, site, position, length, text ) )
+            return
+
+        now = time.time( )
+
+        if not self._groups or self._is_group_new or ( self._group_depth == 0 and not self.__is_continued( kind, offset, size, now ) ):
+            self._groups.append( len( self._kinds ) )
+
+        self._is_group_new  = False
+        self._group_time    = now
+        self._group_kind    = kind
+        self._group_caret   = kind == RECORD_INSERT and offset + size or offset
+
+        # New edit, the undone groups can not be redone anymore
+        self._redo.clear( )
+
+        self.__write( kind, site, position, length, text )
+        self.__limit_memory( )
+
+    def __is_continued( self, kind: int, offset: int, length: int, now: float ) -> bool:
+        """
+            Does the edit continue the current group
+        """
+
+        caret = self._group_caret
+
+        if caret is None or now - self._group_time > GROUP_TIME:
+            return False
+
+        # Typing, or inserting where the previous edit removed (replace)
+        if kind == RECORD_INSERT:
+            return offset == caret
+
+        # Backspace / delete runs
+        return self._group_kind == RECORD_DELETE and ( offset + length == caret or offset == caret )
+
+    def __write( self, kind: int, site: int, position: int, length: int, text: str ) -> None:
+
+        self._text += text.encode( "utf-8" )
+
+        self._kinds.append( kind )
+        self._sites.append( site )
+        self._positions.append( position )
+        self._lengths.append( length )
+        self._ends.append( len( self._text ) )
+
+    def __read( self, index: int ) -> tuple:
+        """
+            Returns ( kind, site, position, length, text ) of a record
+        """
+
+        start   = index > 0 and self._ends[ index - 1 ] or 0
+        text    = self._text[ start:self._ends[ index ] ].decode( "utf-8" )
+
+        return self._kinds[ index ], self._sites[ index ], self._positions[ index ], self._lengths[ index ], text
+
+    def __truncate( self, count: int ) -> None:
+        """
+            Remove records from count to the end
+        """
+
+        end = count > 0 and self._ends[ count - 1 ] or 0
+
+        del self._text[ end: ]
+
+        del self._kinds[ count: ]
+        del self._sites[ count: ]
+        del self._positions[ count: ]
+        del self._lengths[ count: ]
+        del self._ends[ count: ]
+
+    def __event_operation( self, event ) -> None:
+        """
+            Local operations of the edit that is recorded next
+        """
+
+        self._operations = event( "operations" )
+
+    def __event_document_change( self, event ) -> None:
+        """
+            Document was changed, record it if local
+        """
+
+        offset          = event( "offset" )
+        removed_text    = event( "removed_text" )
+
+        # Loaded document, offsets of the history mean nothing now
+        if removed_text is None:
+            return self.clear( )
+
+        if self._replica is None:
+            inserted = event( "inserted" )
+            return self.record( offset, removed_text, inserted > 0 and self._document.get( offset, offset + inserted ) or "" )
+
+        operations          = self._operations
+        self._operations    = None
+
+        # Remote edit, local ids stay valid but typing does not continue across it
+        if operations is None:
+            if self._capture is None:
+                self.break_group( )
+
+            return
+
+        # Deleted chars can be in few ranges, one record each so undo can remap each range to the restored ids.
+        # removed first like record( ), inserting where it was removed continues the group
+        start = 0
+
+        for operation in operations:
+            if operation[ 0 ] != OP_INSERT and removed_text:
+                _, site, clock, length = operation
+                self.__add( RECORD_DELETE, site, clock, length, removed_text[ start:start + length ], offset, len( removed_text ) )
+
+                start += length
+
+        for operation in operations:
+            if operation[ 0 ] == OP_INSERT:
+                _, site, clock, _, text = operation
+                self.__add( RECORD_INSERT, site, clock, len( text ), "", offset )
+
+    # endregion
+
+    # region : Spill
+
+    def __memory( self ) -> int:
+
+        return len( self._text ) + len( self._kinds ) * RECORD_SIZE
+
+    def __limit_memory( self ) -> None:
+        """
+            Spill the oldest half of the groups once the memory limit is reached
+        """
+
+        if self.__memory( ) <= self._memory_limit or len( self._groups ) < 2:
+            return
+
+        # Group where the records before it are about half of the memory
+        target  = self.__memory( ) // 2
+        index   = 1
+
+        while index < len( self._groups ) - 1:
+            count = self._groups[ index ]
+
+            if self._ends[ count - 1 ] + count * RECORD_SIZE >= target:
+                break
+
+            index += 1
+
+        self.__spill( index )
+
+    def __spill( self, groups: int ) -> None:
+        """
+            Write the first groups to a compressed segment and remove them from memory
+        """
+
+        count   = self._groups[ groups ]
+        writer  = c_writer( )
+
+        writer.varint( groups )
+
+        for index in range( groups ):
+            writer.varint( self._groups[ index + 1 ] - self._groups[ index ] )
+
+        for index in range( count ):
+            kind, site, position, length, text = self.__read( index )
+
+            writer.varint( kind )
+            writer.varint( site )
+            writer.varint( position )
+            writer.varint( length )
+            writer.string( text )
+
+        if self._directory is None:
+            self._directory         = tempfile.mkdtemp( prefix="history-" )
+            self._is_own_directory  = True
+
+        path    = os.path.join( self._directory, f"{ id( self ) }." + str( self._spilled ).zfill( 8 ) + SEGMENT_SUFFIX )
+        data    = zlib.compress( writer.get( ) )
+
+        self._spilled += 1
+
+        with open( path, "wb" ) as file:
+            file.write( data )
+
+        self._segments.append( ( path, len( data ) ) )
+
+        # Remove the spilled records, the rest moves to the start
+        cut = self._ends[ count - 1 ]
+
+        del self._text[ :cut ]
+
+        del self._kinds[ :count ]
+        del self._sites[ :count ]
+        del self._positions[ :count ]
+        del self._lengths[ :count ]
+
+        self._ends      = array.array( "q", ( end - cut for end in self._ends[ count: ] ) )
+        self._groups    = array.array( "q", ( start - count for start in self._groups[ groups: ] ) )
+
+        # Oldest history is dropped above the disk limit
+        while len( self._segments ) > 1 and sum( size for _, size in self._segments ) > self._disk_limit:
+            os.remove( self._segments.pop( 0 )[ 0 ] )
+
+    def __load_segment( self ) -> None:
+        """
+            Read the newest segment back. call only when no groups are in memory
+        """
+
+        path, _ = self._segments.pop( )
+
+        with open( path, "rb" ) as file:
+            reader = c_reader( zlib.decompress( file.read( ) ) )
+
+        os.remove( path )
+
+        sizes = [ reader.varint( ) for _ in range( reader.varint( ) ) ]
+
+        self.__truncate( 0 )
+        self._groups = array.array( "q" )
+
+        for size in sizes:
+            self._groups.append( len( self._kinds ) )
+
+            for _ in range( size ):
+                self.__write( reader.varint( ), reader.varint( ), reader.varint( ), reader.varint( ), reader.string( ) )
+
+    def __remove_segments( self ) -> None:
+
+        for path, _ in self._segments:
+            if os.path.exists( path ):
+                os.remove( path )
+
+        self._segments = [ ]
+
+    # endregion
@@ -1,74 +1,328 @@
-# SDK Image .py
-
-import OpenGL.GL as gl
-from PIL import Image
-import numpy
-import imgui
-
-from sdk.vector import vector
-from sdk.safe import safe_call
-
-class c_image:
-    """
-        Image class
-    """
-
-    _id:    any     # Texture_Id for OPENGL
-    _size:  vector  # Texture size
-
-    def __init__( self ):
-
-        self._id    = None
-        self._size  = vector( )
-
-    @safe_call(None)
-    def load( self, path: str, size: vector ) -> None:
-        """
-            Loads image by path and size
-        """
-
-        # Attach wanted size
-        self._size.x = size.x
-        self._size.y = size.y
-
-        # Open and get image data
-        image           = Image.open( path )
-        image_data      = numpy.array( image.convert( "RGBA" ), dtype=numpy.uint8 )
-
-        # Generate OpenGL Texture Id
-        self._id = gl.glGenTextures( 1 )
-
-        # Bind Texture to id
-        gl.glBindTexture( gl.GL_TEXTURE_2D, self._id )
-
-        # Set parameters
-        gl.glTexParameteri( gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR )
-        gl.glTexParameteri( gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR )
-
-        # Create and set texture
-        gl.glTexImage2D(
-            gl.GL_TEXTURE_2D,
-            0,
-            gl.GL_RGBA,
-            self._size.x, self._size.y,
-            0,
-            gl.GL_RGBA,
-            gl.GL_UNSIGNED_BYTE,
-            image_data
-        )
-
-        # Return on success
-        return True
-    
-    def size( self ) -> vector:
-        """
-            Get Image size
-        """
-
-        return self._size.copy( )
-    
-    def __call__( self ):
-        """
-            Get Image ID
-        """
-        return self._id
+# SDK Image .py
+
+from collections import OrderedDict
+
+from sdk.vector import vector
+from sdk.safe import safe_call
+from sdk.lazy_import import lazy_import
+
+# OpenGL is needed only once textures are created
+gl = lazy_import( "OpenGL.GL" )
+
+DEFAULT_VRAM_BUDGET: int = 256 * 1024 * 1024   # Bytes of unreferenced textures we allow to stay resident
+BYTES_PER_PIXEL:     int = 4                   # RGBA8
+
+class c_image:
+    """
+        Image class
+    """
+
+    _id:            any     # Texture_Id for OPENGL
+    _size:          vector  # Texture size
+    _path:          str     # Path the texture was loaded from
+
+    _owner:         any     # c_texture_registry that manages this image (can be None)
+    _references:    int     # Users count when there is no owner
+
+    def __init__( self ):
+
+        self._id            = None
+        self._size          = vector( )
+        self._path          = None
+
+        self._owner         = None
+        self._references    = 0
+
+    @safe_call(None)
+    def load( self, path: str, size: vector ) -> None:
+        """
+            Loads image by path and size
+        """
+
+        # Attach wanted size
+        self._size.x = size.x
+        self._size.y = size.y
+
+        self._path = path
+
+        # Image decoding libraries are heavy, load them only here
+        from PIL import Image
+        import numpy
+
+        # Open and get image data
+        image           = Image.open( path )
+        image_data      = numpy.array( image.convert( "RGBA" ), dtype=numpy.uint8 )
+
+        # Generate OpenGL Texture Id
+        self._id = gl.glGenTextures( 1 )
+
+        # Bind Texture to id
+        gl.glBindTexture( gl.GL_TEXTURE_2D, self._id )
+
+        # Set parameters
+        gl.glTexParameteri( gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR )
+        gl.glTexParameteri( gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR )
+
+        # Create and set texture
+        gl.glTexImage2D(
+            gl.GL_TEXTURE_2D,
+            0,
+            gl.GL_RGBA,
+            self._size.x, self._size.y,
+            0,
+            gl.GL_RGBA,
+            gl.GL_UNSIGNED_BYTE,
+            image_data
+        )
+
+        # Return on success
+        return True
+
+    def unload( self ) -> None:
+        """
+            Deletes the OpenGL texture.
+            the image can be loaded again later from the same path
+        """
+
+        if self._id is None:
+            return
+
+        gl.glDeleteTextures( [ self._id ] )
+        self._id = None
+
+    def is_loaded( self ) -> bool:
+        """
+            Is the texture currently resident on the GPU
+        """
+
+        return self._id is not None
+
+    def retain( self ) -> None:
+        """
+            Register new user of this image (widget, scene...)
+        """
+
+        if self._owner is not None:
+            return self._owner.retain( self )
+
+        self._references += 1
+
+    def release( self ) -> None:
+        """
+            Unregister user of this image
+        """
+
+        if self._owner is not None:
+            return self._owner.release( self )
+
+        self._references = max( self._references - 1, 0 )
+
+    def bytes( self ) -> int:
+        """
+            Get approximated texture memory size
+        """
+
+        return int( self._size.x ) * int( self._size.y ) * BYTES_PER_PIXEL
+
+    def path( self ) -> str:
+        """
+            Get Image path
+        """
+
+        return self._path
+
+    def size( self ) -> vector:
+        """
+            Get Image size
+        """
+
+        return self._size.copy( )
+
+    def __call__( self ):
+        """
+            Get Image ID
+        """
+
+        # Texture was evicted, bring it back before use
+        if self._id is None and self._owner is not None:
+            self._owner.restore( self )
+
+        return self._id
+
+
+class c_texture_registry:
+    """
+        Textures registry.
+
+        Deduplicates images by (path, size), counts their users and
+        evicts unreferenced textures in LRU order once the VRAM budget is exceeded.
+    """
+
+    _images:        dict            # (path, width, height) -> c_image
+    _references:    dict            # (path, width, height) -> users count
+    _unused:        OrderedDict     # Resident textures without users. oldest first
+
+    _budget:        int             # Bytes budget
+    _resident:      int             # Resident bytes
+    _evicted:       int             # Total evicted bytes
+    _evictions:     int             # Total evicted textures
+
+    def __init__( self, budget: int = DEFAULT_VRAM_BUDGET ):
+        """
+            Constructor for textures registry
+        """
+
+        self._images        = { }
+        self._references    = { }
+        self._unused        = OrderedDict( )
+
+        self._budget        = budget
+        self._resident      = 0
+        self._evicted       = 0
+        self._evictions     = 0
+
+    def budget( self, new_value: int = None ) -> int | None:
+        """
+            Returns / Sets the VRAM budget in bytes
+        """
+
+        if new_value is None:
+            return self._budget
+
+        self._budget = new_value
+        self.__enforce_budget( )
+
+    def load( self, path: str, size: vector ) -> c_image | None:
+        """
+            Returns the image for path and size.
+            loads it only if the same image was not loaded before
+        """
+
+        key = self.__key( path, size )
+
+        if key in self._images:
+            img: c_image = self._images[ key ]
+
+            if not img.is_loaded( ):
+                self.restore( img )
+
+            return img
+
+        img = c_image( )
+        if not img.load( path, size ):
+            return None
+
+        img._owner = self
+
+        self._images[ key ]     = img
+        self._references[ key ] = 0
+        self._resident          += img.bytes( )
+
+        # Nobody uses it yet, so it is the first candidate to be evicted
+        self._unused[ key ] = None
+        self.__enforce_budget( )
+
+        return img
+
+    def retain( self, img: c_image ) -> None:
+        """
+            Register new user for an image
+        """
+
+        key = self.__key( img.path( ), img.size( ) )
+
+        if not key in self._images:
+            return
+
+        self._references[ key ] += 1
+        self._unused.pop( key, None )
+
+        if not img.is_loaded( ):
+            self.restore( img )
+
+    def release( self, img: c_image ) -> None:
+        """
+            Unregister user of an image
+        """
+
+        key = self.__key( img.path( ), img.size( ) )
+
+        if not key in self._images or self._references[ key ] == 0:
+            return
+
+        self._references[ key ] -= 1
+
+        if self._references[ key ] > 0:
+            return
+
+        # Last user is gone. Keep it resident until budget is exceeded
+        if img.is_loaded( ):
+            self._unused[ key ] = None
+            self.__enforce_budget( )
+
+    def restore( self, img: c_image ) -> None:
+        """
+            Loads back an evicted texture
+        """
+
+        key = self.__key( img.path( ), img.size( ) )
+
+        if img.is_loaded( ) or not img.load( img.path( ), img.size( ) ):
+            return
+
+        self._resident += img.bytes( )
+
+        if self._references.get( key, 0 ) == 0:
+            self._unused[ key ] = None
+            self._unused.move_to_end( key )
+
+    def clear( self ) -> None:
+        """
+            Deletes all textures
+        """
+
+        for img in self._images.values( ):
+            img.unload( )
+
+        self._images.clear( )
+        self._references.clear( )
+        self._unused.clear( )
+
+        self._resident = 0
+
+    def stats( self ) -> dict:
+        """
+            Returns registry memory usage information
+        """
+
+        return {
+            "budget":       self._budget,
+            "resident":     self._resident,
+            "evicted":      self._evicted,
+            "evictions":    self._evictions,
+            "textures":     len( self._images ),
+            "unused":       len( self._unused )
+        }
+
+    def __enforce_budget( self ) -> None:
+        """
+            Evict unreferenced textures, oldest first, until we fit the budget
+        """
+
+        while self._resident > self._budget and len( self._unused ) > 0:
+            key, _ = self._unused.popitem( last=False )
+            img: c_image = self._images[ key ]
+
+            size = img.bytes( )
+            img.unload( )
+
+            self._resident  -= size
+            self._evicted   += size
+            self._evictions += 1
+
+    def __key( self, path: str, size: vector ) -> tuple:
+        """
+            Registry key of an image
+        """
+
+        return path, int( size.x ), int( size.y )
@@ -0,0 +1,54 @@
+# SDK Lazy Import .py
+
+import importlib
+
+class c_lazy_module:
+    """
+        Lazy module object
+
+        Imports the real module only on first attribute access.
+        Each accessed attribute is cached on this object, so later
+        access costs the same as a regular attribute lookup.
+    """
+
+    _name:      str     # Module name
+    _module:    any     # Loaded module (None until used)
+
+    def __init__( self, name: str ):
+        """
+            Constructor for lazy module
+        """
+
+        self._name      = name
+        self._module    = None
+
+    def load( self ) -> any:
+        """
+            Force import and returns the real module
+        """
+
+        if self._module is None:
+            self._module = importlib.import_module( self._name )
+
+        return self._module
+
+    def __getattr__( self, index: str ) -> any:
+        """
+            Called only when index was not cached yet
+        """
+
+        if index.startswith( "_" ):
+            raise AttributeError( index )
+
+        value = getattr( self.load( ), index )
+        setattr( self, index, value )
+
+        return value
+
+
+def lazy_import( name: str ) -> c_lazy_module:
+    """
+        Returns module object that will be imported on first use
+    """
+
+    return c_lazy_module( name )
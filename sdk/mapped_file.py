@@ -0,0 +1,307 @@
+# SDK Mapped File .py
+
+import os
+import mmap
+
+from sdk.event          import c_event
+from sdk.document       import c_document
+from sdk.lazy_import    import lazy_import
+
+numpy = lazy_import( "numpy" )
+
+SCAN_CHUNK:     int = 4 * 1024 * 1024   # Bytes scanned for newlines at once
+NEWLINE:        int = 10
+
+MAPPED_SIZE:    int = 64 * 1024 * 1024  # Files from this size are opened mapped instead of read into a c_document
+
+
+def open_document( path: str, encoding: str = "utf-8", mapped_size: int = MAPPED_SIZE ) -> any:
+    """
+        Returns document of a file. big files are a read only c_mapped_file, others a c_document
+    """
+
+    if os.path.getsize( path ) >= mapped_size:
+        return c_mapped_file( path, encoding )
+
+    document = c_document( )
+    document.load( path, encoding )
+
+    return document
+
+
+class c_mapped_file:
+    """
+        Read only document of a memory mapped file.
+
+        The file is never read into a string. Line starts are found
+        in chunks with a vectorized newline scan, and only as far as
+        a line that was asked for, so opening a huge file costs one
+        chunk and memory grows with what was viewed.
+
+        Offsets are byte offsets in the file, columns are chars of
+        the decoded line. Until the whole file was scanned, line_count
+        is an estimate from the average line length so far.
+    """
+
+    _path:          str
+    _encoding:      str
+
+    _file:          any         # Open file object
+    _map:           mmap.mmap   # File mapping (None for an empty file)
+    _size:          int         # File size in bytes
+
+    _starts:        any         # numpy int64 array of known line start offsets (capacity may be bigger)
+    _lines:         int         # Known lines count (used items of _starts)
+    _scanned:       int         # Bytes scanned for newlines
+
+    _events:        dict        # Document events
+
+    def __init__( self, path: str, encoding: str = "utf-8" ):
+        """
+            Constructor for mapped file
+        """
+
+        self._path      = path
+        self._encoding  = encoding
+
+        self._file      = open( path, "rb" )
+        self._size      = os.fstat( self._file.fileno( ) ).st_size
+        self._map       = None
+
+        # Empty files can not be mapped
+        if self._size > 0:
+            self._map = mmap.mmap( self._file.fileno( ), 0, access=mmap.ACCESS_READ )
+
+        self._starts    = numpy.zeros( 1024, dtype=numpy.int64 )
+        self._lines     = 1
+        self._scanned   = 0
+
+        # Same events as c_document, a mapped file never changes
+        self._events = { }
+        self._events[ "change" ] = c_event( )
+
+    def release( self ) -> None:
+        """
+            Close the mapping and the file
+        """
+
+        if self._map is not None:
+            self._map.close( )
+            self._map = None
+
+        self._file.close( )
+
+    def path( self ) -> str:
+
+        return self._path
+
+    def is_read_only( self ) -> bool:
+
+        return True
+
+    def is_indexed( self ) -> bool:
+        """
+            Was the whole file scanned for lines
+        """
+
+        return self._scanned >= self._size
+
+    def stats( self ) -> dict:
+        """
+            Returns index information
+        """
+
+        return {
+            "size":     self._size,
+            "scanned":  self._scanned,
+            "lines":    self._lines,
+            "index":    self._starts.nbytes
+        }
+
+    # region : Edit
+
+    def insert( self, offset: int, text: str ) -> None:
+
+        raise Exception( "Mapped file is read only" )
+
+    def delete( self, offset: int, length: int ) -> str:
+
+        raise Exception( "Mapped file is read only" )
+
+    # endregion
+
+    # region : Access
+
+    def get( self, start: int = 0, end: int = None ) -> str:
+        """
+            Returns decoded text of byte range
+        """
+
+        if end is None or end > self._size:
+            end = self._size
+
+        if self._map is None or start >= end:
+            return ""
+
+        return self._map[ start:end ].decode( self._encoding, errors="replace" )
+
+    def line_count( self ) -> int:
+        """
+            Returns number of lines (estimated until the file is indexed)
+        """
+
+        if self._scanned == 0:
+            self.__scan( )
+
+        if self.is_indexed( ):
+            return self._lines
+
+        # Remaining bytes with the average line length so far
+        return self._lines + int( ( self._size - self._scanned ) * self._lines / self._scanned )
+
+    def line_start( self, line: int ) -> int:
+        """
+            Returns offset of the first char in line
+        """
+
+        if line <= 0:
+            return 0
+
+        self.__scan_to_line( line )
+
+        if line >= self._lines:
+            return self._size
+
+        return int( self._starts[ line ] )
+
+    def line_end( self, line: int ) -> int:
+        """
+            Returns offset of the line end (the newline char or file end)
+        """
+
+        self.__scan_to_line( line + 1 )
+
+        if line + 1 >= self._lines:
+            return self._size
+
+        return int( self._starts[ line + 1 ] ) - 1
+
+    def line( self, line: int ) -> str:
+        """
+            Returns text of a line without the newline
+        """
+
+        return self.get( self.line_start( line ), self.line_end( line ) )
+
+    def line_at( self, offset: int ) -> int:
+        """
+            Returns line index of specific offset
+        """
+
+        offset = max( 0, min( offset, self._size ) )
+
+        while self._scanned <= offset and not self.is_indexed( ):
+            self.__scan( )
+
+        return int( numpy.searchsorted( self._starts[ :self._lines ], offset, side="right" ) ) - 1
+
+    def position( self, offset: int ) -> tuple:
+        """
+            Returns ( line, column ) of specific offset
+        """
+
+        offset  = max( 0, min( offset, self._size ) )
+        line    = self.line_at( offset )
+
+        return line, len( self.get( self.line_start( line ), offset ) )
+
+    def offset( self, line: int, column: int ) -> int:
+        """
+            Returns offset of ( line, column ). column is clamped to the line
+        """
+
+        self.__scan_to_line( line + 1 )
+
+        line    = max( 0, min( line, self._lines - 1 ) )
+        text    = self.line( line )
+
+        return self.line_start( line ) + len( text[ :max( 0, column ) ].encode( self._encoding, errors="replace" ) )
+
+    def __len__( self ) -> int:
+
+        return self._size
+
+    # endregion
+
+    # region : Events
+
+    def set_event( self, event_index: str, function: any, function_name: str ) -> None:
+        """
+            Register function for document event (never invoked, kept for c_document views)
+        """
+
+        if not event_index in self._events:
+            return
+
+        event: c_event = self._events[ event_index ]
+        event.set( function, function_name, True )
+
+    def unset_event( self, event_index: str, function_name: str ) -> None:
+        """
+            Remove function from document event
+        """
+
+        if not event_index in self._events:
+            return
+
+        event: c_event = self._events[ event_index ]
+        event.unset( function_name )
+
+    # endregion
+
+    # region : Index
+
+    def __scan_to_line( self, line: int ) -> None:
+        """
+            Scan until the start of line is known or the file ended
+        """
+
+        while self._lines <= line and not self.is_indexed( ):
+            self.__scan( )
+
+    def __scan( self ) -> None:
+        """
+            Find line starts in the next chunk
+        """
+
+        if self.is_indexed( ):
+            return
+
+        start   = self._scanned
+        count   = min( SCAN_CHUNK, self._size - start )
+
+        chunk   = numpy.frombuffer( self._map, dtype=numpy.uint8, count=count, offset=start )
+        found   = numpy.flatnonzero( chunk == NEWLINE )
+
+        # View into the mapping must be gone before it can be closed
+        del chunk
+
+        # Scanned pages are not needed anymore, the viewed ones are mapped again on access
+        if hasattr( mmap, "MADV_DONTNEED" ):
+            self._map.madvise( mmap.MADV_DONTNEED, start, count )
+
+        # Each newline starts a line, like in c_document a newline at the end adds an empty line
+        needed = self._lines + len( found )
+
+        if needed > len( self._starts ):
+            grown = numpy.zeros( max( needed, len( self._starts ) * 2 ), dtype=numpy.int64 )
+            grown[ :self._lines ] = self._starts[ :self._lines ]
+
+            self._starts = grown
+
+        self._starts[ self._lines:needed ] = found + ( start + 1 )
+
+        self._lines     = needed
+        self._scanned   = start + count
+
+    # endregion
@@ -0,0 +1,617 @@
+# SDK Scanner .py
+
+import os
+import time
+import zlib
+import struct
+import threading
+
+from collections            import deque
+from concurrent.futures     import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from sdk.event              import c_event
+from sdk.tree               import c_tree_model, TREE_SEPARATOR
+
+SCAN_WORKERS:       int = 8         # Threads listing folders
+SCAN_BATCH:         int = 4096      # Changes that are sent at once
+SCAN_INTERVAL:      float = 0.25    # First wait between sent changes of a scan (doubles after each send)
+SCAN_IGNORE:        set = { ".git", ".hg", ".svn", "__pycache__", "node_modules" }
+
+INDEX_MAGIC:        bytes = b"SCN1"
+INDEX_RECORD:       struct.Struct = struct.Struct( "<qqQH" )    # Index record : [ mtime ns ][ size (-1 for folders) ][ inode ][ path length ][ path ]
+
+TEMP_SUFFIX:        str = ".tmp"
+
+
+def read_index( data: bytes ) -> tuple:
+    """
+        Returns ( files, folders ) of an index. files : path -> ( mtime, size, inode ), folders : path -> ( mtime, inode )
+    """
+
+    files   = { }
+    folders = { }
+
+    if not data.startswith( INDEX_MAGIC ):
+        return files, folders
+
+    try:
+        data = zlib.decompress( data[ len( INDEX_MAGIC ): ] )
+    except zlib.error:
+        return files, folders
+
+    position    = 0
+    size        = len( data )
+    unpack      = INDEX_RECORD.unpack_from
+
+    while position + INDEX_RECORD.size <= size:
+        mtime, length, inode, path_length = unpack( data, position )
+
+        start       = position + INDEX_RECORD.size
+        path        = data[ start:start + path_length ].decode( "utf-8", errors="surrogateescape" )
+        position    = start + path_length
+
+        if length < 0:
+            folders[ path ] = ( mtime, inode )
+        else:
+            files[ path ] = ( mtime, length, inode )
+
+    return files, folders
+
+
+def write_index( files: dict, folders: dict ) -> bytes:
+    """
+        Returns index data of files and folders
+    """
+
+    pack    = INDEX_RECORD.pack
+    records = [ ]
+
+    for path, ( mtime, inode ) in folders.items( ):
+        encoded = path.encode( "utf-8", errors="surrogateescape" )
+        records.append( pack( mtime, -1, inode, len( encoded ) ) + encoded )
+
+    for path, ( mtime, length, inode ) in files.items( ):
+        encoded = path.encode( "utf-8", errors="surrogateescape" )
+        records.append( pack( mtime, length, inode, len( encoded ) ) + encoded )
+
+    return INDEX_MAGIC + zlib.compress( b"".join( records ) )
+
+
+class c_project_scanner:
+    """
+        Files of a project folder, kept up to date by rescans.
+
+        ( mtime, size, inode ) of every file and folder is kept in a
+        compressed index file, so a project opened again shows its
+        files from the index at once and is reconciled in the background.
+
+        Folders are listed with os.scandir on a thread pool. A rescan
+        lists again only folders whose mtime changed, the rest cost a
+        stat (their sub folders may have changed). A folder mtime does
+        not change when a file inside is rewritten, so files of unlisted
+        folders are checked with a stat when stat_files is set (the
+        first scan does it).
+
+        Changes are sent to the ui thread in batches of added, removed
+        and modified file paths. paths are relative, TREE_SEPARATOR separated.
+    """
+
+    _root:          str             # Project folder
+    _index_path:    str             # Index file (None to not keep one)
+    _ignore:        set             # Names that are not scanned
+
+    _files:         dict            # path -> ( mtime ns, size, inode )
+    _folders:       dict            # path -> ( mtime ns, inode ). "" is the root
+    _children:      dict            # folder path -> { name : is folder }
+    _is_dirty:      bool            # Was the index changed since it was written
+    _version:       int             # Changed with the files
+
+    _changes:       deque           # ( added, removed, modified, is done ) (worker thread -> ui thread)
+    _added:         list            # Changes of the scan that were not sent yet
+    _removed:       list
+    _modified:      list
+
+    _ui:            any             # c_ui the scanner is attached to (can be None)
+    _tree:          any             # c_tree_view that shows the files (can be None)
+    _events:        dict            # Scanner events
+
+    _pool:          ThreadPoolExecutor
+    _lock:          threading.Lock  # Guards the requested scan
+    _wake:          threading.Event # Set when a scan was requested
+    _thread:        threading.Thread
+    _is_running:    bool
+    _is_scanning:   bool
+    _stat_files:    bool            # Stat files of unlisted folders on the next scan (None if no scan is requested)
+    _scans:         int             # Finished scans
+
+    def __init__( self, root: str, index_path: str = None, ignore: set = None, workers: int = SCAN_WORKERS ):
+        """
+            Constructor for project scanner
+        """
+
+        self._root          = os.path.abspath( root )
+        self._index_path    = index_path
+        self._ignore        = set( ignore is not None and ignore or SCAN_IGNORE )
+
+        self._files         = { }
+        self._folders       = { }
+        self._children      = { }
+        self._is_dirty      = False
+        self._version       = 0
+
+        self._changes       = deque( )
+        self._added         = [ ]
+        self._removed       = [ ]
+        self._modified      = [ ]
+
+        self._ui            = None
+        self._tree          = None
+
+        self._events = { }
+        self._events[ "change" ] = c_event( )
+
+        self.__load( )
+
+        self._pool          = ThreadPoolExecutor( max_workers=workers )
+        self._lock          = threading.Lock( )
+        self._wake          = threading.Event( )
+        self._is_scanning   = False
+        self._stat_files    = True
+        self._scans         = 0
+
+        # Reconcile the index with the disk right away
+        self._wake.set( )
+
+        self._is_running    = True
+        self._thread        = threading.Thread( target=self.__worker, daemon=True )
+        self._thread.start( )
+
+    def release( self ) -> None:
+        """
+            Stop the scans and write the index
+        """
+
+        self._is_running = False
+        self._wake.set( )
+
+        self._thread.join( )
+        self._pool.shutdown( )
+
+        self.__save( )
+
+    def attach( self, ui: any, tree: any = None ) -> None:
+        """
+            Receive changes before each frame of c_ui. tree is a c_tree_view that is
+            filled from the index at once and follows the changes
+        """
+
+        self._ui    = ui
+        self._tree  = tree
+
+        self._ui.set_event( "pre_draw", self.__event_pre_draw, f"Scanner::{ id( self ) }" )
+
+        if self._tree is not None:
+            self._tree.model( c_tree_model( self.files( ) ) )
+
+    def rescan( self, stat_files: bool = False ) -> None:
+        """
+            Find what changed on disk since the last scan
+        """
+
+        with self._lock:
+            self._stat_files = stat_files or bool( self._stat_files )
+
+        self._wake.set( )
+
+    def root( self ) -> str:
+
+        return self._root
+
+    def ignore( self, name: str ) -> None:
+        """
+            Do not scan files / folders with name from the next scan
+        """
+
+        # Replaced, not changed, the workers read the set while scanning
+        self._ignore = self._ignore | { name }
+
+    def files( self ) -> list:
+        """
+            Returns paths of the known files
+        """
+
+        return list( self._files )
+
+    def entries( self ) -> dict:
+        """
+            Returns copy of the known files. path -> ( mtime ns, size, inode )
+        """
+
+        return dict( self._files )
+
+    def version( self ) -> int:
+        """
+            Returns number that changes when the known files change
+        """
+
+        return self._version
+
+    def is_scanning( self ) -> bool:
+        """
+            Is a scan running / requested, or are its changes not drained yet
+        """
+
+        return self._is_scanning or self._stat_files is not None or bool( self._changes )
+
+    def stats( self ) -> dict:
+        """
+            Returns scanner information
+        """
+
+        return {
+            "files":    len( self._files ),
+            "folders":  len( self._folders ),
+            "scans":    self._scans,
+            "pending":  len( self._changes )
+        }
+
+    # region : Changes
+
+    def drain( self ) -> int:
+        """
+            Receive changes of the worker and invoke "change". returns changed paths count.
+            called each frame in pre_draw once attached
+        """
+
+        if not self._changes:
+            return 0
+
+        states      = { }       # path -> True if it was added last, False if removed last
+        created     = set( )    # Paths that were not known before the batches
+        modified    = { }
+        is_done     = False
+
+        # All waiting batches as one change, the tree is updated once.
+        # folded in order to the last state of each path, a file created and deleted is in neither list
+        while self._changes:
+            batch_added, batch_removed, batch_modified, is_done = self._changes.popleft( )
+
+            for path in batch_removed:
+                states[ path ] = False
+
+            # Added after removed, like the tree update does
+            for path in batch_added:
+                if not path in states and not path in modified:
+                    created.add( path )
+
+                states[ path ] = True
+
+            for path in batch_modified:
+                modified[ path ] = True
+
+        added       = [ path for path, is_added in states.items( ) if is_added ]
+        removed     = [ path for path, is_added in states.items( ) if not is_added and not path in created ]
+        modified    = [ path for path in modified if states.get( path, True ) ]
+
+        if self._tree is not None and ( added or removed ):
+            self._tree.model( ).update( added, removed )
+            self._tree.refresh( )
+
+        event: c_event = self._events[ "change" ]
+
+        event + ( "added",      added )
+        event + ( "removed",    removed )
+        event + ( "modified",   modified )
+        event + ( "is_done",    is_done )
+
+        event.invoke( )
+
+        if self._ui is not None:
+            self._ui.request_redraw( )
+
+        return len( added ) + len( removed ) + len( modified )
+
+    def set_event( self, event_index: str, function: any, function_name: str ) -> None:
+        """
+            Register function for scanner event
+        """
+
+        if not event_index in self._events:
+            return
+
+        event: c_event = self._events[ event_index ]
+        event.set( function, function_name, True )
+
+    def unset_event( self, event_index: str, function_name: str ) -> None:
+        """
+            Remove function from scanner event
+        """
+
+        if not event_index in self._events:
+            return
+
+        event: c_event = self._events[ event_index ]
+        event.unset( function_name )
+
+    def __event_pre_draw( self, event ) -> None:
+
+        self.drain( )
+
+    # endregion
+
+    # region : Index
+
+    def __load( self ) -> None:
+        """
+            Read the index file. a missing or broken index is a full scan
+        """
+
+        if self._index_path is None or not os.path.isfile( self._index_path ):
+            return
+
+        with open( self._index_path, "rb" ) as file:
+            self._files, self._folders = read_index( file.read( ) )
+
+        for path in self._folders:
+            if path:
+                self.__child( path, True )
+
+        for path in self._files:
+            self.__child( path, False )
+
+    def __save( self ) -> None:
+        """
+            Write the index file if it changed
+        """
+
+        if self._index_path is None or not self._is_dirty:
+            return
+
+        data = write_index( self._files, self._folders )
+
+        # Replaced at once, a crash keeps the old index
+        with open( self._index_path + TEMP_SUFFIX, "wb" ) as file:
+            file.write( data )
+
+        os.replace( self._index_path + TEMP_SUFFIX, self._index_path )
+
+        self._is_dirty = False
+
+    def __child( self, path: str, is_folder: bool ) -> None:
+
+        folder, _, name = path.rpartition( TREE_SEPARATOR )
+        self._children.setdefault( folder, { } )[ name ] = is_folder
+
+    # endregion
+
+    # region : Worker thread
+
+    def __worker( self ) -> None:
+        """
+            Worker thread. run requested scans
+        """
+
+        while self._is_running:
+            self._wake.wait( )
+            self._wake.clear( )
+
+            with self._lock:
+                stat_files          = self._stat_files
+                self._stat_files    = None
+
+            if stat_files is None or not self._is_running:
+                continue
+
+            self._is_scanning = True
+
+            self.__scan( stat_files )
+            self.__save( )
+
+            self._is_scanning   = False
+            self._scans         += 1
+
+    def __scan( self, stat_files: bool ) -> None:
+        """
+            Visit all folders on the pool, merging results as they come
+        """
+
+        interval    = SCAN_INTERVAL
+        sent        = time.monotonic( )
+        pending     = { self.__submit( "", stat_files ) }
+
+        while pending and self._is_running:
+            done, pending = wait( pending, return_when=FIRST_COMPLETED )
+
+            for future in done:
+                for folder in self.__merge( *future.result( ) ):
+                    pending.add( self.__submit( folder, stat_files ) )
+
+            if len( self._added ) + len( self._removed ) + len( self._modified ) >= SCAN_BATCH or time.monotonic( ) - sent >= interval:
+                # Sends get rarer in long scans, each one updates the tree
+                if self.__send( False ):
+                    interval    *= 2
+                    sent        = time.monotonic( )
+
+        # Stopped while scanning, the rest is dropped
+        for future in pending:
+            future.cancel( )
+
+        self.__send( True )
+
+    def __submit( self, folder: str, stat_files: bool ) -> any:
+
+        # Copies, the pool threads do not read data this thread changes
+        children = dict( self._children.get( folder, { } ) )
+        known    = { name: self._files.get( self.__join( folder, name ) ) for name, is_folder in children.items( ) if not is_folder }
+
+        return self._pool.submit( self.__visit, folder, self._folders.get( folder ), children, known, stat_files )
+
+    def __visit( self, folder: str, state: tuple, children: dict, known: dict, stat_files: bool ) -> tuple:
+        """
+            Runs on the pool. returns ( folder, state, children, listing, files )
+            listing is { name : file state or None for folders } (None if not listed),
+            files are stats of known files of an unlisted folder
+        """
+
+        path = folder and os.path.join( self._root, folder ) or self._root
+
+        try:
+            stat = os.stat( path )
+        except OSError:
+            return folder, None, children, None, None
+
+        new_state = ( stat.st_mtime_ns, stat.st_ino )
+
+        # Same entries as the last time
+        if new_state == state:
+            files = { }
+
+            if stat_files:
+                for name in known:
+                    try:
+                        file_stat = os.stat( os.path.join( path, name ) )
+                        files[ name ] = ( file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino )
+                    except OSError:
+                        files[ name ] = None
+
+            return folder, new_state, children, None, files
+
+        listing = { }
+
+        try:
+            with os.scandir( path ) as entries:
+                for entry in entries:
+                    if entry.name in self._ignore:
+                        continue
+
+                    try:
+                        if entry.is_dir( follow_symlinks=False ):
+                            listing[ entry.name ] = None
+
+                        elif entry.is_file( ):
+                            file_stat = entry.stat( )
+                            listing[ entry.name ] = ( file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino )
+
+                    except OSError:
+                        continue
+
+        except OSError:
+            return folder, None, children, None, None
+
+        return folder, new_state, children, listing, None
+
+    def __merge( self, folder: str, state: tuple, children: dict, listing: dict, files: dict ) -> list:
+        """
+            Apply result of a visit. returns sub folders to visit
+        """
+
+        if state is None:
+            self.__remove_folder( folder )
+            return [ ]
+
+        if self._folders.get( folder ) != state:
+            self._folders[ folder ] = state
+            self._is_dirty = True
+
+        # Not listed, check known files that were stated
+        if listing is None:
+            for name, file_state in files.items( ):
+                path = self.__join( folder, name )
+
+                if file_state is None:
+                    self.__remove_file( path )
+                else:
+                    self.__set_file( path, file_state )
+
+            return [ self.__join( folder, name ) for name, is_folder in children.items( ) if is_folder ]
+
+        for name, is_folder in children.items( ):
+            # Gone, or a file became a folder / a folder became a file
+            if not name in listing or ( listing[ name ] is None ) != is_folder:
+                path = self.__join( folder, name )
+
+                if is_folder:
+                    self.__remove_folder( path )
+                else:
+                    self.__remove_file( path )
+
+        self._children[ folder ] = { name: file_state is None for name, file_state in listing.items( ) }
+
+        folders = [ ]
+
+        for name, file_state in listing.items( ):
+            path = self.__join( folder, name )
+
+            if file_state is None:
+                folders.append( path )
+            else:
+                self.__set_file( path, file_state )
+
+        return folders
+
+    def __set_file( self, path: str, state: tuple ) -> None:
+
+        old_state = self._files.get( path )
+
+        if old_state == state:
+            return
+
+        if old_state is None:
+            self._added.append( path )
+        else:
+            self._modified.append( path )
+
+        self._files[ path ]  = state
+        self._is_dirty       = True
+        self._version        += 1
+
+    def __remove_file( self, path: str ) -> None:
+
+        if self._files.pop( path, None ) is None:
+            return
+
+        self._removed.append( path )
+        self._is_dirty  = True
+        self._version   += 1
+
+    def __remove_folder( self, folder: str ) -> None:
+        """
+            Forget a folder and everything inside it
+        """
+
+        if self._folders.pop( folder, None ) is not None:
+            self._is_dirty = True
+
+        for name, is_folder in self._children.pop( folder, { } ).items( ):
+            path = self.__join( folder, name )
+
+            if is_folder:
+                self.__remove_folder( path )
+            else:
+                self.__remove_file( path )
+
+    def __join( self, folder: str, name: str ) -> str:
+
+        return folder and folder + TREE_SEPARATOR + name or name
+
+    def __send( self, is_done: bool ) -> bool:
+        """
+            Queue the changes that were not sent. returns False if there were none
+        """
+
+        if not is_done and not ( self._added or self._removed or self._modified ):
+            return False
+
+        self._changes.append( ( self._added, self._removed, self._modified, is_done ) )
+
+        self._added     = [ ]
+        self._removed   = [ ]
+        self._modified  = [ ]
+
+        # Wake the ui loop only for the first queued batch
+        if len( self._changes ) == 1 and self._ui is not None:
+            self._ui.wake( )
+
+        return True
+
+    # endregion
@@ -0,0 +1,788 @@
+# SDK Search .py
+
+import re
+import time
+import bisect
+import itertools
+import threading
+
+from collections import deque
+
+try:
+    import re._parser as sre_parse
+except ImportError:
+    import sre_parse
+
+from sdk.document   import c_document
+from sdk.fenwick    import c_fenwick_tree
+
+SEARCH_BLOCK:       int = 128       # Wanted lines per index block (blocks split at twice this size)
+INDEX_CHUNK:        int = 16        # Blocks indexed by the worker before it lets others run
+RESULTS_BATCH:      int = 256       # Matches sent to the ui thread at once
+SEARCH_YIELD:       float = 0.001   # Worker pause between chunks / batches
+
+SEARCH_START:       int = 0         # Results of a new run follow, drop the shown ones
+SEARCH_MATCHES:     int = 1         # Matches of a document
+SEARCH_DONE:        int = 2         # Run finished
+
+REGEX_REPEATS:      tuple = tuple( getattr( sre_parse, name ) for name in ( "MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT" ) if hasattr( sre_parse, name ) )
+
+
+def trigrams( text: str ) -> set:
+    """
+        Returns case folded trigrams of text
+    """
+
+    text = text.casefold( )
+
+    return { text[ index:index + 3 ] for index in range( len( text ) - 2 ) }
+
+
+def literal_runs( items: any ) -> list:
+    """
+        Returns literal strings that every match of parsed regex items contains
+    """
+
+    runs    = [ ]
+    current = [ ]
+
+    for op, value in items:
+        if op == sre_parse.LITERAL:
+            current.append( chr( value ) )
+            continue
+
+        if current:
+            runs.append( "".join( current ) )
+            current = [ ]
+
+        # Groups and repeats that happen at least once are required too. branches are not
+        if op == sre_parse.SUBPATTERN:
+            runs.extend( literal_runs( value[ -1 ] ) )
+
+        elif op in REGEX_REPEATS and value[ 0 ] >= 1:
+            runs.extend( literal_runs( value[ 2 ] ) )
+
+    if current:
+        runs.append( "".join( current ) )
+
+    return runs
+
+
+def required_trigrams( query: str, is_regex: bool = False ) -> set:
+    """
+        Returns trigrams that every match of query contains (empty if unknown)
+    """
+
+    if not is_regex:
+        return trigrams( query )
+
+    try:
+        items = sre_parse.parse( query )
+    except Exception:
+        return set( )
+
+    result = set( )
+
+    for literal in literal_runs( items ):
+        result |= trigrams( literal )
+
+    return result
+
+
+def find_matches( pattern: re.Pattern, first_line: int, lines: list ) -> list:
+    """
+        Returns [ ( line, start column, end column ) ] of pattern in lines.
+        matches are inside single lines, empty matches are skipped
+    """
+
+    text    = "\n".join( lines )
+    result  = [ ]
+    starts  = None
+
+    for match in pattern.finditer( text ):
+        start, end = match.span( )
+
+        if start == end or text.find( "\n", start, end ) != -1:
+            continue
+
+        # Line starts only for blocks that have matches
+        if starts is None:
+            starts = [ 0 ] + list( itertools.accumulate( len( line ) + 1 for line in lines ) )
+
+        index       = bisect.bisect_right( starts, start ) - 1
+        line_start  = starts[ index ]
+
+        result.append( ( first_line + index, start - line_start, end - line_start ) )
+
+    return result
+
+
+class c_trigram_block:
+    """
+        Lines of an index block
+    """
+
+    __slots__ = ( "lines", "grams" )
+
+    lines:      list    # Lines text (replaced on edit, never changed in place)
+    grams:      set     # Trigrams the block is listed under
+
+    def __init__( self, lines: list ):
+
+        self.lines = lines
+        self.grams = set( )
+
+
+class c_trigram_index:
+    """
+        Trigram index of a document.
+
+        Lines are kept in blocks, and each trigram points to the blocks
+        that contain it, so a query verifies only blocks that have all
+        of its trigrams. Edits replace the lines of the touched blocks
+        and mark them dirty. Dirty blocks are always verified until the
+        search worker indexes them again, so typing does not build
+        trigrams on the ui thread.
+    """
+
+    _document:  c_document      # Indexed document
+
+    _blocks:    list            # [ c_trigram_block ] in document order
+    _counts:    c_fenwick_tree  # Lines in each block
+    _postings:  dict            # trigram -> set of blocks (can list removed blocks until cleaned)
+    _dirty:     set             # Blocks to index (again)
+    _removed:   list            # Removed blocks to take out of the postings
+    _version:   int             # Changed on each edit
+
+    _lock:      threading.Lock  # Guards all the data above
+
+    def __init__( self, document: c_document ):
+        """
+            Constructor for trigram index
+        """
+
+        # Lines are copied for the worker, a mapped file would be read whole
+        if not isinstance( document, c_document ):
+            raise Exception( "Trigram index needs a c_document" )
+
+        self._document  = document
+        self._lock      = threading.Lock( )
+        self._version   = 0
+
+        self.__reset( )
+
+        self._document.set_event( "change", self.__event_document_change, f"TrigramIndex::{ id( self ) }" )
+
+    def release( self ) -> None:
+        """
+            Detach from the document
+        """
+
+        self._document.unset_event( "change", f"TrigramIndex::{ id( self ) }" )
+
+    def document( self ) -> c_document:
+
+        return self._document
+
+    def version( self ) -> int:
+
+        return self._version
+
+    def is_indexed( self ) -> bool:
+        """
+            Are all blocks indexed
+        """
+
+        return not self._dirty and not self._removed
+
+    def stats( self ) -> dict:
+        """
+            Returns index information
+        """
+
+        return {
+            "blocks":   len( self._blocks ),
+            "dirty":    len( self._dirty ),
+            "trigrams": len( self._postings )
+        }
+
+    # region : Query
+
+    def candidates( self, grams: set ) -> tuple:
+        """
+            Returns ( version, [ ( first line, lines ) ] ) of the blocks that can contain all grams
+        """
+
+        with self._lock:
+            found = None
+
+            if grams:
+                sets    = sorted( ( self._postings.get( gram, ( ) ) for gram in grams ), key=len )
+                found   = set( sets[ 0 ] ).intersection( *sets[ 1: ] ) | self._dirty
+
+            result  = [ ]
+            line    = 0
+
+            for block in self._blocks:
+                if found is None or block in found:
+                    result.append( ( line, block.lines ) )
+
+                line += len( block.lines )
+
+            return self._version, result
+
+    # endregion
+
+    # region : Indexing
+
+    def index( self, limit: int = INDEX_CHUNK ) -> int:
+        """
+            Index up to limit dirty blocks. returns how many were done.
+            called by the search worker
+        """
+
+        with self._lock:
+            # Removed blocks first, so their trigrams do not stay listed
+            while self._removed and limit > 0:
+                self.__unlink( self._removed.pop( ) )
+                limit -= 1
+
+            blocks = list( itertools.islice( self._dirty, limit ) )
+
+        for block in blocks:
+            lines = block.lines
+            grams = trigrams( "\n".join( lines ) )
+
+            with self._lock:
+                # Edited again while its trigrams were built, stays dirty
+                if block.lines is not lines or not block in self._dirty:
+                    continue
+
+                postings = self._postings
+
+                for gram in block.grams - grams:
+                    listed = postings.get( gram )
+
+                    if listed is not None:
+                        listed.discard( block )
+
+                        if not listed:
+                            del postings[ gram ]
+
+                for gram in grams - block.grams:
+                    listed = postings.get( gram )
+
+                    if listed is None:
+                        postings[ gram ] = { block }
+                    else:
+                        listed.add( block )
+
+                block.grams = grams
+                self._dirty.discard( block )
+
+        return len( blocks )
+
+    def __reset( self ) -> None:
+        """
+            Take all lines from the document again
+        """
+
+        lines = self._document.get( ).split( "\n" )
+
+        with self._lock:
+            self._blocks    = [ c_trigram_block( lines[ start:start + SEARCH_BLOCK ] ) for start in range( 0, len( lines ), SEARCH_BLOCK ) ]
+            self._postings  = { }
+            self._dirty     = set( self._blocks )
+            self._removed   = [ ]
+            self._version   += 1
+
+            self.__rebuild( )
+
+    def __replace( self, first: int, last: int, new_lines: list ) -> None:
+        """
+            Replace lines [first, last] with new lines. call only while holding the lock
+        """
+
+        first_block, first_index    = self.__locate( first )
+        last_block, last_index      = self.__locate( last )
+
+        head = self._blocks[ first_block ]
+        tail = self._blocks[ last_block ]
+
+        lines = head.lines[ :first_index ] + new_lines + tail.lines[ last_index + 1: ]
+        delta = len( lines ) - len( head.lines )
+
+        # Postings of removed blocks are cleaned by the worker
+        for block in self._blocks[ first_block + 1:last_block + 1 ]:
+            self._dirty.discard( block )
+            self._removed.append( block )
+
+        if len( lines ) <= SEARCH_BLOCK * 2:
+            parts = [ lines ]
+        else:
+            parts = [ lines[ start:start + SEARCH_BLOCK ] for start in range( 0, len( lines ), SEARCH_BLOCK ) ]
+
+        head.lines  = parts[ 0 ]
+        blocks      = [ head ] + [ c_trigram_block( part ) for part in parts[ 1: ] ]
+
+        self._blocks[ first_block:last_block + 1 ] = blocks
+        self._dirty.update( blocks )
+
+        if first_block == last_block and len( blocks ) == 1:
+            self._counts.add( first_block, delta )
+        else:
+            self.__rebuild( )
+
+    def __unlink( self, block: c_trigram_block ) -> None:
+        """
+            Remove block from the postings. call only while holding the lock
+        """
+
+        postings = self._postings
+
+        for gram in block.grams:
+            listed = postings.get( gram )
+
+            if listed is None:
+                continue
+
+            listed.discard( block )
+
+            if not listed:
+                del postings[ gram ]
+
+    def __locate( self, line: int ) -> tuple:
+        """
+            Returns ( block, index in block ) of a line
+        """
+
+        block, index = self._counts.find( line )
+
+        if block >= len( self._blocks ):
+            block = len( self._blocks ) - 1
+            index = len( self._blocks[ block ].lines ) - 1
+
+        return block, int( index )
+
+    def __rebuild( self ) -> None:
+
+        self._counts = c_fenwick_tree( [ len( block.lines ) for block in self._blocks ] )
+
+    def __event_document_change( self, event ) -> None:
+        """
+            Document was changed. replace edited lines and mark their blocks dirty
+        """
+
+        line            = event( "line" )
+        removed_lines   = event( "removed_lines" )
+        inserted_lines  = event( "inserted_lines" )
+
+        document = self._document
+
+        # Whole document was replaced (load)
+        if line == 0 and removed_lines > 0 and removed_lines == self._counts.total( ) - 1 and inserted_lines == document.line_count( ) - 1:
+            return self.__reset( )
+
+        # Read outside of the lock, only this thread edits the document. one read for all the lines
+        new_lines = document.get( document.line_start( line ), document.line_end( line + inserted_lines ) ).split( "\n" )
+
+        with self._lock:
+            self.__replace( line, line + removed_lines, new_lines )
+            self._version += 1
+
+    # endregion
+
+
+class c_search:
+    """
+        Find and replace across open documents.
+
+        Each document has a trigram index kept up to date on edits.
+        Queries run on a worker thread : the index narrows them to few
+        blocks, the pattern verifies only those, and matches are sent
+        to the ui thread in batches through a deque. While a query is
+        active, edits run it again, so results follow typing. When no
+        query runs the worker indexes edited blocks.
+
+        Matches are inside single lines.
+    """
+
+    _indexes:       dict            # document -> c_trigram_index
+    _pattern:       re.Pattern      # Active query pattern (None if none)
+    _grams:         set             # Trigrams every match contains
+    _is_regex:      bool            # Is the replacement a regex template
+    _query:         int             # Changed by find / clear
+
+    _results:       deque           # ( kind, query, document, matches ) (worker thread -> ui thread)
+    _matches:       dict            # document -> [ ( line, start column, end column ) ] sorted
+    _count:         int             # Shown matches
+    _is_done:       bool            # Did the last run finish
+
+    _ui:            any             # c_ui the search is attached to (can be None)
+
+    _lock:          threading.Lock  # Guards documents and query
+    _wake:          threading.Event # Set when there is work for the worker
+    _thread:        threading.Thread
+    _is_running:    bool
+
+    def __init__( self ):
+        """
+            Constructor for search
+        """
+
+        self._indexes   = { }
+        self._pattern   = None
+        self._grams     = set( )
+        self._is_regex  = False
+        self._query     = 0
+
+        self._results   = deque( )
+        self._matches   = { }
+        self._count     = 0
+        self._is_done   = True
+
+        self._ui        = None
+
+        self._lock      = threading.Lock( )
+        self._wake      = threading.Event( )
+
+        self._is_running    = True
+        self._thread        = threading.Thread( target=self.__worker, daemon=True )
+        self._thread.start( )
+
+    def release( self ) -> None:
+        """
+            Stop the worker and detach from all documents
+        """
+
+        self._is_running = False
+        self._wake.set( )
+
+        self._thread.join( )
+
+        for document in list( self._indexes ):
+            self.remove_document( document )
+
+    def attach( self, ui: any ) -> None:
+        """
+            Receive results before each frame of c_ui
+        """
+
+        self._ui = ui
+        self._ui.set_event( "pre_draw", self.__event_pre_draw, f"Search::{ id( self ) }" )
+
+    # region : Documents
+
+    def add_document( self, document: c_document ) -> None:
+        """
+            Index document and include it in searches
+        """
+
+        if document in self._indexes:
+            return
+
+        index = c_trigram_index( document )
+
+        with self._lock:
+            self._indexes[ document ] = index
+
+        # Registered after the index, so it runs once the index is updated
+        document.set_event( "change", self.__event_document_change, f"Search::{ id( self ) }" )
+
+        self._wake.set( )
+
+    def remove_document( self, document: c_document ) -> None:
+        """
+            Stop indexing document
+        """
+
+        with self._lock:
+            index = self._indexes.pop( document, None )
+
+        if index is None:
+            return
+
+        document.unset_event( "change", f"Search::{ id( self ) }" )
+        index.release( )
+
+        self._count -= len( self._matches.pop( document, [ ] ) )
+
+    def index( self, document: c_document ) -> c_trigram_index | None:
+
+        return self._indexes.get( document )
+
+    # endregion
+
+    # region : Query
+
+    def find( self, query: str, is_regex: bool = False, ignore_case: bool = False ) -> None:
+        """
+            Start searching all documents. results arrive in the following frames
+        """
+
+        if not query:
+            return self.clear( )
+
+        flags = re.MULTILINE | ( ignore_case and re.IGNORECASE or 0 )
+
+        try:
+            pattern = re.compile( is_regex and query or re.escape( query ), flags )
+        except re.error as error:
+            raise Exception( f"Invalid search pattern : { error }" )
+
+        with self._lock:
+            self._pattern   = pattern
+            self._grams     = required_trigrams( query, is_regex )
+            self._is_regex  = is_regex
+            self._query     += 1
+
+        self.__clear_results( )
+        self._is_done = False
+
+        self._wake.set( )
+
+    def clear( self ) -> None:
+        """
+            Stop searching and drop results
+        """
+
+        with self._lock:
+            self._pattern   = None
+            self._grams     = set( )
+            self._query     += 1
+
+        self.__clear_results( )
+
+    def replace_all( self, replacement: str, histories: dict = None ) -> int:
+        """
+            Replace all matches of the active query. histories ( document -> c_history )
+            get the edits of a document as one undo group. returns replaced matches count
+        """
+
+        if self._pattern is None:
+            return 0
+
+        pattern     = self._pattern
+        histories   = histories is not None and histories or { }
+        total       = 0
+
+        for document, index in list( self._indexes.items( ) ):
+            if document.is_read_only( ):
+                continue
+
+            # Index is updated on this thread, so its lines are the document lines
+            _, blocks = index.candidates( self._grams )
+
+            edits = [ ]
+
+            for first_line, lines in blocks:
+                text = "\n".join( lines )
+                base = None
+
+                for match in pattern.finditer( text ):
+                    start, end = match.span( )
+
+                    if start == end or text.find( "\n", start, end ) != -1:
+                        continue
+
+                    if base is None:
+                        base = document.line_start( first_line )
+
+                    edits.append( ( base + start, base + end, match.expand( replacement ) if self._is_regex else replacement ) )
+
+            if not edits:
+                continue
+
+            history = histories.get( document )
+
+            if history is not None:
+                history.begin_group( )
+
+            # Only the matches are edited, text between them (and what peers do there) is left alone.
+            # last match first, so offsets of the others stay valid
+            try:
+                for start, end, text in reversed( edits ):
+                    document.replace( start, end - start, text )
+
+            finally:
+                if history is not None:
+                    history.end_group( )
+
+            total += len( edits )
+
+        return total
+
+    # endregion
+
+    # region : Results
+
+    def drain( self ) -> int:
+        """
+            Receive results of the worker. returns received matches count.
+            called each frame in pre_draw once attached
+        """
+
+        count       = 0
+        is_changed  = False
+
+        while self._results:
+            kind, query, document, matches = self._results.popleft( )
+
+            # Results of a replaced query, or of a removed document
+            if query != self._query or ( document is not None and not document in self._indexes ):
+                continue
+
+            is_changed = True
+
+            if kind == SEARCH_START:
+                self.__clear_results( )
+
+            elif kind == SEARCH_MATCHES:
+                self._matches.setdefault( document, [ ] ).extend( matches )
+                count += len( matches )
+
+            else:
+                self._is_done = True
+
+        self._count += count
+
+        if is_changed and self._ui is not None:
+            self._ui.request_redraw( )
+
+        return count
+
+    def matches( self, document: c_document, first: int = 0, last: int = None ) -> list:
+        """
+            Returns [ ( line, start column, end column ) ] of document in lines [first, last)
+        """
+
+        matches = self._matches.get( document )
+
+        if not matches:
+            return [ ]
+
+        start   = bisect.bisect_left( matches, ( first, ) )
+        end     = last is None and len( matches ) or bisect.bisect_left( matches, ( last, ) )
+
+        return matches[ start:end ]
+
+    def count( self ) -> int:
+        """
+            Returns received matches count
+        """
+
+        return self._count
+
+    def is_done( self ) -> bool:
+        """
+            Did the worker finish the last query run
+        """
+
+        return self._is_done
+
+    def stats( self ) -> dict:
+        """
+            Returns search information
+        """
+
+        return {
+            "documents":    len( self._indexes ),
+            "matches":      self._count,
+            "done":         self._is_done,
+            "queued":       len( self._results ),
+            "dirty":        sum( index.stats( )[ "dirty" ] for index in list( self._indexes.values( ) ) )
+        }
+
+    def __clear_results( self ) -> None:
+
+        self._matches   = { }
+        self._count     = 0
+
+    def __event_pre_draw( self, event ) -> None:
+
+        self.drain( )
+
+    def __event_document_change( self, event ) -> None:
+        """
+            Edited document, run the query again and index the edit
+        """
+
+        self._wake.set( )
+
+    # endregion
+
+    # region : Worker thread
+
+    def __worker( self ) -> None:
+        """
+            Worker thread. run queries, index dirty blocks when idle
+        """
+
+        searched = None
+
+        while self._is_running:
+            self._wake.clear( )
+
+            with self._lock:
+                query   = self._query
+                pattern = self._pattern
+                grams   = self._grams
+                indexes = list( self._indexes.items( ) )
+
+            state = ( query, [ ( document, index.version( ) ) for document, index in indexes ] )
+
+            # Query changed, or documents changed since the last complete run
+            if pattern is not None and state != searched:
+                if self.__search( query, pattern, grams, indexes ):
+                    searched = state
+
+                continue
+
+            if any( [ index.index( INDEX_CHUNK ) for _, index in indexes ] ):
+                # Let the ui thread take the interpreter
+                time.sleep( SEARCH_YIELD )
+                continue
+
+            self._wake.wait( )
+
+    def __search( self, query: int, pattern: re.Pattern, grams: set, indexes: list ) -> bool:
+        """
+            Search all documents. returns False if the query or a document changed on the way
+        """
+
+        self.__send( ( SEARCH_START, query, None, None ) )
+
+        for document, index in indexes:
+            version, blocks = index.candidates( grams )
+
+            batch = [ ]
+
+            for first_line, lines in blocks:
+                batch.extend( find_matches( pattern, first_line, lines ) )
+
+                if len( batch ) >= RESULTS_BATCH:
+                    self.__send( ( SEARCH_MATCHES, query, document, batch ) )
+                    batch = [ ]
+
+                    time.sleep( SEARCH_YIELD )
+
+                # Line numbers are stale, start again
+                if self._query != query or index.version( ) != version:
+                    return False
+
+            if batch:
+                self.__send( ( SEARCH_MATCHES, query, document, batch ) )
+
+        self.__send( ( SEARCH_DONE, query, None, None ) )
+
+        return True
+
+    def __send( self, message: tuple ) -> None:
+
+        self._results.append( message )
+
+        # Wake the ui loop only for the first queued message
+        if len( self._results ) == 1 and self._ui is not None:
+            self._ui.wake( )
+
+    # endregion
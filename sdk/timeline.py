@@ -0,0 +1,87 @@
+# SDK Timeline .py
+
+import time
+
+class c_timeline:
+    """
+        Timeline object
+
+        Records named sections relative to the timeline creation.
+        Used to track time-to-first-frame as a number.
+    """
+
+    _origin:    float   # perf_counter value at creation
+    _entries:   list    # (name, start, duration) in seconds
+    _open:      dict    # Sections that began and did not end yet
+
+    def __init__( self ):
+        """
+            Constructor for timeline object
+        """
+
+        self._origin    = time.perf_counter( )
+        self._entries   = [ ]
+        self._open      = { }
+
+    def begin( self, name: str ) -> None:
+        """
+            Start measuring a section
+        """
+
+        self._open[ name ] = time.perf_counter( )
+
+    def end( self, name: str ) -> float:
+        """
+            Stop measuring a section and returns its duration
+        """
+
+        if not name in self._open:
+            return 0
+
+        start       = self._open.pop( name )
+        duration    = time.perf_counter( ) - start
+
+        self._entries.append( ( name, start - self._origin, duration ) )
+
+        return duration
+
+    def mark( self, name: str ) -> None:
+        """
+            Record a point in time (section with no duration)
+        """
+
+        self._entries.append( ( name, time.perf_counter( ) - self._origin, 0 ) )
+
+    def entries( self ) -> list:
+        """
+            Returns recorded entries as (name, start, duration)
+        """
+
+        return list( self._entries )
+
+    def elapsed( self, name: str ) -> float | None:
+        """
+            Returns time from creation until the end of specific entry
+        """
+
+        for entry_name, start, duration in self._entries:
+            if entry_name == name:
+                return start + duration
+
+        return None
+
+    def report( self ) -> str:
+        """
+            Returns readable timeline report
+        """
+
+        lines = [ "      start   duration   name" ]
+
+        for name, start, duration in self._entries:
+            lines.append( f"{ start * 1000:9.2f}ms { duration * 1000:8.2f}ms   { name }" )
+
+        return "\n".join( lines )
+
+
+# Shared startup timeline. created on first sdk.timeline import
+startup: c_timeline = c_timeline( )
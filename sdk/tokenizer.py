@@ -0,0 +1,375 @@
+# SDK Tokenizer .py
+
+import re
+import time
+import keyword
+import builtins
+import threading
+
+from sdk.document import c_document
+
+TOKEN_TEXT:             int = 0     # Not highlighted (spans are not created for it)
+TOKEN_KEYWORD:          int = 1
+TOKEN_BUILTIN:          int = 2
+TOKEN_FUNCTION:         int = 3     # Name after def / class
+TOKEN_STRING:           int = 4
+TOKEN_NUMBER:           int = 5
+TOKEN_COMMENT:          int = 6
+TOKEN_OPERATOR:         int = 7
+
+STATE_NORMAL:           int = 0     # Line ended outside of any token
+STATE_STRING_DOUBLE:    int = 1     # Line ended inside """ string
+STATE_STRING_SINGLE:    int = 2     # Line ended inside ''' string
+
+FILL_CHUNK:             int = 256       # Lines lexed by the background thread before it lets others run
+FILL_YIELD:             float = 0.001   # Background thread pause between chunks
+FOREGROUND_LIMIT:       int = 512       # Max lines .spans will lex on the caller thread
+
+PYTHON_KEYWORDS:        set = set( keyword.kwlist )
+PYTHON_BUILTINS:        set = set( name for name in dir( builtins ) if not name.startswith( "_" ) )
+
+PYTHON_TRIPLE_QUOTES:   dict = { STATE_STRING_DOUBLE: "\"\"\"", STATE_STRING_SINGLE: "'''" }
+
+PYTHON_PATTERN = re.compile(
+    r"(?P<comment>#.*)"
+    r"|(?P<triple>[rRbBuUfF]{0,2}(?P<quote>\"\"\"|'''))"
+    r"|(?P<string>[rRbBuUfF]{0,2}(\"(\\.|[^\"\\])*\"?|'(\\.|[^'\\])*'?))"
+    r"|(?P<number>\b(0[xXoObB][0-9a-fA-F_]+|\d[\d_]*\.?[\d_]*([eE][+-]?\d+)?[jJ]?))"
+    r"|(?P<name>[A-Za-z_][A-Za-z0-9_]*)"
+    r"|(?P<operator>[-+*/%=<>!&|^~@]+)"
+)
+
+
+class c_python_lexer:
+    """
+        Python line lexer.
+
+        Lexes one line at a time. The only state that crosses lines
+        is an open triple quoted string, so it fits in a small int.
+    """
+
+    def lex( self, text: str, state: int = STATE_NORMAL ) -> tuple:
+        """
+            Returns ( spans, end state ) of a line.
+            spans is a list of ( start, end, token ) for highlighted tokens only
+        """
+
+        spans       = [ ]
+        position    = 0
+        length      = len( text )
+
+        # Continue open string from previous line
+        if state != STATE_NORMAL:
+            close = text.find( PYTHON_TRIPLE_QUOTES[ state ] )
+
+            if close < 0:
+                if length > 0:
+                    spans.append( ( 0, length, TOKEN_STRING ) )
+
+                return spans, state
+
+            position = close + 3
+            spans.append( ( 0, position, TOKEN_STRING ) )
+
+        last_word = None
+
+        while position < length:
+            match = PYTHON_PATTERN.search( text, position )
+
+            if match is None:
+                break
+
+            kind        = match.lastgroup
+            start, end  = match.span( )
+
+            if kind == "name":
+                word    = match.group( )
+                token   = TOKEN_TEXT
+
+                if word in PYTHON_KEYWORDS:
+                    token = TOKEN_KEYWORD
+
+                elif last_word == "def" or last_word == "class":
+                    token = TOKEN_FUNCTION
+
+                elif word in PYTHON_BUILTINS:
+                    token = TOKEN_BUILTIN
+
+                if token != TOKEN_TEXT:
+                    spans.append( ( start, end, token ) )
+
+                last_word = word
+
+            elif kind == "triple":
+                quote = match.group( "quote" )
+                close = text.find( quote, end )
+
+                # String continues on the next lines
+                if close < 0:
+                    spans.append( ( start, length, TOKEN_STRING ) )
+
+                    return spans, quote == "\"\"\"" and STATE_STRING_DOUBLE or STATE_STRING_SINGLE
+
+                end = close + 3
+                spans.append( ( start, end, TOKEN_STRING ) )
+
+            elif kind == "string":
+                spans.append( ( start, end, TOKEN_STRING ) )
+
+            elif kind == "number":
+                spans.append( ( start, end, TOKEN_NUMBER ) )
+
+            elif kind == "comment":
+                spans.append( ( start, end, TOKEN_COMMENT ) )
+
+            elif kind == "operator":
+                spans.append( ( start, end, TOKEN_OPERATOR ) )
+
+            position = end
+
+        return spans, STATE_NORMAL
+
+
+class c_tokenizer:
+    """
+        Incremental document tokenizer.
+
+        Keeps the spans and the lexer end state of each line.
+        After an edit only the edited lines are lexed again, and lexing
+        continues only while the end state differs from the cached one.
+        Once it matches, the following lines are still valid.
+
+        The whole document is lexed by a background thread that fills
+        the cache progressively after the document is opened.
+    """
+
+    _document:      c_document      # Tokenized document
+    _lexer:         any             # Lexer with .lex( text, state ) -> ( spans, state )
+
+    _lines:         list            # Lines text (own copy, read by the background thread)
+    _states:        list            # End state of each line (None if never lexed)
+    _spans:         list            # Spans of each line (None if must be lexed)
+
+    _frontier:      int             # Lines before it are valid
+    _end:           int             # Lines from it were never lexed
+    _dirty:         set             # Edited lines between _frontier and _end
+    _lexed:         int             # Total lexed lines
+
+    _lock:          threading.Lock  # Guards all the data above
+    _wake:          threading.Event # Set when there is work for the background thread
+    _thread:        threading.Thread
+    _is_running:    bool
+
+    def __init__( self, document: c_document, lexer: any = None, background: bool = True ):
+        """
+            Constructor for tokenizer
+        """
+
+        # Lines are copied for the background thread, a mapped file would be read whole
+        if not isinstance( document, c_document ):
+            raise Exception( "Tokenizer needs a c_document" )
+
+        self._document  = document
+        self._lexer     = lexer is not None and lexer or c_python_lexer( )
+
+        self._lock      = threading.Lock( )
+        self._wake      = threading.Event( )
+        self._thread    = None
+        self._is_running = False
+
+        self._lexed     = 0
+        self.__reset( )
+
+        self._document.set_event( "change", self.__event_document_change, f"Tokenizer::{ id( self ) }" )
+
+        if background:
+            self._is_running    = True
+            self._thread        = threading.Thread( target=self.__fill, daemon=True )
+            self._thread.start( )
+
+    def release( self ) -> None:
+        """
+            Stop the background thread and detach from the document
+        """
+
+        self._document.unset_event( "change", f"Tokenizer::{ id( self ) }" )
+
+        if self._thread is not None:
+            self._is_running = False
+            self._wake.set( )
+
+            self._thread.join( )
+            self._thread = None
+
+    # region : Access
+
+    def spans( self, line: int ) -> list | None:
+        """
+            Returns spans of a line ( start, end, token ).
+
+            Lines close after the valid part are lexed here, further
+            lines return their last known spans (None if never lexed)
+            until the background thread reaches them
+        """
+
+        with self._lock:
+            if line < 0 or line >= len( self._lines ):
+                return None
+
+            if line >= self._frontier and line - self._frontier < FOREGROUND_LIMIT:
+                self.__advance( line + 1 )
+
+            return self._spans[ line ]
+
+    def state( self, line: int ) -> int | None:
+        """
+            Returns cached end state of a line
+        """
+
+        with self._lock:
+            return self._states[ line ]
+
+    def is_complete( self ) -> bool:
+        """
+            Are all lines lexed and valid
+        """
+
+        return self._frontier >= len( self._lines )
+
+    def stats( self ) -> dict:
+        """
+            Returns tokenizer progress information
+        """
+
+        return {
+            "lines":    len( self._lines ),
+            "valid":    self._frontier,
+            "dirty":    len( self._dirty ),
+            "lexed":    self._lexed
+        }
+
+    # endregion
+
+    # region : Lexing
+
+    def __reset( self ) -> None:
+        """
+            Take all lines from the document again
+        """
+
+        self._lines     = self._document.get( ).split( "\n" )
+        self._states    = [ None ] * len( self._lines )
+        self._spans     = [ None ] * len( self._lines )
+
+        self._frontier  = 0
+        self._end       = 0
+        self._dirty     = set( )
+
+    def __advance( self, target: int ) -> None:
+        """
+            Lex lines from the frontier until target line is valid.
+            call only while holding the lock
+        """
+
+        lines   = self._lines
+        states  = self._states
+        spans   = self._spans
+        lex     = self._lexer.lex
+
+        target  = min( target, len( lines ) )
+        line    = self._frontier
+
+        while line < target:
+            state = line > 0 and states[ line - 1 ] or STATE_NORMAL
+
+            line_spans, end_state = lex( lines[ line ], state )
+
+            previous        = states[ line ]
+            spans[ line ]   = line_spans
+            states[ line ]  = end_state
+
+            self._dirty.discard( line )
+            self._lexed += 1
+
+            line += 1
+
+            # Next line starts in the same state as before, so cached lines stay valid up to the next edited one
+            if end_state == previous and line < self._end:
+                line = min( ( dirty for dirty in self._dirty if dirty >= line ), default=self._end )
+
+        self._frontier  = max( self._frontier, line )
+        self._end       = max( self._end, self._frontier )
+
+    def __fill( self ) -> None:
+        """
+            Background thread. lex the document in small chunks
+        """
+
+        while self._is_running:
+            with self._lock:
+                is_done = self._frontier >= len( self._lines )
+
+                if not is_done:
+                    self.__advance( self._frontier + FILL_CHUNK )
+
+            if is_done:
+                self._wake.wait( )
+                self._wake.clear( )
+            else:
+                # Let the ui thread take the interpreter
+                time.sleep( FILL_YIELD )
+
+    def __event_document_change( self, event ) -> None:
+        """
+            Document was changed. replace edited lines and mark them dirty
+        """
+
+        line            = event( "line" )
+        removed_lines   = event( "removed_lines" )
+        inserted_lines  = event( "inserted_lines" )
+
+        # Whole document was replaced (load)
+        if line == 0 and removed_lines == len( self._lines ) - 1 and inserted_lines == self._document.line_count( ) - 1:
+            with self._lock:
+                self.__reset( )
+
+            return self._wake.set( )
+
+        # Read outside of the lock, only this thread edits the document
+        document    = self._document
+        new_lines   = [ document.line( line + index ) for index in range( inserted_lines + 1 ) ]
+
+        with self._lock:
+            last    = line + removed_lines
+            delta   = inserted_lines - removed_lines
+
+            # Last edited line keeps its old end state, so lexing can stop once it matches again
+            self._lines[ line : last + 1 ]  = new_lines
+            self._states[ line : last + 1 ] = [ None ] * inserted_lines + [ self._states[ last ] ]
+            self._spans[ line : last + 1 ]  = [ None ] * ( inserted_lines + 1 )
+
+            if self._end > last:
+                self._end += delta
+
+            elif self._end > line:
+                self._end = line + inserted_lines + 1
+
+            dirty = set( range( line, line + inserted_lines + 1 ) )
+
+            for index in self._dirty:
+                if index < line:
+                    dirty.add( index )
+
+                elif index > last:
+                    dirty.add( index + delta )
+
+            # Lines from the old frontier were lexed after lines that were not valid, they can not be skipped
+            if self._frontier > last:
+                dirty.add( self._frontier + delta )
+
+            self._dirty     = set( index for index in dirty if index < self._end )
+            self._frontier  = min( self._frontier, line )
+
+        self._wake.set( )
+
+    # endregion
@@ -0,0 +1,480 @@
+# SDK Tree .py
+
+from sdk.fenwick import c_fenwick_tree
+
+TREE_SEPARATOR:     str = "/"
+TREE_EDIT_LIMIT:    int = 64    # Changed paths edited in place by update, more build the tree again
+
+
+class c_tree_model:
+    """
+        Tree of paths kept as a flat preorder array.
+
+        Each node keeps its depth, parent and subtree size, so the nodes
+        of a subtree are one range right after it. A Fenwick tree over
+        the visible flags (all ancestors expanded) converts row <-> node
+        in O(log n). Expand / collapse touch only the nodes that appear
+        or hide, collapsed folders inside them are skipped by their size.
+
+        Folders come before files, both sorted by name.
+    """
+
+    _names:     list            # Node name
+    _depths:    list            # Node depth (0 for top level)
+    _parents:   list            # Parent node (-1 for top level)
+    _sizes:     list            # Nodes in the subtree, the node included
+    _folders:   list            # Is the node a folder
+    _expanded:  list            # Is the folder expanded
+
+    _flags:     list            # 1 for visible nodes
+    _visible:   c_fenwick_tree  # Sums of _flags
+
+    _paths:     dict            # path -> node (None until needed)
+
+    def __init__( self, paths: list = None ):
+        """
+            Constructor for tree model
+        """
+
+        self.build( paths is not None and paths or [ ] )
+
+    def build( self, paths: list, expanded: set = None ) -> None:
+        """
+            Replace all nodes with the tree of paths. folders end with the separator
+            when they have no files. expanded is a set of folder paths to expand
+        """
+
+        self._names     = [ ]
+        self._depths    = [ ]
+        self._parents   = [ ]
+        self._sizes     = [ ]
+        self._folders   = [ ]
+        self._expanded  = [ ]
+        self._paths     = None
+
+        entries = [ ]
+
+        for path in set( paths ):
+            parts       = [ part for part in path.split( TREE_SEPARATOR ) if part ]
+            is_folder   = path.endswith( TREE_SEPARATOR )
+
+            if not parts:
+                continue
+
+            # Folders before files on each level. one string compares faster than tuples
+            key = "\0".join( [ "\0" + part for part in parts[ :-1 ] ] + [ ( is_folder and "\0" or "\1" ) + parts[ -1 ] ] )
+            entries.append( ( key, parts, is_folder ) )
+
+        entries.sort( key=lambda entry: entry[ 0 ] )
+
+        stack = [ ]     # Open folders ( name, node )
+
+        for _, parts, is_folder in entries:
+            # Close folders that are not in this path
+            common  = 0
+            limit   = is_folder and len( parts ) or len( parts ) - 1
+
+            while common < len( stack ) and common < limit and stack[ common ][ 0 ] == parts[ common ]:
+                common += 1
+
+            while len( stack ) > common:
+                self.__close( stack.pop( )[ 1 ] )
+
+            # Folder was already added by an earlier path
+            if len( stack ) == len( parts ):
+                continue
+
+            for part in parts[ len( stack ):-1 ]:
+                stack.append( ( part, self.__add( part, len( stack ), stack, True ) ) )
+
+            node = self.__add( parts[ -1 ], len( stack ), stack, is_folder )
+
+            if is_folder:
+                stack.append( ( parts[ -1 ], node ) )
+            else:
+                self.__close( node )
+
+        while stack:
+            self.__close( stack.pop( )[ 1 ] )
+
+        if expanded:
+            for node, path in enumerate( self.__paths( ) ):
+                if self._folders[ node ] and path in expanded:
+                    self._expanded[ node ] = True
+
+        self.__rebuild( )
+
+    def update( self, added: list = ( ), removed: list = ( ) ) -> None:
+        """
+            Add / remove file paths. expanded folders stay expanded, folders
+            left empty by removed files are removed
+        """
+
+        if len( added ) + len( removed ) > TREE_EDIT_LIMIT:
+            return self.__update_build( added, removed )
+
+        # Few paths, each is an O(n) list edit done in C and O(depth * children) search.
+        # added first, so a folder that only changes files is not removed (and collapsed)
+        for path in added:
+            self.__insert( path )
+
+        for path in removed:
+            if not path in added:
+                self.__remove( path )
+
+        self._paths = None
+        self.__rebuild( )
+
+    # region : Access
+
+    def __len__( self ) -> int:
+
+        return len( self._names )
+
+    def rows( self ) -> int:
+        """
+            Returns visible nodes count
+        """
+
+        return int( self._visible.total( ) )
+
+    def node( self, row: int ) -> int:
+        """
+            Returns node shown at row. O(log n)
+        """
+
+        return self._visible.find( row )[ 0 ]
+
+    def row( self, node: int ) -> int | None:
+        """
+            Returns row of a node (None if hidden). O(log n)
+        """
+
+        if not self._flags[ node ]:
+            return None
+
+        return int( self._visible.prefix( node ) )
+
+    def next( self, node: int ) -> int:
+        """
+            Returns the next visible node after a visible node (len if none). O(1)
+        """
+
+        if self._folders[ node ] and not self._expanded[ node ]:
+            return node + self._sizes[ node ]
+
+        return node + 1
+
+    def name( self, node: int ) -> str:
+
+        return self._names[ node ]
+
+    def depth( self, node: int ) -> int:
+
+        return self._depths[ node ]
+
+    def parent( self, node: int ) -> int:
+
+        return self._parents[ node ]
+
+    def size( self, node: int ) -> int:
+        """
+            Returns nodes in the subtree of node, the node included
+        """
+
+        return self._sizes[ node ]
+
+    def is_folder( self, node: int ) -> bool:
+
+        return self._folders[ node ]
+
+    def is_expanded( self, node: int ) -> bool:
+
+        return self._expanded[ node ]
+
+    def is_visible( self, node: int ) -> bool:
+
+        return self._flags[ node ] == 1
+
+    def path( self, node: int ) -> str:
+        """
+            Returns path of a node. O(depth)
+        """
+
+        parts = [ ]
+
+        while node != -1:
+            parts.append( self._names[ node ] )
+            node = self._parents[ node ]
+
+        return TREE_SEPARATOR.join( reversed( parts ) )
+
+    def find( self, path: str ) -> int | None:
+        """
+            Returns node of a path (None if not found)
+        """
+
+        # Built once after each build, O(1) lookups after
+        if self._paths is None:
+            self._paths = { path: node for node, path in enumerate( self.__paths( ) ) }
+
+        return self._paths.get( path.strip( TREE_SEPARATOR ) )
+
+    def expanded( self ) -> set:
+        """
+            Returns paths of the expanded folders
+        """
+
+        return set( path for node, path in enumerate( self.__paths( ) ) if self._expanded[ node ] )
+
+    # endregion
+
+    # region : Expand
+
+    def expand( self, node: int, is_expanded: bool = True ) -> None:
+        """
+            Expand / collapse a folder
+        """
+
+        if not self._folders[ node ] or self._expanded[ node ] == is_expanded:
+            return
+
+        self._expanded[ node ] = is_expanded
+
+        # Hidden folder, its nodes stay hidden
+        if not self._flags[ node ]:
+            return
+
+        changed = self.__shown( node )
+        value   = is_expanded and 1 or 0
+
+        # Many rows at once, rebuilding is cheaper than updates
+        if len( changed ) * max( len( self._names ).bit_length( ), 1 ) > len( self._names ):
+            for index in changed:
+                self._flags[ index ] = value
+
+            self._visible.build( self._flags )
+            return
+
+        for index in changed:
+            self._flags[ index ] = value
+            self._visible.set( index, value )
+
+    def collapse( self, node: int ) -> None:
+
+        self.expand( node, False )
+
+    def toggle( self, node: int ) -> None:
+
+        self.expand( node, not self._expanded[ node ] )
+
+    def reveal( self, path: str ) -> int | None:
+        """
+            Expand the folders of a path. returns its row (None if not found)
+        """
+
+        node = self.find( path )
+
+        if node is None:
+            return None
+
+        ancestors   = [ ]
+        parent      = self._parents[ node ]
+
+        while parent != -1:
+            ancestors.append( parent )
+            parent = self._parents[ parent ]
+
+        # Top folder first, each expand shows the next one
+        for ancestor in reversed( ancestors ):
+            self.expand( ancestor )
+
+        return self.row( node )
+
+    def __shown( self, node: int ) -> list:
+        """
+            Returns nodes of the subtree that are visible when the node is expanded
+        """
+
+        result  = [ ]
+        index   = node + 1
+        end     = node + self._sizes[ node ]
+
+        while index < end:
+            result.append( index )
+
+            # Collapsed folder hides its subtree
+            if self._folders[ index ] and not self._expanded[ index ]:
+                index += self._sizes[ index ]
+            else:
+                index += 1
+
+        return result
+
+    # endregion
+
+    # region : Build
+
+    def __add( self, name: str, depth: int, stack: list, is_folder: bool ) -> int:
+        """
+            Add node at the end. size is set when it is closed
+        """
+
+        node = len( self._names )
+
+        self._names.append( name )
+        self._depths.append( depth )
+        self._parents.append( stack[ -1 ][ 1 ] if stack else -1 )
+        self._sizes.append( 1 )
+        self._folders.append( is_folder )
+        self._expanded.append( False )
+
+        return node
+
+    def __update_build( self, added: list, removed: list ) -> None:
+        """
+            Build the tree again with the changed paths. O(n log n)
+        """
+
+        removed = set( removed )
+        paths   = [ ]
+
+        for node, path in enumerate( self.__paths( ) ):
+            # Files, and folders without children (kept as folders)
+            if self._folders[ node ] and self._sizes[ node ] > 1:
+                continue
+
+            if self._folders[ node ]:
+                path += TREE_SEPARATOR
+
+            if not path in removed:
+                paths.append( path )
+
+        self.build( paths + list( added ), self.expanded( ) )
+
+    def __locate( self, parent: int, name: str, is_folder: bool ) -> tuple:
+        """
+            Returns ( child node or None, position it is or would be inserted at )
+        """
+
+        key     = ( not is_folder, name )
+        index   = parent + 1
+        end     = len( self._names ) if parent == -1 else parent + self._sizes[ parent ]
+
+        # Children are sorted, each is skipped with its subtree
+        while index < end:
+            child_key = ( not self._folders[ index ], self._names[ index ] )
+
+            if child_key == key:
+                return index, index
+
+            if child_key > key:
+                break
+
+            index += self._sizes[ index ]
+
+        return None, index
+
+    def __insert( self, path: str ) -> None:
+        """
+            Insert a path and its missing folders
+        """
+
+        parts   = [ part for part in path.split( TREE_SEPARATOR ) if part ]
+        parent  = -1
+
+        for depth, part in enumerate( parts ):
+            is_folder       = depth < len( parts ) - 1 or path.endswith( TREE_SEPARATOR )
+            node, position  = self.__locate( parent, part, is_folder )
+
+            if node is None:
+                node = self.__insert_node( position, part, depth, parent, is_folder )
+
+            parent = node
+
+    def __insert_node( self, position: int, name: str, depth: int, parent: int, is_folder: bool ) -> int:
+
+        # Nodes after the position move by one
+        self._parents = [ index + 1 if index >= position else index for index in self._parents ]
+
+        self._names.insert( position, name )
+        self._depths.insert( position, depth )
+        self._parents.insert( position, parent )
+        self._sizes.insert( position, 1 )
+        self._folders.insert( position, is_folder )
+        self._expanded.insert( position, False )
+
+        while parent != -1:
+            self._sizes[ parent ] += 1
+            parent = self._parents[ parent ]
+
+        return position
+
+    def __remove( self, path: str ) -> None:
+        """
+            Remove a path, and the folders it leaves empty
+        """
+
+        parts   = [ part for part in path.split( TREE_SEPARATOR ) if part ]
+        node    = -1
+
+        for depth, part in enumerate( parts ):
+            node, _ = self.__locate( node, part, depth < len( parts ) - 1 or path.endswith( TREE_SEPARATOR ) )
+
+            if node is None:
+                return
+
+        # Only child of its folder, the folder goes too
+        while self._parents[ node ] != -1 and self._sizes[ self._parents[ node ] ] == self._sizes[ node ] + 1:
+            node = self._parents[ node ]
+
+        count   = self._sizes[ node ]
+        parent  = self._parents[ node ]
+
+        while parent != -1:
+            self._sizes[ parent ] -= count
+            parent = self._parents[ parent ]
+
+        for column in ( self._names, self._depths, self._parents, self._sizes, self._folders, self._expanded ):
+            del column[ node:node + count ]
+
+        self._parents = [ index - count if index >= node else index for index in self._parents ]
+
+    def __paths( self ) -> list:
+        """
+            Returns paths of all nodes. parents come before children, so O(n)
+        """
+
+        paths = [ ]
+
+        for node, name in enumerate( self._names ):
+            parent = self._parents[ node ]
+            paths.append( parent == -1 and name or paths[ parent ] + TREE_SEPARATOR + name )
+
+        return paths
+
+    def __close( self, node: int ) -> None:
+
+        self._sizes[ node ] = len( self._names ) - node
+
+    def __rebuild( self ) -> None:
+        """
+            Visible flags of all nodes. O(n)
+        """
+
+        self._flags = [ 0 ] * len( self._names )
+
+        index = 0
+
+        # Top level nodes are visible, then what expanded folders show
+        while index < len( self._names ):
+            self._flags[ index ] = 1
+
+            for shown in self._expanded[ index ] and self.__shown( index ) or [ ]:
+                self._flags[ shown ] = 1
+
+            index += self._sizes[ index ]
+
+        self._visible = c_fenwick_tree( self._flags )
+
+    # endregion
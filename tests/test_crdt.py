@@ -0,0 +1,27 @@
+# Tests CRDT .py
+
+from sdk.crdt import c_sequence
+
+
+def test_insert_into_empty_sequence( ):
+    """
+        First insert of an empty sequence has no block to follow
+    """
+
+    sequence = c_sequence( 1, "" )
+    sequence.insert( 0, "a" )
+
+    assert sequence.get( ) == "a"
+
+
+def test_apply_into_empty_sequence( ):
+    """
+        Replica of an empty document receives the first insert
+    """
+
+    local   = c_sequence( 1, "" )
+    remote  = c_sequence( 2, "" )
+
+    remote.apply( [ local.insert( 0, "hello" ) ] )
+
+    assert remote.get( ) == "hello"
@@ -0,0 +1,68 @@
+# Tests History .py
+
+from sdk.document   import c_document
+from sdk.crdt       import c_replica
+from sdk.history    import c_history
+
+
+def test_shared_undo_after_undone_delete( ):
+    """
+        Text restored by undo gets new ids, undo of the older insert must still remove it
+    """
+
+    document    = c_document( "a" )
+    replica     = c_replica( document, 1 )
+    history     = c_history( document, replica )
+
+    document.insert( 0, "bb\n" )
+    history.break_group( )
+    document.delete( 1, 3 )
+
+    history.undo( )
+    assert document.get( ) == "bb\na"
+
+    history.undo( )
+    assert document.get( ) == "a"
+
+
+def test_shared_undo_typing_after_backspace( ):
+    """
+        Backspace is undone first, then the typed text with the restored char
+    """
+
+    document    = c_document( "" )
+    replica     = c_replica( document, 1 )
+    history     = c_history( document, replica )
+
+    document.insert( 0, "x" )
+    document.insert( 1, "y" )
+    history.break_group( )
+    document.delete( 1, 1 )
+
+    history.undo( )
+    history.undo( )
+    assert document.get( ) == ""
+
+    history.redo( )
+    history.redo( )
+    assert document.get( ) == "x"
+
+    history.undo( )
+    history.undo( )
+    assert document.get( ) == ""
+
+
+def test_shared_undo_forward_delete_run( ):
+    """
+        Chars deleted one after another go back to their own places
+    """
+
+    document    = c_document( "abcde" )
+    replica     = c_replica( document, 1 )
+    history     = c_history( document, replica )
+
+    document.delete( 2, 1 )
+    document.delete( 2, 1 )
+
+    history.undo( )
+    assert document.get( ) == "abcde"
@@ -0,0 +1,369 @@
+# User Interface Layout .py
+
+from sdk.vector                 import vector
+
+LAYOUT_VERTICAL:    int = 0     # Children placed top to bottom
+LAYOUT_HORIZONTAL:  int = 1     # Children placed left to right
+
+ALIGN_START:        int = 0     # Cross axis alignment
+ALIGN_CENTER:       int = 1
+ALIGN_END:          int = 2
+ALIGN_STRETCH:      int = 3
+
+
+class c_layout_node:
+    """
+        Layout node base class.
+
+        Layout is done in 2 passes :
+        - measure   : each node returns the size it wants (cached until invalidated)
+        - arrange   : parent gives each child a rect, children place their content
+
+        Changing a node only invalidates it and its parents,
+        so other subtrees keep their cached results.
+    """
+
+    _parent:            any     # Parent layout node (None for root)
+    _flex:              float   # Share of the free main axis space
+
+    _measured:          vector  # Cached measure result
+    _position:          vector  # Last arranged position
+    _size:              vector  # Last arranged size
+
+    _needs_measure:     bool    # Measure result is not valid
+    _needs_arrange:     bool    # Content must be arranged again even if rect is the same
+
+    def __init__( self, flex: float = 0 ):
+        """
+            Constructor for layout node
+        """
+
+        self._parent        = None
+        self._flex          = flex
+
+        self._measured      = vector( )
+        self._position      = None
+        self._size          = None
+
+        self._needs_measure = True
+        self._needs_arrange = True
+
+    def invalidate( self ) -> None:
+        """
+            Mark this node and its parents to measure again.
+            call when something that changes the node size is changed (text, font, width...)
+        """
+
+        node = self
+
+        # Only the path to the root is touched (tree depth)
+        while node is not None:
+            node._needs_measure = True
+            node._needs_arrange = True
+
+            node = node._parent
+
+    def measure( self ) -> vector:
+        """
+            Returns wanted size of the node
+        """
+
+        if self._needs_measure:
+            self._measured      = self._measure( )
+            self._needs_measure = False
+
+        return self._measured
+
+    def arrange( self, position: vector, size: vector ) -> None:
+        """
+            Place the node in specific rect
+        """
+
+        if not self._needs_arrange and self._position == position and self._size == size:
+            return
+
+        self._position      = position.copy( )
+        self._size          = size.copy( )
+        self._needs_arrange = False
+
+        self._arrange( )
+
+    def flex( self, new_value: float = None ) -> float | None:
+        """
+            Returns / Sets node share of the free space in its parent
+        """
+
+        if new_value is None:
+            return self._flex
+
+        self._flex = new_value
+
+        if self._parent is not None:
+            self._parent.invalidate( )
+
+    def position( self ) -> vector:
+        """
+            Returns last arranged position
+        """
+
+        return self._position
+
+    def size( self ) -> vector:
+        """
+            Returns last arranged size
+        """
+
+        return self._size
+
+    def _measure( self ) -> vector:
+        """
+            Override. calculate wanted size
+        """
+
+        return vector( )
+
+    def _arrange( self ) -> None:
+        """
+            Override. place content inside self._position, self._size
+        """
+
+        pass
+
+
+class c_layout_item( c_layout_node ):
+    """
+        Layout leaf that places a single widget.
+
+        widget must have .position( vector ). size is taken from
+        the widget .size( ) unless a fixed size is given
+    """
+
+    _widget:    any     # Placed widget
+    _fixed:     vector  # Fixed size (None to use widget size)
+
+    def __init__( self, widget: any, size: vector = None, flex: float = 0 ):
+        """
+            Constructor for layout item
+        """
+
+        super( ).__init__( flex )
+
+        self._widget    = widget
+        self._fixed     = size is not None and size.copy( ) or None
+
+        # Let the widget invalidate us once its size changes
+        if hasattr( widget, "layout" ):
+            widget.layout( self )
+
+    def widget( self ) -> any:
+        """
+            Returns placed widget
+        """
+
+        return self._widget
+
+    def _measure( self ) -> vector:
+
+        if self._fixed is not None:
+            return self._fixed.copy( )
+
+        return self._widget.size( )
+
+    def _arrange( self ) -> None:
+
+        self._widget.position( self._position )
+
+
+class c_stack( c_layout_node ):
+    """
+        Stack container.
+
+        Places children one after another on the main axis,
+        children with flex share the space that is left.
+    """
+
+    _children:      list    # Child nodes
+    _direction:     int     # LAYOUT_VERTICAL / LAYOUT_HORIZONTAL
+    _spacing:       float   # Space between children
+    _padding:       float   # Space around children
+    _align:         int     # Cross axis alignment
+
+    def __init__( self, direction: int = LAYOUT_VERTICAL, spacing: float = 0, padding: float = 0, align: int = ALIGN_START, flex: float = 0 ):
+        """
+            Constructor for stack container
+        """
+
+        super( ).__init__( flex )
+
+        self._children  = [ ]
+        self._direction = direction
+        self._spacing   = spacing
+        self._padding   = padding
+        self._align     = align
+
+    def add( self, node: c_layout_node ) -> c_layout_node:
+        """
+            Add child node and returns it
+        """
+
+        node._parent = self
+        self._children.append( node )
+
+        self.invalidate( )
+
+        return node
+
+    def remove( self, node: c_layout_node ) -> None:
+        """
+            Remove child node
+        """
+
+        if not node in self._children:
+            return
+
+        self._children.remove( node )
+        node._parent = None
+
+        self.invalidate( )
+
+    def children( self ) -> list:
+        """
+            Returns child nodes
+        """
+
+        return self._children
+
+    def _measure( self ) -> vector:
+
+        main    = 0
+        cross   = 0
+
+        for child in self._children:
+            size = child.measure( )
+
+            main_size, cross_size = self.__split( size )
+
+            main    += main_size
+            cross   = max( cross, cross_size )
+
+        if len( self._children ) > 1:
+            main += self._spacing * ( len( self._children ) - 1 )
+
+        return self.__join( main + self._padding * 2, cross + self._padding * 2 )
+
+    def _arrange( self ) -> None:
+
+        main_space, cross_space = self.__split( self._size )
+        main_space  -= self._padding * 2
+        cross_space -= self._padding * 2
+
+        # Find how much space flex children can share
+        used        = 0
+        total_flex  = 0
+
+        for child in self._children:
+            used        += self.__split( child.measure( ) )[ 0 ]
+            total_flex  += child._flex
+
+        if len( self._children ) > 1:
+            used += self._spacing * ( len( self._children ) - 1 )
+
+        free        = max( main_space - used, 0 )
+        main_offset = self._padding
+
+        for child in self._children:
+            main_size, cross_size = self.__split( child.measure( ) )
+
+            if total_flex > 0 and child._flex > 0:
+                main_size += free * child._flex / total_flex
+
+            cross_offset = self._padding
+
+            if self._align == ALIGN_STRETCH:
+                cross_size = cross_space
+
+            elif self._align == ALIGN_CENTER:
+                cross_offset += ( cross_space - cross_size ) / 2
+
+            elif self._align == ALIGN_END:
+                cross_offset += cross_space - cross_size
+
+            child.arrange(
+                self._position + self.__join( main_offset, cross_offset ),
+                self.__join( main_size, cross_size )
+            )
+
+            main_offset += main_size + self._spacing
+
+    def __split( self, size: vector ) -> tuple:
+        """
+            Returns ( main axis, cross axis ) of a size
+        """
+
+        if self._direction == LAYOUT_VERTICAL:
+            return size.y, size.x
+
+        return size.x, size.y
+
+    def __join( self, main: float, cross: float ) -> vector:
+        """
+            Returns vector from ( main axis, cross axis )
+        """
+
+        if self._direction == LAYOUT_VERTICAL:
+            return vector( cross, main )
+
+        return vector( main, cross )
+
+
+class c_layout:
+    """
+        Layout root attached to a scene.
+
+        Keeps the available rect (usually window size) and
+        updates the tree only when something was invalidated.
+    """
+
+    _root:      c_layout_node   # Root node
+    _position:  vector          # Available rect position
+    _size:      vector          # Available rect size
+
+    def __init__( self, root: c_layout_node, position: vector = None, size: vector = None ):
+        """
+            Constructor for layout root
+        """
+
+        self._root      = root
+        self._position  = position is not None and position.copy( ) or vector( )
+        self._size      = size is not None and size.copy( ) or vector( )
+
+    def root( self ) -> c_layout_node:
+        """
+            Returns root node
+        """
+
+        return self._root
+
+    def available( self, position: vector = None, size: vector = None ) -> None:
+        """
+            Sets available rect for the layout (for example on window resize)
+        """
+
+        if position is not None:
+            self._position = position.copy( )
+
+        if size is not None:
+            self._size = size.copy( )
+
+    def update( self ) -> None:
+        """
+            Measure and arrange what changed. called each frame
+        """
+
+        # Nothing changed. Only attribute checks here
+        root = self._root
+        if not root._needs_arrange and root._position == self._position and root._size == self._size:
+            return
+
+        root.measure( )
+        root.arrange( self._position, self._size )
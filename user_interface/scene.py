@@ -1,261 +1,598 @@
-# User Interface Scenes .py
-
-import OpenGL.GL as gl
-import glfw
-import imgui
-
-from imgui.integrations.glfw    import GlfwRenderer
-
-from sdk.color                  import color
-from sdk.vector                 import vector
-from sdk.math_operations        import math
-from sdk.safe                   import safe_call
-from sdk.image                  import c_image
-from sdk.event                  import c_event
-
-from user_interface.render      import c_render
-from user_interface.animation   import c_animations
-
-SCENE_ANIMATION_SPEED: int = 10
-
-
-class c_scene:
-
-    _parent:        any     # c_ui instance
-    _index:         int     # Current scene index in queue
-
-    _show:          bool    # Should render this scene
-    _events:        dict    # Current scene events
-    _ui:            list    # Current scene ui items
-
-    _render:        c_render        # Render handle
-    _animations:    c_animations    # Animations handle
-
-    def __init__( self, parent: any ):
-        
-        # Set parent. MUST HAVE
-        self._parent    = parent
-
-        # Draw information
-        self._index     = -1
-        self._show      = False
-
-        # Create dict to save ui elements
-        self._ui        = [ ]
-
-        self.__initialize_draw( )
-        self.__initialize_events( )
-
-    # region : Draw
-
-    def __initialize_draw( self ) -> None:
-        """
-            Set up default draw settings
-        """
-
-        self._render        = c_render( )
-        self._animations    = c_animations( )
-
-        # Cache simple animations data
-        self._animations.prepare( "Fade", 0 )
-
-    def draw( self ) -> None:
-        """
-            Draw function for scene.
-            called each frame
-        """
-
-        self._render.update( )
-        self._animations.update( )
-
-        fade = self._animations.preform( "Fade", self._show and 1 or 0, SCENE_ANIMATION_SPEED )
-
-        event: c_event = self._events[ "draw" ]
-        event + ( "scene", self )
-        event.invoke( )
-
-        for item in self._ui:
-            item.draw( fade )
-
-    # endregion
-
-    # region : Events
-
-    def __initialize_events( self ) -> None:
-        """
-            Set up current scene events
-        """
-
-        self._events = { }
-
-        self._events[ "draw" ] = c_event( )
-
-        self._events[ "keyboard_input" ]    = c_event( )
-        self._events[ "char_input" ]        = c_event( )
-        self._events[ "mouse_position" ]    = c_event( )
-        self._events[ "mouse_input" ]       = c_event( )
-        self._events[ "mouse_scroll" ]      = c_event( )
-
-    def event_keyboard_input( self, window, key, scancode, action, mods ) -> None:
-        """
-            Keyboard input callback.
-
-            receives :  window ptr  - GLFW Window
-                        key         - GLFW Key
-                        scancode    - GLFW Scan code
-                        action      - GLFW Action
-                        mods        - To be honest I have no idea what is this for
-        """
-
-        event: c_event = self._events[ "keyboard_input" ]
-
-        event + ( "window",      window )
-        event + ( "key",         key )
-        event + ( "scancode",    scancode )
-        event + ( "action",      action )
-        event + ( "mods",        mods )
-
-        event.invoke( )
-
-    def event_char_input( self, window, char ) -> None:
-        """
-            Char input callback.
-
-            receives :  window ptr  - GLFW Window
-                        char        - char code
-        """
-
-        event: c_event = self._events[ "char_input" ]
-
-        event + ( "window",      window )
-        event + ( "char",        char )
-
-        event.invoke( )
-
-    def event_mouse_position( self, window, x, y ) -> None:
-        """
-            Mouse position change callback
-
-            receives :  window ptr  - GLFW Window
-                        x           - x-axis of mouse position
-                        y           - y-axis of mouse position
-        """
-
-        event: c_event = self._events[ "mouse_position" ]
-
-        event + ( "window",      window )
-        event + ( "x",           x )
-        event + ( "y",           y )
-
-        event.invoke( )
-
-    def event_mouse_input( self, window, button, action, mods ) -> None:
-        """
-            Mouse buttons input callback
-
-            receives :  window ptr  - GLFW Window
-                        button      - Mouse button
-                        action      - Button action
-                        mods        - no idea
-        """
-
-        event: c_event = self._events[ "mouse_input" ]
-
-        event + ( "window",      window )
-        event + ( "button",      button )
-        event + ( "action",      action )
-        event + ( "mods",        mods )
-
-        event.invoke( )
-
-    def event_mouse_scroll( self, window, x_offset, y_offset ) -> None:
-        """
-            Mouse scroll input callback
-
-            receives :  window ptr  - GLFW Window
-                        x_offset    - x-axis of mouse wheel change (?)
-                        y_offset    - y-axis of mouse wheel change (?)
-        """
-
-        event: c_event = self._events[ "mouse_scroll" ]
-
-        event + ( "window",      window )
-        event + ( "x_offset",    x_offset )
-        event + ( "y_offset",    y_offset )
-
-        event.invoke( )
-
-    def set_event( self, event_index: str, function: any, function_name: str ) -> None:
-        """
-            Register new function for specific event
-        """
-
-        if not event_index in self._events:
-            return
-        
-        event: c_event = self._events[ event_index ]
-        event.set( function, function_name, True )
- 
-    # endregion
-
-    # region : General
-
-    def attach_element( self, item: any ) -> int:
-        """
-            Attach new element to this scene
-        """
-
-        self._ui.append( item )
-        return self._ui.index( item )
-
-    def index( self, new_value: int = None ) -> int:
-        """
-            Returns / Sets the current scene index in the queue
-        """
-        if new_value is None:
-            return self._index
-        
-        self._index = new_value
-
-    def show( self, new_value: bool = None ) -> bool:
-        """
-            Return / Sets if the scene should show
-        """
-
-        if new_value is None:
-            return self._show
-        
-        self._show = new_value
-
-    def parent( self ) -> any:
-        """
-            Returns current scene parent
-        """
-
-        return self._parent
-    
-    def render( self ) -> c_render:
-        """
-            Returns current scene render object
-        """
-
-        return self._render
-    
-    def animations( self ) -> c_animations:
-        """
-            Returns current scene animations handler
-        """
-
-        return self._animations
-    
-    def element( self, index: int ) -> any:
-        """
-            Returns specific element attached to this scene
-        """
-
-        if index in self._ui:
-            return self._ui[ index ]
-        
-        return None
-
-    # endregion
+# User Interface Scenes .py
+
+import time
+
+from sdk.vector                 import vector
+from sdk.image                  import c_image
+from sdk.event                  import c_event
+
+from user_interface.render      import c_render
+from user_interface.animation   import c_animations
+from user_interface.layout      import c_layout, c_layout_node
+
+SCENE_ANIMATION_SPEED: int = 10
+
+# Scene visibility states
+SCENE_HIDDEN:   int = 0     # Fully faded out. not drawn at all
+SCENE_VISIBLE:  int = 1     # Shown or fading in
+SCENE_HIDING:   int = 2     # Fading out, drawn until fade reaches 0
+
+SCENE_IDLE_RELEASE: float = 30  # Seconds a hidden scene stays built before it is released
+
+# Element handles are ( generation << HANDLE_SHIFT ) | slot
+HANDLE_SHIFT:   int = 32
+HANDLE_MASK:    int = ( 1 << HANDLE_SHIFT ) - 1
+
+
+class c_scene:
+
+    _parent:        any     # c_ui instance
+    _index:         int     # Current scene index in queue
+
+    _show:          bool    # Should render this scene
+    _state:         int     # Visibility state
+    _events:        dict    # Current scene events
+    _ui:            list    # Elements slots (None for free slot)
+    _generations:   list    # Generation of each slot, bumped on removal
+    _z_orders:      list    # Z-order of each slot
+    _sequences:     list    # Attach sequence of each slot (keeps order for same z)
+    _free:          list    # Free slots to reuse
+    _sequence:      int     # Next attach sequence
+    _draw_order:    list    # Elements sorted by ( z-order, sequence )
+    _top_z_order:   int     # Z-order of the last element in _draw_order
+    _is_sorted:     bool    # Is _draw_order up to date
+    _images:        list    # Images this scene uses directly
+
+    _render:        c_render        # Render handle
+    _animations:    c_animations    # Animations handle
+    _layout:        c_layout        # Widgets layout (can be None)
+
+    _builder:       any     # Function that creates the scene content
+    _is_built:      bool    # Is the content created
+    _idle_time:     float   # Seconds hidden before release (0 to never release)
+    _hidden_since:  float   # Time the scene finished fading out
+
+    def __init__( self, parent: any, builder: any = None ):
+        
+        # Set parent. MUST HAVE
+        self._parent    = parent
+
+        # Draw information
+        self._index     = -1
+        self._show      = False
+        self._state     = SCENE_HIDDEN
+
+        # Create slot map to save ui elements
+        self.__initialize_elements( )
+        self._images    = [ ]
+
+        # Scenes without builder are created by the user up front
+        self._builder       = builder
+        self._is_built      = builder is None
+        self._idle_time     = SCENE_IDLE_RELEASE
+        self._hidden_since  = time.time( )
+
+        self.__initialize_draw( )
+        self.__initialize_events( )
+
+    # region : Draw
+
+    def __initialize_draw( self ) -> None:
+        """
+            Set up default draw settings
+        """
+
+        self._render        = c_render( )
+        self._animations    = c_animations( )
+        self._layout        = None
+
+        # Cache simple animations data
+        self._animations.prepare( "Fade", 0 )
+
+    def draw( self ) -> None:
+        """
+            Draw function for scene.
+            called each frame
+        """
+
+        self._render.update( )
+        self._animations.update( )
+
+        fade = self._animations.preform( "Fade", self._show and 1 or 0, SCENE_ANIMATION_SPEED )
+
+        # Done fading out, from now on this scene is skipped until shown again
+        if self._state == SCENE_HIDING and fade == 0:
+            self._state         = SCENE_HIDDEN
+            self._hidden_since  = time.time( )
+            return
+
+        event: c_event = self._events[ "draw" ]
+        event + ( "scene", self )
+        event.invoke( )
+
+        # Only invalidated layout nodes are measured / arranged again
+        if self._layout is not None:
+            self._layout.update( )
+
+        if not self._is_sorted:
+            self.__sort_elements( )
+
+        for item in self._draw_order:
+            item.draw( fade )
+
+    # endregion
+
+    # region : Events
+
+    def __initialize_events( self ) -> None:
+        """
+            Set up current scene events
+        """
+
+        self._events = { }
+
+        self._events[ "draw" ] = c_event( )
+
+        self._events[ "keyboard_input" ]    = c_event( )
+        self._events[ "char_input" ]        = c_event( )
+        self._events[ "mouse_position" ]    = c_event( )
+        self._events[ "mouse_input" ]       = c_event( )
+        self._events[ "mouse_scroll" ]      = c_event( )
+        self._events[ "window_resize" ]     = c_event( )
+
+    def event_keyboard_input( self, window, key, scancode, action, mods ) -> None:
+        """
+            Keyboard input callback.
+
+            receives :  window ptr  - GLFW Window
+                        key         - GLFW Key
+                        scancode    - GLFW Scan code
+                        action      - GLFW Action
+                        mods        - To be honest I have no idea what is this for
+        """
+
+        event: c_event = self._events[ "keyboard_input" ]
+
+        event + ( "window",      window )
+        event + ( "key",         key )
+        event + ( "scancode",    scancode )
+        event + ( "action",      action )
+        event + ( "mods",        mods )
+
+        event.invoke( )
+
+    def event_char_input( self, window, char ) -> None:
+        """
+            Char input callback.
+
+            receives :  window ptr  - GLFW Window
+                        char        - char code
+        """
+
+        event: c_event = self._events[ "char_input" ]
+
+        event + ( "window",      window )
+        event + ( "char",        char )
+
+        event.invoke( )
+
+    def event_mouse_position( self, window, x, y ) -> None:
+        """
+            Mouse position change callback
+
+            receives :  window ptr  - GLFW Window
+                        x           - x-axis of mouse position
+                        y           - y-axis of mouse position
+        """
+
+        event: c_event = self._events[ "mouse_position" ]
+
+        event + ( "window",      window )
+        event + ( "x",           x )
+        event + ( "y",           y )
+
+        event.invoke( )
+
+    def event_mouse_input( self, window, button, action, mods ) -> None:
+        """
+            Mouse buttons input callback
+
+            receives :  window ptr  - GLFW Window
+                        button      - Mouse button
+                        action      - Button action
+                        mods        - no idea
+        """
+
+        event: c_event = self._events[ "mouse_input" ]
+
+        event + ( "window",      window )
+        event + ( "button",      button )
+        event + ( "action",      action )
+        event + ( "mods",        mods )
+
+        event.invoke( )
+
+    def event_mouse_scroll( self, window, x_offset, y_offset ) -> None:
+        """
+            Mouse scroll input callback
+
+            receives :  window ptr  - GLFW Window
+                        x_offset    - x-axis of mouse wheel change (?)
+                        y_offset    - y-axis of mouse wheel change (?)
+        """
+
+        event: c_event = self._events[ "mouse_scroll" ]
+
+        event + ( "window",      window )
+        event + ( "x_offset",    x_offset )
+        event + ( "y_offset",    y_offset )
+
+        event.invoke( )
+
+    def event_window_resize( self, window, width, height ) -> None:
+        """
+            Window resize callback
+
+            receives :  window ptr  - GLFW Window
+                        width       - new width of window
+                        height      - new height of window
+        """
+
+        # Layout root is invalidated only if the size really changed
+        if self._layout is not None:
+            self._layout.available( size=vector( width, height ) )
+
+        event: c_event = self._events[ "window_resize" ]
+
+        event + ( "window",      window )
+        event + ( "width",       width )
+        event + ( "height",      height )
+
+        event.invoke( )
+
+    def set_event( self, event_index: str, function: any, function_name: str ) -> None:
+        """
+            Register new function for specific event
+        """
+
+        if not event_index in self._events:
+            return
+        
+        event: c_event = self._events[ event_index ]
+        event.set( function, function_name, True )
+
+    def unset_event( self, event_index: str, function_name: str ) -> None:
+        """
+            Remove function from specific event
+        """
+
+        if not event_index in self._events:
+            return
+
+        event: c_event = self._events[ event_index ]
+        event.unset( function_name )
+ 
+    # endregion
+
+    # region : Life time
+
+    def builder( self, function: any = None ) -> any:
+        """
+            Returns / Sets the function that creates this scene content.
+
+            function receives the scene and is called the first time the scene is shown,
+            and again after the scene was released.
+            warning ! create fonts before .run(), not inside the builder
+        """
+
+        if function is None:
+            return self._builder
+
+        self._builder = function
+
+        # Drop content created without the builder, it will be created on demand
+        if self._is_built:
+            self.release( )
+
+    def idle_time( self, new_value: float = None ) -> float | None:
+        """
+            Returns / Sets how many seconds a hidden scene keeps its content.
+            0 means never release
+        """
+
+        if new_value is None:
+            return self._idle_time
+
+        self._idle_time = new_value
+
+    def is_built( self ) -> bool:
+        """
+            Returns if the scene content is created
+        """
+
+        return self._is_built
+
+    def build( self ) -> None:
+        """
+            Create the scene content using the builder
+        """
+
+        if self._is_built or self._builder is None:
+            return
+
+        self._is_built = True
+        self._builder( self )
+
+    def release( self ) -> None:
+        """
+            Release the scene widgets, images and caches.
+            scene will be built again next time it is shown
+        """
+
+        if self._builder is None:
+            return
+
+        for item in self._ui:
+            if item is not None:
+                item.release( )
+
+        self.__initialize_elements( )
+        self.release_images( )
+
+        self._layout = None
+
+        # Only fade state is kept
+        fade = self._animations.value( "Fade" )
+
+        self._animations = c_animations( )
+        self._animations.prepare( "Fade", fade )
+
+        self._is_built = False
+
+    def release_if_idle( self, now: float ) -> None:
+        """
+            Release the scene if it was hidden long enough
+        """
+
+        if not self._is_built or self._builder is None or self._idle_time <= 0:
+            return
+
+        if self._state != SCENE_HIDDEN:
+            return
+
+        if now - self._hidden_since >= self._idle_time:
+            self.release( )
+
+    # endregion
+
+    # region : General
+
+    def retain_image( self, img: c_image ) -> c_image:
+        """
+            Register this scene as user of an image.
+            use for images rendered directly in scene draw events
+        """
+
+        img.retain( )
+        self._images.append( img )
+
+        return img
+
+    def release_images( self ) -> None:
+        """
+            Release all images retained by this scene
+        """
+
+        for img in self._images:
+            img.release( )
+
+        self._images.clear( )
+
+    def index( self, new_value: int = None ) -> int:
+        """
+            Returns / Sets the current scene index in the queue
+        """
+        if new_value is None:
+            return self._index
+        
+        self._index = new_value
+
+    def show( self, new_value: bool = None ) -> bool:
+        """
+            Return / Sets if the scene should show
+        """
+
+        if new_value is None:
+            return self._show
+        
+        self._show = new_value
+
+        if new_value:
+            self._state = SCENE_VISIBLE
+
+            # First time shown / shown after release
+            if not self._is_built:
+                self.build( )
+
+        elif self._state == SCENE_VISIBLE:
+            self._state = SCENE_HIDING
+
+    def is_visible( self ) -> bool:
+        """
+            Returns if the scene should be drawn this frame
+        """
+
+        return self._state != SCENE_HIDDEN
+
+    def parent( self ) -> any:
+        """
+            Returns current scene parent
+        """
+
+        return self._parent
+    
+    def render( self ) -> c_render:
+        """
+            Returns current scene render object
+        """
+
+        return self._render
+    
+    def animations( self ) -> c_animations:
+        """
+            Returns current scene animations handler
+        """
+
+        return self._animations
+
+    def layout( self, root: c_layout_node = None ) -> c_layout | None:
+        """
+            Returns / Sets the layout that places this scene widgets.
+            root node gets the whole window area
+        """
+
+        if root is None:
+            return self._layout
+
+        self._layout = c_layout( root, vector( ), self._parent.get_window_size( ) )
+    
+    # endregion
+
+    # region : Elements
+
+    def __initialize_elements( self ) -> None:
+        """
+            Set up empty elements slot map
+        """
+
+        self._ui            = [ ]
+        self._generations   = [ ]
+        self._z_orders      = [ ]
+        self._sequences     = [ ]
+        self._free          = [ ]
+        self._sequence      = 0
+
+        self._draw_order    = [ ]
+        self._top_z_order   = 0
+        self._is_sorted     = True
+
+    def attach_element( self, item: any, z_order: int = 0 ) -> int:
+        """
+            Attach new element to this scene and returns its handle.
+            elements with higher z-order are drawn on top
+        """
+
+        if self._free:
+            slot = self._free.pop( )
+
+            self._ui[ slot ]        = item
+            self._z_orders[ slot ]  = z_order
+            self._sequences[ slot ] = self._sequence
+
+        else:
+            slot = len( self._ui )
+
+            self._ui.append( item )
+            self._generations.append( 0 )
+            self._z_orders.append( z_order )
+            self._sequences.append( self._sequence )
+
+        self._sequence += 1
+
+        # Most elements are attached on top, no need to sort for them
+        if self._is_sorted and ( not self._draw_order or z_order >= self._top_z_order ):
+            self._draw_order.append( item )
+            self._top_z_order = z_order
+        else:
+            self._is_sorted = False
+
+        return ( self._generations[ slot ] << HANDLE_SHIFT ) | slot
+
+    def remove_element( self, handle: int ) -> bool:
+        """
+            Remove element from this scene.
+            releases its events and resources, handle becomes invalid
+        """
+
+        slot = self.__slot( handle )
+        if slot is None:
+            return False
+
+        item = self._ui[ slot ]
+
+        self._ui[ slot ]            = None
+        self._generations[ slot ]   += 1
+        self._free.append( slot )
+
+        self._is_sorted = False
+
+        item.release( )
+
+        return True
+
+    def element( self, handle: int ) -> any:
+        """
+            Returns specific element attached to this scene
+        """
+
+        slot = self.__slot( handle )
+        if slot is None:
+            return None
+        
+        return self._ui[ slot ]
+
+    def z_order( self, handle: int, new_value: int = None ) -> int | None:
+        """
+            Returns / Sets element z-order
+        """
+
+        slot = self.__slot( handle )
+        if slot is None:
+            return None
+
+        if new_value is None:
+            return self._z_orders[ slot ]
+
+        if self._z_orders[ slot ] != new_value:
+            self._z_orders[ slot ] = new_value
+            self._is_sorted = False
+
+    def elements( self ) -> list:
+        """
+            Returns attached elements in draw order
+        """
+
+        if not self._is_sorted:
+            self.__sort_elements( )
+
+        return list( self._draw_order )
+
+    def __slot( self, handle: int ) -> int | None:
+        """
+            Returns slot of handle if the handle is still valid
+        """
+
+        if handle is None or handle < 0:
+            return None
+
+        slot        = handle & HANDLE_MASK
+        generation  = handle >> HANDLE_SHIFT
+
+        if slot >= len( self._ui ) or self._generations[ slot ] != generation:
+            return None
+
+        return slot
+
+    def __sort_elements( self ) -> None:
+        """
+            Rebuild draw order. called only after removal / z-order change
+        """
+
+        slots = [ slot for slot in range( len( self._ui ) ) if self._ui[ slot ] is not None ]
+        slots.sort( key=lambda slot: ( self._z_orders[ slot ], self._sequences[ slot ] ) )
+
+        self._draw_order    = [ self._ui[ slot ] for slot in slots ]
+        self._top_z_order   = slots and self._z_orders[ slots[ -1 ] ] or 0
+        self._is_sorted     = True
+
+    # endregion
@@ -1,791 +1,2519 @@
-# User Interface Widgets .py
-
-import OpenGL.GL as gl
-import glfw
-import imgui
-import time
-
-from sdk.color                  import color
-from sdk.vector                 import vector
-from sdk.math_operations        import math
-from sdk.safe                   import safe_call
-from sdk.image                  import c_image
-from sdk.event                  import c_event
-
-from user_interface.render      import c_render
-from user_interface.animation   import c_animations
-
-
-DEFAULT_SPEED   = 10
-INVALID         = -1
-
-COLOR_BUTTON_BACK   = color( 253, 231, 236 )
-COLOR_BUTTON_ICON   = color( 156, 140, 182 )
-COLOR_INPUT_BACK    = color( 253, 231, 236 )
-COLOR_INPUT_ICON    = color( 156, 140, 182 )
-COLOR_INPUT_TEXT    = color( 156, 140, 182 )
-COLOR_INPUT_PONTER  = color( 156, 140, 182 )
-
-
-class c_icon_button:
-    """
-        Button with icon class
-    """
-
-    _parent:        any             # c_scene parent 
-    _index:         int             # button index
-
-    _position:      vector          # current button position
-    _size:          int             # current button size
-
-    _icon:          c_image         # image object
-
-    _callback:      any             # Button on press callback
-
-    _render:        c_render        # parents render instance
-    _animations:    c_animations    # current button animations handle
-    
-    # Private button data
-    _is_hovered:    bool            # Is button hovered
-
-    def __init__( self, parent: any, icon: c_image, position: vector, size: int, callback: any = None ):
-        """
-            Create new button instance
-        """
-
-        self._parent        = parent
-        self._index         = INVALID
-
-        self._position      = position.copy( )
-        self._size          = size
-
-        self._icon          = icon
-
-        self._render        = self._parent.render( )
-        self._animations    = c_animations( )
-
-        self._callback = callback
-
-        # Finish set up process
-        self.__complete_attach( )
-        self.__complete_setup( )
-
-    def __complete_attach( self ) -> None:
-        """
-            Complete attach of current button to its parent
-        """
-
-        # Attach this element instance
-        self._index = self._parent.attach_element( self )
-
-        # Attach input events 
-        self._parent.set_event( "mouse_position", self.__event_mouse_position, f"ButtonIcon::{ self._index }" )
-        self._parent.set_event( "mouse_input", self.__event_mouse_input, f"ButtonIcon::{ self._index }" )
-
-    def __complete_setup( self ) -> None:
-        """
-            Set up all the data for the button
-        """
-
-        self._is_hovered = False
-
-        self._animations.prepare( "Background", 50 )
-        self._animations.prepare( "Underline", 0 )
-
-    # region : Render
-
-    def draw( self, fade: float ) -> None:
-        """
-            Button main draw function
-        """
-
-        self.__draw_animations( )
-
-        background = self._animations.value( "Background" )
-        underline = self._animations.value( "Underline" )
-        
-        self._render.rect( self._position, self._position + self._size, COLOR_BUTTON_BACK.alpha_override(background) * fade, 10 )
-        self._render.rect( 
-            vector( self._position.x + self._size / 2 - 10, self._position.y + self._size - 6 ),
-            vector( self._position.x + self._size / 2 + 10, self._position.y + self._size - 2 ),
-
-            COLOR_BUTTON_ICON.alpha_override(underline) * fade,
-            2
-        )
-
-        self._render.image( self._icon, self._position + self._size / 2 - self._icon.size( ) / 2, COLOR_BUTTON_ICON * fade )
-
-    def __draw_animations( self ) -> None:
-        """
-            Do the animations process
-        """
-
-        self._animations.update( )
-
-        self._animations.preform( "Background", self._is_hovered and 150 or 50, DEFAULT_SPEED )
-        self._animations.preform( "Underline", self._is_hovered and 255 or 0, DEFAULT_SPEED )
-    
-    def position( self, new_position: vector = None ) -> vector | None:
-        """
-            Updates / returns current button position
-        """
-
-        if new_position is None:
-            return self._position
-        
-        self._position.x = new_position.x
-        self._position.y = new_position.y
-
-    # endregion
-
-    # region : Input 
-
-    def __event_mouse_position( self, event ) -> None:
-        """
-            Mouse Position change callback
-        """
-
-        x = event( "x" )
-        y = event( "y" )
-
-        mouse_position = vector( x, y )
-
-        self._is_hovered = mouse_position.is_in_bounds( self._position, self._size, self._size )
-
-    def __event_mouse_input( self, event ) -> None:
-        """
-            Mouse buttons input callback
-        """
-
-        if not self._is_hovered:
-            return
-        
-        button = event( "button" )
-        if not button == glfw.MOUSE_BUTTON_LEFT:
-            return
-        
-        action = event( "action" )
-        if not action == glfw.PRESS:
-            return
-        
-        if self._callback is not None:
-            self._callback( )
-
-    # endregion
-
-class c_icon_text_button:
-    """
-        Button with icon and text class
-    """
-
-    _parent:        any             # c_scene parent 
-    _index:         int             # button index
-
-    _position:      vector          # current button position
-    _size:          int             # current button size
-
-    _icon:          c_image         # image object
-    _font:          any             # Button font for text
-    _text:          str             # Button text
-
-    _callback:      any             # Button on press callback
-
-    _render:        c_render        # parents render instance
-    _animations:    c_animations    # current button animations handle
-    
-    # Private button data
-    _is_hovered:    bool            # Is button hovered
-    _text_size:     vector          # Button text size
-
-    def __init__( self, parent: any, icon: c_image, font: any, text: str, position: vector, size: int, callback: any = None ):
-        """
-            Create new button instance
-        """
-
-        self._parent        = parent
-        self._index         = INVALID
-
-        self._position      = position.copy( )
-        self._size          = size
-
-        self._icon          = icon
-        self._font          = font
-        self._text          = text
-
-        self._render        = self._parent.render( )
-        self._animations    = c_animations( )
-
-        self._callback      = callback
-
-        # Finish set up process
-        self.__complete_attach( )
-        self.__complete_setup( )
-
-    def __complete_attach( self ) -> None:
-        """
-            Complete attach of current button to its parent
-        """
-
-        # Attach this element instance
-        self._index = self._parent.attach_element( self )
-
-        # Attach input events 
-        self._parent.set_event( "mouse_position", self.__event_mouse_position, f"ButtonIcon::{ self._index }" )
-        self._parent.set_event( "mouse_input", self.__event_mouse_input, f"ButtonIcon::{ self._index }" )
-
-    def __complete_setup( self ) -> None:
-        """
-            Set up all the data for the button
-        """
-
-        self._is_hovered    = False
-        self._text_size     = vector( )
-
-        self._animations.prepare( "Background", 50 )
-        self._animations.prepare( "Underline", 0 )
-        self._animations.prepare( "Width", self._size )
-
-    # region : Render
-
-    def draw( self, fade: float ) -> None:
-        """
-            Button main draw function
-        """
-
-        self.__draw_animations( )
-
-        # Get animations values
-        background          = self._animations.value( "Background" )
-        width               = self._animations.value( "Width" )
-        underline           = self._animations.value( "Underline" )
-        
-        # 1 Time calculate vectors
-        start_position      = self._position
-        end_position        = self._position + vector(width, self._size)
-
-        self._render.rect( start_position, end_position, COLOR_BUTTON_BACK.alpha_override(background) * fade, 10 )
-
-        self._render.rect( 
-            vector( self._position.x + width / 2 - 10, self._position.y + self._size - 6 ),
-            vector( self._position.x + width / 2 + 10, self._position.y + self._size - 2 ),
-
-            COLOR_BUTTON_ICON.alpha_override(underline) * fade,
-            2
-        )
-
-        self._render.image( self._icon, self._position + self._size / 2 - self._icon.size( ) / 2, COLOR_BUTTON_ICON * fade )
-
-        self._render.push_clip_rect( start_position, end_position )
-        self._render.text( 
-            self._font, 
-            self._position + vector( 
-                self._size, 
-                self._size / 2 - self._text_size.y / 2 
-            ), 
-            COLOR_BUTTON_ICON * fade, 
-            self._text 
-        )
-        self._render.pop_clip_rect( )
-
-    def __draw_animations( self ) -> None:
-        """
-            Do the animations process
-        """
-
-        self._animations.update( )
-
-        self._text_size: vector = self._render.measure_text( self._font, self._text )
-
-        self._animations.preform( "Background", self._is_hovered and 150                                    or 50,          DEFAULT_SPEED )
-        self._animations.preform( "Width",      self._is_hovered and self._size + self._text_size.x + 12    or self._size,  DEFAULT_SPEED )
-        self._animations.preform( "Underline",  self._is_hovered and 255                                    or 0,           DEFAULT_SPEED )
-    
-    def position( self, new_position: vector = None ) -> vector | None:
-        """
-            Updates / returns current button position
-        """
-
-        if new_position is None:
-            return self._position
-        
-        self._position.x = new_position.x
-        self._position.y = new_position.y
-
-    # endregion
-
-    # region : Input 
-
-    def __event_mouse_position( self, event ) -> None:
-        """
-            Mouse Position change callback
-        """
-
-        x = event( "x" )
-        y = event( "y" )
-
-        mouse_position      = vector( x, y )
-
-        width               = self._animations.value( "Width" )
-        self._is_hovered    = mouse_position.is_in_bounds( self._position, width, self._size )
-
-    def __event_mouse_input( self, event ) -> None:
-        """
-            Mouse buttons input callback
-        """
-
-        if not self._is_hovered:
-            return
-        
-        button = event( "button" )
-        if not button == glfw.MOUSE_BUTTON_LEFT:
-            return
-        
-        action = event( "action" )
-        if not action == glfw.PRESS:
-            return
-        
-        if self._callback is not None:
-            self._callback( )
-
-    # endregion
-
-class c_text_input:
-    """
-        Single line text input class
-    """
-
-    _parent:            any
-    _index:             int
-
-    _position:          vector
-    _size:              vector  # (x. text field width, y. height)
-
-    _icon:              c_image
-    _font:              any
-    _text:              str
-    _input:             str     # Text Input value
-
-    _render:        c_render        # parents render instance
-    _animations:    c_animations    # current button animations handle
-
-    # Private button data
-    _is_hovered:        bool 
-    _is_typing:         bool
-    _is_ctrl:           bool
-    _is_password:       bool
-
-    _text_size:         vector
-    _input_size:        vector
-    _mouse_position:    vector
-    _click_delta:       int
-    _input_index:       int
-    _input_offset:      float
-
-    _time:              int
-
-    def __init__( self, parent: any, icon: c_image, font: any, text: str, position: vector, size: vector ):
-        """
-            Create new button instance
-        """
-
-        self._parent        = parent
-        self._index         = INVALID
-
-        self._position      = position.copy( )
-        self._size          = size.copy( )
-
-        self._icon          = icon
-        self._font          = font
-        self._text          = text
-        self._input         = ""
-
-        self._render        = self._parent.render( )
-        self._animations    = c_animations( )
-
-        self._time = time.time()
-
-        # Finish set up process
-        self.__complete_attach( )
-        self.__complete_setup( )
-
-    def __complete_attach( self ) -> None:
-        """
-            Complete attach of current button to its parent
-        """
-
-        # Attach this element instance
-        self._index = self._parent.attach_element( self )
-
-        # Attach events
-        self._parent.set_event( "mouse_position",   self.__event_mouse_position,    f"TextInput::{ self._index }" )
-        self._parent.set_event( "mouse_input",      self.__event_mouse_input,       f"TextInput::{ self._index }" )
-        self._parent.set_event( "char_input",       self.__event_char_input,        f"TextInput::{ self._index }" )
-        self._parent.set_event( "keyboard_input",   self.__event_keyboard_input,    f"TextInput::{ self._index }" )
-        
-    def __complete_setup( self ) -> None:
-        """
-            Set up all the data for the button
-        """
-
-        # Add the Icon box width
-        self._size.x            = self._size.x + self._size.y
-
-        self._is_hovered        = False
-        self._is_ctrl           = False
-        self._is_typing         = False
-        self._is_password       = False
-
-        self._text_size         = vector( )
-        self._input_size        = vector( )
-        self._mouse_position    = vector( )
-        self._click_delta       = INVALID
-
-        self._input_index       = 0
-        self._input_offset      = self._position.x + self._size.y + 5
-
-        self._animations.prepare( "Background", 0 )
-        self._animations.prepare( "TextAlpha",  255 )
-        self._animations.prepare( "Underline",  10 )
-        self._animations.prepare( "InputWidth", self._size.y )
-        self._animations.prepare( "PointerShow", 0 )
-
-
-    def input_type( self, is_password: bool = None ) -> bool | None:
-        """
-            Returns / Sets if the current text input should be for password
-        """
-
-        if is_password is None:
-            return self._is_password
-        
-        self._is_password = is_password
-
-    def get( self ) -> str:
-        """
-            Returns current input value
-        """
-
-        return self._input
-    
-    # region : Render
-
-    def draw( self, fade: float ) -> None:
-        """
-            Button main draw function
-        """
-
-        self.__draw_animations( )
-
-        background          = self._animations.value( "Background" )
-        background_width    = self._animations.value( "InputWidth" )
-        text_alpha          = self._animations.value( "TextAlpha" )
-        underline           = self._animations.value( "Underline" )
-        
-        self._render.rect( self._position, self._position + vector( background_width, self._size.y ), COLOR_INPUT_BACK.alpha_override(background) * fade, 10 )
-        self._render.rect( 
-            vector( self._position.x + self._size.y - 6, self._position.y + self._size.y / 2 - underline ),
-            vector( self._position.x + self._size.y - 2, self._position.y + self._size.y / 2 + underline ),
-
-            COLOR_INPUT_ICON * fade,
-            2
-        )
-
-        self._render.image( self._icon, self._position + vector(self._size.y, self._size.y) / 2 - self._icon.size( ) / 2, COLOR_INPUT_ICON * fade )
-
-        if text_alpha > 0:
-            self._render.text( 
-                self._font, 
-                vector( 
-                    self._position.x + self._size.y + 5, 
-                    self._position.y + self._size.y / 2 - self._text_size.y / 2 
-                ),
-                COLOR_INPUT_TEXT.alpha_override( text_alpha ) * fade,
-                self._text
-            )
-        
-        # Some pre made calculations
-        correct_input           = self.correct_text( self._input )
-        correct_input_by_index  = self.correct_text( self._input[ :self._input_index ] )
-        correct_size            = self._render.measure_text( self._font, correct_input )
-        correct_by_index_size   = self._render.measure_text( self._font, correct_input_by_index )
-
-        start_clip  = self._position + vector(self._size.y + 5, 0)
-        end_clip    = self._position + vector( background_width - 10, self._size.y )
-
-        self._render.push_clip_rect( start_clip, end_clip )
-
-        self.__draw_input( fade, correct_input )
-        self.__draw_index( fade, correct_input_by_index, correct_by_index_size )
-
-        self._render.pop_clip_rect( )
-
-        self.__preform_correct_offset( vector( end_clip.x, start_clip.x ), correct_by_index_size )
-        self.__preform_set_index( correct_input )
-
-    def __draw_input( self, fade: float, text: str ) -> None:
-        """
-            Draw Input text
-        """
-        
-        self._render.text( 
-            self._font, 
-            vector( self._input_offset, self._position.y + self._size.y / 2 - self._text_size.y / 2 ),
-            COLOR_INPUT_TEXT * fade,
-            text
-        )
-
-
-    def __draw_index( self, fade: float, text: str, text_size: vector ) -> None:
-        """
-            Draw the select index pointer
-        """
-        pointer_alpha = self._animations.value( "PointerShow" )
-
-        if not self._is_typing and pointer_alpha == 0:
-            return
-        
-        start_y_offset = self._position.y + self._size.y / 2 - self._text_size.y / 2
-        
-        self._render.rect( 
-            vector( self._input_offset + text_size.x, start_y_offset - 2 ),
-            vector( self._input_offset + text_size.x + 1, start_y_offset + (2 + text_size.y) * pointer_alpha ),
-            COLOR_INPUT_PONTER * fade * pointer_alpha
-        )
-
-    def __preform_correct_offset( self, end_clip: vector, text_size: vector ) -> None:
-        """
-            Preform some calculations for text offset for clip
-        """
-
-        if not self._is_typing:
-            return
-        
-        set_offset = self._input_offset + text_size.x + 1
-
-        # Move the text left / right to focus on the index to be in visible area
-        if set_offset > end_clip.x:
-            self._input_offset -= set_offset - end_clip.x
-
-        if ( set_offset - 1 ) < end_clip.y:
-            self._input_offset += end_clip.y - ( set_offset - 1 )
-
-    def __preform_set_index( self, text: str ) -> None:
-        """
-            Preform calculations on user press on text
-        """
-
-        if not self._is_typing:
-            return
-
-        if self._click_delta == INVALID:
-            return
-        
-        selected_index: int     = 0
-        input_width:    float   = 0.0
-
-        while selected_index < len( text ):
-            width = self._render.measure_text( self._font, text[ selected_index ] ).x
-
-            if input_width + ( width * 0.5 ) > self._click_delta:
-                break
-
-            input_width += width
-            selected_index += 1
-
-        self._click_delta = INVALID
-        self._input_index = selected_index
-
-    def correct_text( self , text: str ) -> str:
-        """
-            If is password is True, conver the text into password type
-        """
-
-        if self._is_password:
-            return "*" * len( text )
-        
-        return text
-
-    def __draw_animations( self ) -> None:
-        """
-            Do the animations process
-        """
-
-        self._animations.update( )
-
-        if self._is_typing:
-            self._animations.preform( "Background", 200, DEFAULT_SPEED )
-        elif self._is_hovered:
-            self._animations.preform( "Background", 100, DEFAULT_SPEED )
-        else:
-            self._animations.preform( "Background", 50, DEFAULT_SPEED )
-
-        if self._is_typing:
-            self._animations.preform( "PointerShow", 1, DEFAULT_SPEED )
-            self._animations.preform( "Underline", ( self._size.y - 6 ) / 2, DEFAULT_SPEED )
-        else:
-            self._animations.preform( "PointerShow", 0, DEFAULT_SPEED )
-            self._animations.preform( "Underline", 10, DEFAULT_SPEED )
-
-        if not self._is_typing and self._input == "":
-            self._animations.preform( "InputWidth", self._size.y + self._text_size.x + 10, DEFAULT_SPEED )
-            self._animations.preform( "TextAlpha", 200, DEFAULT_SPEED )
-        else:
-            self._animations.preform( "TextAlpha", 0, DEFAULT_SPEED )
-            self._animations.preform( "InputWidth", self._size.x, DEFAULT_SPEED )
-
-        self._text_size = self._render.measure_text( self._font, self._text )
-
-    def position( self, new_position: vector = None ) -> vector | None:
-        """
-            Updates / returns current button position
-        """
-
-        if new_position is None:
-            return self._position
-        
-        self._position.x = new_position.x
-        self._position.y = new_position.y
-
-    # endregion
-
-    # region : Input
-
-    def insert( self, text: str  ) -> None:
-        """
-            Inserts specific text into selected index
-        """
-
-        self._input = self._input[ :self._input_index ] + text + self._input[ self._input_index: ]
-        self._input_index += len( text )
-
-    def pop( self ) -> str | None:
-        """
-            Pops char from input in selected index
-        """
-
-        if self._input_index == 0:
-            return None
-        
-        char = self._input[ self._input_index - 1 ]
-
-        self._input = self._input[ :self._input_index - 1 ] + self._input[ self._input_index: ]
-        self._input_index -= 1
-
-        return char
-
-    def __event_mouse_position( self, event ) -> None:
-        """
-            Mouse Position change callback
-        """
-
-        x = event( "x" )
-        y = event( "y" )
-
-        self._mouse_position.x = x
-        self._mouse_position.y = y
-
-        self._is_hovered = self._mouse_position.is_in_bounds( self._position, self._animations.value( "InputWidth" ), self._size.y )
-
-    def __event_mouse_input( self, event ) -> None:
-        """
-            Mouse buttons input callback
-        """
-        
-        button = event( "button" )
-        action = event( "action" )
-
-        if button != glfw.MOUSE_BUTTON_LEFT or action != glfw.PRESS:
-            return
-
-        if not self._is_hovered:
-            self._is_typing = False
-            return
-        
-        if not self._is_typing:
-            self._is_typing = True
-
-        #self._click_position = self._mouse_position.copy( )
-        self._click_delta = self._mouse_position.x - self._input_offset
-
-    def __event_char_input( self, event ) -> None:
-        """
-            Captures what char was pressed
-        """
-
-        if not self._is_typing:
-            return
-        
-        char = chr( event( "char" ) )
-
-        self.insert( char )
-
-    def __event_keyboard_input( self, event ) -> None:
-        """
-            General keyboard input handle
-        """
-
-        if not self._is_typing:
-            return
-        
-        key         = event( "key" )
-        action      = event( "action" ) 
-
-        self.__ctrl_handle( key, action )
-
-        if action == glfw.PRESS:
-            self.__repeat_handle( key )
-
-            self.__paste_handle( key )
-
-            if key == glfw.KEY_ENTER:
-                self._is_typing = False
-
-        if action == glfw.REPEAT:
-            self.__repeat_handle( key )
-
-
-    def __ctrl_handle( self, key, action ):
-        """
-            Exception capture for Ctrl key input
-        """
-
-        if key != glfw.KEY_LEFT_CONTROL and key != glfw.KEY_RIGHT_CONTROL:
-            return
-
-        if action == glfw.PRESS:
-            self._is_ctrl = True
-
-        if action == glfw.RELEASE:
-            self._is_ctrl = False
-
-    def __repeat_handle( self, key ):
-        """
-            Executable input handle for PRESS and REPEAT calls
-        """
-
-        # Remove
-        if key == glfw.KEY_BACKSPACE:
-            self.pop( )
-
-        # Move index left
-        if key == glfw.KEY_LEFT and self._input_index > 0:
-            self._input_index -= 1
-
-        # Move index right
-        if key == glfw.KEY_RIGHT and self._input_index < len( self._input ):
-            self._input_index += 1
-
-    def __paste_handle( self, key ):
-
-        if not self._is_ctrl:
-            return
-
-        if key != glfw.KEY_V:
-            return
-
-        result: bytes = glfw.get_clipboard_string( None )
-        result: str = result.decode( )
-
-        self.insert(result)
-
-    # endregion
+# User Interface Widgets .py
+
+import glfw
+import time
+import bisect
+
+from sdk.color                  import color
+from sdk.vector                 import vector
+from sdk.image                  import c_image
+from sdk.gap_buffer             import c_gap_buffer
+from sdk.document               import c_document
+from sdk.mapped_file            import open_document
+from sdk.fenwick                import c_line_heights
+from sdk.history                import c_history
+from sdk.tree                   import c_tree_model
+from sdk.tokenizer              import c_tokenizer, TOKEN_KEYWORD, TOKEN_BUILTIN, TOKEN_FUNCTION, TOKEN_STRING, TOKEN_NUMBER, TOKEN_COMMENT, TOKEN_OPERATOR
+
+from user_interface.render      import c_render
+from user_interface.animation   import c_animations
+
+
+DEFAULT_SPEED   = 10
+INVALID         = -1
+
+COLOR_BUTTON_BACK   = color( 253, 231, 236 )
+COLOR_BUTTON_ICON   = color( 156, 140, 182 )
+COLOR_INPUT_BACK    = color( 253, 231, 236 )
+COLOR_INPUT_ICON    = color( 156, 140, 182 )
+COLOR_INPUT_TEXT    = color( 156, 140, 182 )
+COLOR_INPUT_PONTER  = color( 156, 140, 182 )
+
+COLOR_EDITOR_BACK           = color( 253, 231, 236 )
+COLOR_EDITOR_TEXT           = color( 110, 96, 138 )
+COLOR_EDITOR_LINE_NUMBER    = color( 156, 140, 182, 150 )
+COLOR_EDITOR_CARET          = color( 156, 140, 182 )
+COLOR_EDITOR_MATCH          = color( 210, 130, 70, 80 )
+
+# Token colors of highlighted text, not listed tokens use COLOR_EDITOR_TEXT
+COLOR_EDITOR_TOKENS         = {
+    TOKEN_KEYWORD:  color( 196, 96, 150 ),
+    TOKEN_BUILTIN:  color( 92, 132, 196 ),
+    TOKEN_FUNCTION: color( 70, 150, 170 ),
+    TOKEN_STRING:   color( 110, 160, 90 ),
+    TOKEN_NUMBER:   color( 210, 130, 70 ),
+    TOKEN_COMMENT:  color( 156, 140, 182, 170 ),
+    TOKEN_OPERATOR: color( 140, 110, 160 )
+}
+
+# Colors of remote users, picked by site
+COLOR_EDITOR_PEERS          = [
+    color( 196, 96, 150 ),
+    color( 92, 132, 196 ),
+    color( 110, 160, 90 ),
+    color( 210, 130, 70 ),
+    color( 70, 150, 170 ),
+    color( 150, 110, 200 )
+]
+
+EDITOR_PADDING      = 6         # Space around editor text
+EDITOR_OVERSCAN     = 3         # Lines drawn above / below the view
+EDITOR_SCROLL_LINES = 3         # Lines per mouse wheel step
+EDITOR_SCROLL_SPEED = 15        # Smooth scroll animation speed
+EDITOR_TAB          = "    "    # Inserted on tab
+EDITOR_PEER_SPEED   = 20        # Remote carets move animation speed
+EDITOR_PEER_ALPHA   = 60        # Remote selections alpha
+
+COLOR_TREE_BACK             = color( 253, 231, 236 )
+COLOR_TREE_TEXT             = color( 110, 96, 138 )
+COLOR_TREE_FOLDER           = color( 156, 140, 182 )
+COLOR_TREE_HOVER            = color( 156, 140, 182, 40 )
+COLOR_TREE_SELECTED         = color( 156, 140, 182, 90 )
+
+TREE_PADDING        = 6         # Space around tree rows
+TREE_INDENT         = 14        # Row indent per depth level
+TREE_ROW_SPACING    = 4         # Space added to the text height of a row
+TREE_OVERSCAN       = 2         # Rows drawn above / below the view
+TREE_SCROLL_ROWS    = 3         # Rows per mouse wheel step
+TREE_SCROLL_SPEED   = 15        # Smooth scroll animation speed
+TREE_FOLDER_OPEN    = "- "      # Marker of an expanded folder
+TREE_FOLDER_CLOSED  = "+ "      # Marker of a collapsed folder
+
+
+class c_icon_button:
+    """
+        Button with icon class
+    """
+
+    _parent:        any             # c_scene parent 
+    _index:         int             # button index
+
+    _position:      vector          # current button position
+    _size:          int             # current button size
+
+    _icon:          c_image         # image object
+
+    _callback:      any             # Button on press callback
+
+    _render:        c_render        # parents render instance
+    _animations:    c_animations    # current button animations handle
+    _layout:        any             # c_layout_item that places the button (can be None)
+    
+    # Private button data
+    _is_hovered:    bool            # Is button hovered
+
+    def __init__( self, parent: any, icon: c_image, position: vector, size: int, callback: any = None ):
+        """
+            Create new button instance
+        """
+
+        self._parent        = parent
+        self._index         = INVALID
+
+        self._position      = position.copy( )
+        self._size          = size
+
+        self._icon          = icon
+
+        self._render        = self._parent.render( )
+        self._animations    = c_animations( )
+        self._layout        = None
+
+        self._callback = callback
+
+        # Finish set up process
+        self.__complete_attach( )
+        self.__complete_setup( )
+
+    def __complete_attach( self ) -> None:
+        """
+            Complete attach of current button to its parent
+        """
+
+        # Attach this element instance
+        self._index = self._parent.attach_element( self )
+
+        # Attach input events 
+        self._parent.set_event( "mouse_position", self.__event_mouse_position, f"ButtonIcon::{ self._index }" )
+        self._parent.set_event( "mouse_input", self.__event_mouse_input, f"ButtonIcon::{ self._index }" )
+
+    def __complete_setup( self ) -> None:
+        """
+            Set up all the data for the button
+        """
+
+        self._is_hovered = False
+
+        self._animations.prepare( "Background", 50 )
+        self._animations.prepare( "Underline", 0 )
+
+        # Register as icon user
+        self._icon.retain( )
+
+    def index( self ) -> int:
+        """
+            Returns element handle in the parent scene
+        """
+
+        return self._index
+
+    def release( self ) -> None:
+        """
+            Release resources used by the button
+        """
+
+        self._parent.unset_event( "mouse_position", f"ButtonIcon::{ self._index }" )
+        self._parent.unset_event( "mouse_input", f"ButtonIcon::{ self._index }" )
+
+        self._icon.release( )
+
+    # region : Render
+
+    def draw( self, fade: float ) -> None:
+        """
+            Button main draw function
+        """
+
+        self.__draw_animations( )
+
+        background = self._animations.value( "Background" )
+        underline = self._animations.value( "Underline" )
+        
+        self._render.rect( self._position, self._position + self._size, COLOR_BUTTON_BACK.alpha_override(background) * fade, 10 )
+        self._render.rect( 
+            vector( self._position.x + self._size / 2 - 10, self._position.y + self._size - 6 ),
+            vector( self._position.x + self._size / 2 + 10, self._position.y + self._size - 2 ),
+
+            COLOR_BUTTON_ICON.alpha_override(underline) * fade,
+            2
+        )
+
+        self._render.image( self._icon, self._position + self._size / 2 - self._icon.size( ) / 2, COLOR_BUTTON_ICON * fade )
+
+    def __draw_animations( self ) -> None:
+        """
+            Do the animations process
+        """
+
+        self._animations.update( )
+
+        self._animations.preform( "Background", self._is_hovered and 150 or 50, DEFAULT_SPEED )
+        self._animations.preform( "Underline", self._is_hovered and 255 or 0, DEFAULT_SPEED )
+    
+    def position( self, new_position: vector = None ) -> vector | None:
+        """
+            Updates / returns current button position
+        """
+
+        if new_position is None:
+            return self._position
+        
+        self._position.x = new_position.x
+        self._position.y = new_position.y
+
+    def size( self ) -> vector:
+        """
+            Returns current button size
+        """
+
+        return vector( self._size, self._size )
+
+    def layout( self, node: any = None ) -> any:
+        """
+            Returns / Sets layout node that places the button
+        """
+
+        if node is None:
+            return self._layout
+
+        self._layout = node
+
+    # endregion
+
+    # region : Input 
+
+    def __event_mouse_position( self, event ) -> None:
+        """
+            Mouse Position change callback
+        """
+
+        x = event( "x" )
+        y = event( "y" )
+
+        mouse_position = vector( x, y )
+
+        self._is_hovered = mouse_position.is_in_bounds( self._position, self._size, self._size )
+
+    def __event_mouse_input( self, event ) -> None:
+        """
+            Mouse buttons input callback
+        """
+
+        if not self._is_hovered:
+            return
+        
+        button = event( "button" )
+        if not button == glfw.MOUSE_BUTTON_LEFT:
+            return
+        
+        action = event( "action" )
+        if not action == glfw.PRESS:
+            return
+        
+        if self._callback is not None:
+            self._callback( )
+
+    # endregion
+
+class c_icon_text_button:
+    """
+        Button with icon and text class
+    """
+
+    _parent:        any             # c_scene parent 
+    _index:         int             # button index
+
+    _position:      vector          # current button position
+    _size:          int             # current button size
+
+    _icon:          c_image         # image object
+    _font:          any             # Button font for text
+    _text:          str             # Button text
+
+    _callback:      any             # Button on press callback
+
+    _render:        c_render        # parents render instance
+    _animations:    c_animations    # current button animations handle
+    _layout:        any             # c_layout_item that places the button (can be None)
+    
+    # Private button data
+    _is_hovered:    bool            # Is button hovered
+    _text_size:     vector          # Button text size
+
+    def __init__( self, parent: any, icon: c_image, font: any, text: str, position: vector, size: int, callback: any = None ):
+        """
+            Create new button instance
+        """
+
+        self._parent        = parent
+        self._index         = INVALID
+
+        self._position      = position.copy( )
+        self._size          = size
+
+        self._icon          = icon
+        self._font          = font
+        self._text          = text
+
+        self._render        = self._parent.render( )
+        self._animations    = c_animations( )
+        self._layout        = None
+
+        self._callback      = callback
+
+        # Finish set up process
+        self.__complete_attach( )
+        self.__complete_setup( )
+
+    def __complete_attach( self ) -> None:
+        """
+            Complete attach of current button to its parent
+        """
+
+        # Attach this element instance
+        self._index = self._parent.attach_element( self )
+
+        # Attach input events 
+        self._parent.set_event( "mouse_position", self.__event_mouse_position, f"ButtonIcon::{ self._index }" )
+        self._parent.set_event( "mouse_input", self.__event_mouse_input, f"ButtonIcon::{ self._index }" )
+
+    def __complete_setup( self ) -> None:
+        """
+            Set up all the data for the button
+        """
+
+        self._is_hovered    = False
+        self._text_size     = vector( )
+
+        self._animations.prepare( "Background", 50 )
+        self._animations.prepare( "Underline", 0 )
+        self._animations.prepare( "Width", self._size )
+
+        # Register as icon user
+        self._icon.retain( )
+
+    def index( self ) -> int:
+        """
+            Returns element handle in the parent scene
+        """
+
+        return self._index
+
+    def release( self ) -> None:
+        """
+            Release resources used by the button
+        """
+
+        self._parent.unset_event( "mouse_position", f"ButtonIcon::{ self._index }" )
+        self._parent.unset_event( "mouse_input", f"ButtonIcon::{ self._index }" )
+
+        self._icon.release( )
+
+    # region : Render
+
+    def draw( self, fade: float ) -> None:
+        """
+            Button main draw function
+        """
+
+        self.__draw_animations( )
+
+        # Get animations values
+        background          = self._animations.value( "Background" )
+        width               = self._animations.value( "Width" )
+        underline           = self._animations.value( "Underline" )
+        
+        # 1 Time calculate vectors
+        start_position      = self._position
+        end_position        = self._position + vector(width, self._size)
+
+        self._render.rect( start_position, end_position, COLOR_BUTTON_BACK.alpha_override(background) * fade, 10 )
+
+        self._render.rect( 
+            vector( self._position.x + width / 2 - 10, self._position.y + self._size - 6 ),
+            vector( self._position.x + width / 2 + 10, self._position.y + self._size - 2 ),
+
+            COLOR_BUTTON_ICON.alpha_override(underline) * fade,
+            2
+        )
+
+        self._render.image( self._icon, self._position + self._size / 2 - self._icon.size( ) / 2, COLOR_BUTTON_ICON * fade )
+
+        self._render.push_clip_rect( start_position, end_position )
+        self._render.text( 
+            self._font, 
+            self._position + vector( 
+                self._size, 
+                self._size / 2 - self._text_size.y / 2 
+            ), 
+            COLOR_BUTTON_ICON * fade, 
+            self._text 
+        )
+        self._render.pop_clip_rect( )
+
+    def __draw_animations( self ) -> None:
+        """
+            Do the animations process
+        """
+
+        self._animations.update( )
+
+        self._text_size: vector = self._render.measure_text( self._font, self._text )
+
+        width = self._animations.value( "Width" )
+
+        self._animations.preform( "Background", self._is_hovered and 150                                    or 50,          DEFAULT_SPEED )
+        self._animations.preform( "Width",      self._is_hovered and self._size + self._text_size.x + 12    or self._size,  DEFAULT_SPEED )
+        self._animations.preform( "Underline",  self._is_hovered and 255                                    or 0,           DEFAULT_SPEED )
+
+        # Animated width changes our layout size
+        if self._layout is not None and width != self._animations.value( "Width" ):
+            self._layout.invalidate( )
+    
+    def position( self, new_position: vector = None ) -> vector | None:
+        """
+            Updates / returns current button position
+        """
+
+        if new_position is None:
+            return self._position
+        
+        self._position.x = new_position.x
+        self._position.y = new_position.y
+
+    def size( self ) -> vector:
+        """
+            Returns current button size (with animated width)
+        """
+
+        return vector( self._animations.value( "Width" ), self._size )
+
+    def layout( self, node: any = None ) -> any:
+        """
+            Returns / Sets layout node that places the button
+        """
+
+        if node is None:
+            return self._layout
+
+        self._layout = node
+
+    # endregion
+
+    # region : Input 
+
+    def __event_mouse_position( self, event ) -> None:
+        """
+            Mouse Position change callback
+        """
+
+        x = event( "x" )
+        y = event( "y" )
+
+        mouse_position      = vector( x, y )
+
+        width               = self._animations.value( "Width" )
+        self._is_hovered    = mouse_position.is_in_bounds( self._position, width, self._size )
+
+    def __event_mouse_input( self, event ) -> None:
+        """
+            Mouse buttons input callback
+        """
+
+        if not self._is_hovered:
+            return
+        
+        button = event( "button" )
+        if not button == glfw.MOUSE_BUTTON_LEFT:
+            return
+        
+        action = event( "action" )
+        if not action == glfw.PRESS:
+            return
+        
+        if self._callback is not None:
+            self._callback( )
+
+    # endregion
+
+class c_text_input:
+    """
+        Single line text input class
+    """
+
+    _parent:            any
+    _index:             int
+
+    _position:          vector
+    _size:              vector  # (x. text field width, y. height)
+
+    _icon:              c_image
+    _font:              any
+    _text:              str
+    _input:             c_gap_buffer    # Text Input value with displayed chars widths
+    _is_measured:       bool            # Are all chars widths known
+    _history:           c_history       # Undo history of the input
+
+    _render:        c_render        # parents render instance
+    _animations:    c_animations    # current button animations handle
+    _layout:        any             # c_layout_item that places the input (can be None)
+
+    # Private button data
+    _is_hovered:        bool 
+    _is_typing:         bool
+    _is_ctrl:           bool
+    _is_password:       bool
+
+    _text_size:         vector
+    _input_size:        vector
+    _mouse_position:    vector
+    _click_delta:       int
+    _input_index:       int
+    _input_offset:      float
+
+    _time:              int
+
+    def __init__( self, parent: any, icon: c_image, font: any, text: str, position: vector, size: vector ):
+        """
+            Create new button instance
+        """
+
+        self._parent        = parent
+        self._index         = INVALID
+
+        self._position      = position.copy( )
+        self._size          = size.copy( )
+
+        self._icon          = icon
+        self._font          = font
+        self._text          = text
+        self._input         = c_gap_buffer( )
+        self._is_measured   = True
+        self._history       = c_history( self )
+
+        self._render        = self._parent.render( )
+        self._animations    = c_animations( )
+        self._layout        = None
+
+        self._time = time.time()
+
+        # Finish set up process
+        self.__complete_attach( )
+        self.__complete_setup( )
+
+    def __complete_attach( self ) -> None:
+        """
+            Complete attach of current button to its parent
+        """
+
+        # Attach this element instance
+        self._index = self._parent.attach_element( self )
+
+        # Attach events
+        self._parent.set_event( "mouse_position",   self.__event_mouse_position,    f"TextInput::{ self._index }" )
+        self._parent.set_event( "mouse_input",      self.__event_mouse_input,       f"TextInput::{ self._index }" )
+        self._parent.set_event( "char_input",       self.__event_char_input,        f"TextInput::{ self._index }" )
+        self._parent.set_event( "keyboard_input",   self.__event_keyboard_input,    f"TextInput::{ self._index }" )
+        
+    def __complete_setup( self ) -> None:
+        """
+            Set up all the data for the button
+        """
+
+        # Add the Icon box width
+        self._size.x            = self._size.x + self._size.y
+
+        self._is_hovered        = False
+        self._is_ctrl           = False
+        self._is_typing         = False
+        self._is_password       = False
+
+        self._text_size         = vector( )
+        self._input_size        = vector( )
+        self._mouse_position    = vector( )
+        self._click_delta       = INVALID
+
+        self._input_index       = 0
+        self._input_offset      = self._position.x + self._size.y + 5
+
+        self._animations.prepare( "Background", 0 )
+        self._animations.prepare( "TextAlpha",  255 )
+        self._animations.prepare( "Underline",  10 )
+        self._animations.prepare( "InputWidth", self._size.y )
+        self._animations.prepare( "PointerShow", 0 )
+
+        # Register as icon user
+        self._icon.retain( )
+
+    def index( self ) -> int:
+        """
+            Returns element handle in the parent scene
+        """
+
+        return self._index
+
+    def release( self ) -> None:
+        """
+            Release resources used by the text input
+        """
+
+        self._parent.unset_event( "mouse_position",   f"TextInput::{ self._index }" )
+        self._parent.unset_event( "mouse_input",      f"TextInput::{ self._index }" )
+        self._parent.unset_event( "char_input",       f"TextInput::{ self._index }" )
+        self._parent.unset_event( "keyboard_input",   f"TextInput::{ self._index }" )
+
+        self._history.release( )
+        self._icon.release( )
+
+    def input_type( self, is_password: bool = None ) -> bool | None:
+        """
+            Returns / Sets if the current text input should be for password
+        """
+
+        if is_password is None:
+            return self._is_password
+        
+        if self._is_password == is_password:
+            return
+
+        self._is_password = is_password
+
+        # Displayed chars changed, measure everything again
+        self._is_measured = False
+
+    def get( self ) -> str:
+        """
+            Returns current input value
+        """
+
+        # Cached by the buffer until the next edit
+        return self._input.get( )
+    
+    # region : Render
+
+    def draw( self, fade: float ) -> None:
+        """
+            Button main draw function
+        """
+
+        self.__draw_animations( )
+
+        background          = self._animations.value( "Background" )
+        background_width    = self._animations.value( "InputWidth" )
+        text_alpha          = self._animations.value( "TextAlpha" )
+        underline           = self._animations.value( "Underline" )
+        
+        self._render.rect( self._position, self._position + vector( background_width, self._size.y ), COLOR_INPUT_BACK.alpha_override(background) * fade, 10 )
+        self._render.rect( 
+            vector( self._position.x + self._size.y - 6, self._position.y + self._size.y / 2 - underline ),
+            vector( self._position.x + self._size.y - 2, self._position.y + self._size.y / 2 + underline ),
+
+            COLOR_INPUT_ICON * fade,
+            2
+        )
+
+        self._render.image( self._icon, self._position + vector(self._size.y, self._size.y) / 2 - self._icon.size( ) / 2, COLOR_INPUT_ICON * fade )
+
+        if text_alpha > 0:
+            self._render.text( 
+                self._font, 
+                vector( 
+                    self._position.x + self._size.y + 5, 
+                    self._position.y + self._size.y / 2 - self._text_size.y / 2 
+                ),
+                COLOR_INPUT_TEXT.alpha_override( text_alpha ) * fade,
+                self._text
+            )
+        
+        # Some pre made calculations
+        self.__measure_advances( )
+
+        correct_input           = self.correct_text( self._input.get( ) )
+        correct_by_index_size   = vector( self._input.offset( self._input_index ), self._render.text_height( self._font ) )
+
+        start_clip  = self._position + vector(self._size.y + 5, 0)
+        end_clip    = self._position + vector( background_width - 10, self._size.y )
+
+        self._render.push_clip_rect( start_clip, end_clip )
+
+        self.__draw_input( fade, correct_input )
+        self.__draw_index( fade, correct_by_index_size )
+
+        self._render.pop_clip_rect( )
+
+        self.__preform_correct_offset( vector( end_clip.x, start_clip.x ), correct_by_index_size )
+        self.__preform_set_index( )
+
+    def __draw_input( self, fade: float, text: str ) -> None:
+        """
+            Draw Input text
+        """
+        
+        self._render.text( 
+            self._font, 
+            vector( self._input_offset, self._position.y + self._size.y / 2 - self._text_size.y / 2 ),
+            COLOR_INPUT_TEXT * fade,
+            text
+        )
+
+
+    def __draw_index( self, fade: float, text_size: vector ) -> None:
+        """
+            Draw the select index pointer
+        """
+        pointer_alpha = self._animations.value( "PointerShow" )
+
+        if not self._is_typing and pointer_alpha == 0:
+            return
+        
+        start_y_offset = self._position.y + self._size.y / 2 - self._text_size.y / 2
+        
+        self._render.rect( 
+            vector( self._input_offset + text_size.x, start_y_offset - 2 ),
+            vector( self._input_offset + text_size.x + 1, start_y_offset + (2 + text_size.y) * pointer_alpha ),
+            COLOR_INPUT_PONTER * fade * pointer_alpha
+        )
+
+    def __preform_correct_offset( self, end_clip: vector, text_size: vector ) -> None:
+        """
+            Preform some calculations for text offset for clip
+        """
+
+        if not self._is_typing:
+            return
+        
+        set_offset = self._input_offset + text_size.x + 1
+
+        # Move the text left / right to focus on the index to be in visible area
+        if set_offset > end_clip.x:
+            self._input_offset -= set_offset - end_clip.x
+
+        if ( set_offset - 1 ) < end_clip.y:
+            self._input_offset += end_clip.y - ( set_offset - 1 )
+
+    def __preform_set_index( self ) -> None:
+        """
+            Preform calculations on user press on text
+        """
+
+        if not self._is_typing:
+            return
+
+        if self._click_delta == INVALID:
+            return
+
+        selected_index: int = self._input.index_at( self._click_delta )
+
+        self._click_delta = INVALID
+        self._input_index = selected_index
+
+    def __measure_advances( self ) -> None:
+        """
+            Measure chars widths that were not measured yet.
+            happens only when new glyphs were typed, called while drawing
+        """
+
+        if self._is_measured:
+            return
+
+        self._input.measure( lambda char: self._render.char_width( self._font, self.correct_text( char ) ) )
+        self._is_measured = True
+
+    def correct_text( self , text: str ) -> str:
+        """
+            If is password is True, conver the text into password type
+        """
+
+        if self._is_password:
+            return "*" * len( text )
+        
+        return text
+
+    def __draw_animations( self ) -> None:
+        """
+            Do the animations process
+        """
+
+        self._animations.update( )
+
+        width = self._animations.value( "InputWidth" )
+
+        if self._is_typing:
+            self._animations.preform( "Background", 200, DEFAULT_SPEED )
+        elif self._is_hovered:
+            self._animations.preform( "Background", 100, DEFAULT_SPEED )
+        else:
+            self._animations.preform( "Background", 50, DEFAULT_SPEED )
+
+        if self._is_typing:
+            self._animations.preform( "PointerShow", 1, DEFAULT_SPEED )
+            self._animations.preform( "Underline", ( self._size.y - 6 ) / 2, DEFAULT_SPEED )
+        else:
+            self._animations.preform( "PointerShow", 0, DEFAULT_SPEED )
+            self._animations.preform( "Underline", 10, DEFAULT_SPEED )
+
+        if not self._is_typing and len( self._input ) == 0:
+            self._animations.preform( "InputWidth", self._size.y + self._text_size.x + 10, DEFAULT_SPEED )
+            self._animations.preform( "TextAlpha", 200, DEFAULT_SPEED )
+        else:
+            self._animations.preform( "TextAlpha", 0, DEFAULT_SPEED )
+            self._animations.preform( "InputWidth", self._size.x, DEFAULT_SPEED )
+
+        self._text_size = self._render.measure_text( self._font, self._text )
+
+        # Animated width changes our layout size
+        if self._layout is not None and width != self._animations.value( "InputWidth" ):
+            self._layout.invalidate( )
+
+    def position( self, new_position: vector = None ) -> vector | None:
+        """
+            Updates / returns current button position
+        """
+
+        if new_position is None:
+            return self._position
+
+        # Input text offset is absolute, move it with us
+        self._input_offset += new_position.x - self._position.x
+        
+        self._position.x = new_position.x
+        self._position.y = new_position.y
+
+    def size( self ) -> vector:
+        """
+            Returns current input size (with animated width)
+        """
+
+        return vector( self._animations.value( "InputWidth" ), self._size.y )
+
+    def layout( self, node: any = None ) -> any:
+        """
+            Returns / Sets layout node that places the input
+        """
+
+        if node is None:
+            return self._layout
+
+        self._layout = node
+
+    # endregion
+
+    # region : Input
+
+    def insert( self, text: str  ) -> None:
+        """
+            Inserts specific text into selected index
+        """
+
+        # Moving the gap costs only the distance from the last edit
+        self._input.move( self._input_index )
+
+        glyphs = self._render.glyphs( self._font )
+        widths = [ ]
+
+        for char in self.correct_text( text ):
+            width = glyphs.get( char )
+
+            # Glyph was never measured. measure on next draw
+            if width is None:
+                self._is_measured = False
+                width = 0
+
+            widths.append( width )
+
+        self._history.record( self._input_index, "", text )
+
+        self._input.insert( text, widths )
+        self._input_index += len( text )
+
+    def pop( self ) -> str | None:
+        """
+            Pops char from input in selected index
+        """
+
+        if self._input_index == 0:
+            return None
+
+        self._input.move( self._input_index )
+        self._input_index -= 1
+
+        char = self._input.delete_before( 1 )
+        self._history.record( self._input_index, char, "" )
+
+        return char
+
+    def replace( self, index: int, length: int, text: str ) -> str:
+        """
+            Replace length chars at index with text. returns the replaced text
+        """
+
+        self._input_index = max( 0, min( index, len( self._input ) ) )
+        self._input.move( self._input_index )
+
+        removed = self._input.delete_after( length )
+
+        if removed:
+            self._history.record( self._input_index, removed, "" )
+
+        if text:
+            self.insert( text )
+
+        return removed
+
+    def undo( self ) -> None:
+        """
+            Undo the last edits group
+        """
+
+        caret = self._history.undo( )
+
+        if caret is not None:
+            self._input_index = caret
+
+    def redo( self ) -> None:
+
+        caret = self._history.redo( )
+
+        if caret is not None:
+            self._input_index = caret
+
+    def __event_mouse_position( self, event ) -> None:
+        """
+            Mouse Position change callback
+        """
+
+        x = event( "x" )
+        y = event( "y" )
+
+        self._mouse_position.x = x
+        self._mouse_position.y = y
+
+        self._is_hovered = self._mouse_position.is_in_bounds( self._position, self._animations.value( "InputWidth" ), self._size.y )
+
+    def __event_mouse_input( self, event ) -> None:
+        """
+            Mouse buttons input callback
+        """
+        
+        button = event( "button" )
+        action = event( "action" )
+
+        if button != glfw.MOUSE_BUTTON_LEFT or action != glfw.PRESS:
+            return
+
+        if not self._is_hovered:
+            self._is_typing = False
+            return
+        
+        if not self._is_typing:
+            self._is_typing = True
+
+        #self._click_position = self._mouse_position.copy( )
+        self._click_delta = self._mouse_position.x - self._input_offset
+
+    def __event_char_input( self, event ) -> None:
+        """
+            Captures what char was pressed
+        """
+
+        if not self._is_typing:
+            return
+        
+        char = chr( event( "char" ) )
+
+        self.insert( char )
+
+    def __event_keyboard_input( self, event ) -> None:
+        """
+            General keyboard input handle
+        """
+
+        if not self._is_typing:
+            return
+        
+        key         = event( "key" )
+        action      = event( "action" ) 
+
+        self.__ctrl_handle( key, action )
+
+        if action == glfw.PRESS:
+            self.__repeat_handle( key )
+
+            self.__paste_handle( key )
+            self.__undo_handle( key )
+
+            if key == glfw.KEY_ENTER:
+                self._is_typing = False
+
+        if action == glfw.REPEAT:
+            self.__repeat_handle( key )
+
+
+    def __ctrl_handle( self, key, action ):
+        """
+            Exception capture for Ctrl key input
+        """
+
+        if key != glfw.KEY_LEFT_CONTROL and key != glfw.KEY_RIGHT_CONTROL:
+            return
+
+        if action == glfw.PRESS:
+            self._is_ctrl = True
+
+        if action == glfw.RELEASE:
+            self._is_ctrl = False
+
+    def __repeat_handle( self, key ):
+        """
+            Executable input handle for PRESS and REPEAT calls
+        """
+
+        # Remove
+        if key == glfw.KEY_BACKSPACE:
+            self.pop( )
+
+        # Move index left
+        if key == glfw.KEY_LEFT and self._input_index > 0:
+            self._input_index -= 1
+
+        # Move index right
+        if key == glfw.KEY_RIGHT and self._input_index < len( self._input ):
+            self._input_index += 1
+
+    def __paste_handle( self, key ):
+
+        if not self._is_ctrl:
+            return
+
+        if key != glfw.KEY_V:
+            return
+
+        result: bytes = glfw.get_clipboard_string( None )
+        result: str = result.decode( )
+
+        self.insert(result)
+
+    def __undo_handle( self, key ):
+
+        if not self._is_ctrl:
+            return
+
+        if key == glfw.KEY_Z:
+            self.undo( )
+
+        if key == glfw.KEY_Y:
+            self.redo( )
+
+    # endregion
+
+class c_code_editor:
+    """
+        Multi line code editor class.
+
+        Draws only the lines inside the view (plus small overscan),
+        so frame time does not depend on the document length.
+    """
+
+    _parent:            any             # c_scene parent
+    _index:             int             # editor handle
+
+    _position:          vector          # current editor position
+    _size:              vector          # current editor size
+
+    _font:              any             # Editor font
+    _document:          c_document      # Edited document
+    _lexer:             any             # Lexer used for highlighting (None for plain text)
+    _tokenizer:         c_tokenizer     # Document tokenizer (None for plain text)
+    _presence:          any             # c_presence of a shared document (None if not shared)
+    _search:            any             # c_search to highlight matches of (None if none)
+    _history:           c_history       # Undo history of the document
+
+    _render:            c_render        # parents render instance
+    _animations:        c_animations    # current editor animations handle
+    _layout:            any             # c_layout_item that places the editor (can be None)
+
+    # Private editor data
+    _is_hovered:        bool            # Is mouse over the editor
+    _is_typing:         bool            # Does the editor have focus
+
+    _lines:             dict            # Line layout cache. line -> ( text, x offsets, rows start columns )
+    _visible:           tuple           # [first, last) lines drawn in the last frame
+    _line_height:       float           # Height of a line (0 until first draw)
+    _gutter:            float           # Line numbers area width
+
+    _wrap:              bool            # Are long lines wrapped to the editor width
+    _wrap_width:        float           # Width the lines were wrapped to
+    _heights:           c_line_heights  # Lines heights while wrapping (None if not wrapped)
+
+    _caret:             int             # Caret offset in document
+    _caret_column:      int             # Wanted column for up / down movement
+    _scroll:            float           # Wanted scroll (animated)
+    _mouse_position:    vector          # Last mouse position
+    _click:             vector          # Pending click to resolve on draw (None if none)
+
+    def __init__( self, parent: any, font: any, position: vector, size: vector, document: c_document = None, lexer: any = None ):
+        """
+            Create new code editor instance
+        """
+
+        self._parent        = parent
+        self._index         = INVALID
+
+        self._position      = position.copy( )
+        self._size          = size.copy( )
+
+        self._font          = font
+        self._document      = document is not None and document or c_document( )
+        self._lexer         = lexer
+        self._tokenizer     = self.__create_tokenizer( )
+        self._presence      = None
+        self._search        = None
+        self._history       = c_history( self._document )
+
+        self._render        = self._parent.render( )
+        self._animations    = c_animations( )
+        self._layout        = None
+
+        # Finish set up process
+        self.__complete_attach( )
+        self.__complete_setup( )
+
+    def __complete_attach( self ) -> None:
+        """
+            Complete attach of current editor to its parent
+        """
+
+        # Attach this element instance
+        self._index = self._parent.attach_element( self )
+
+        # Attach events
+        self._parent.set_event( "mouse_position",   self.__event_mouse_position,    f"CodeEditor::{ self._index }" )
+        self._parent.set_event( "mouse_input",      self.__event_mouse_input,       f"CodeEditor::{ self._index }" )
+        self._parent.set_event( "mouse_scroll",     self.__event_mouse_scroll,      f"CodeEditor::{ self._index }" )
+        self._parent.set_event( "char_input",       self.__event_char_input,        f"CodeEditor::{ self._index }" )
+        self._parent.set_event( "keyboard_input",   self.__event_keyboard_input,    f"CodeEditor::{ self._index }" )
+
+        self._document.set_event( "change", self.__event_document_change, f"CodeEditor::{ self._index }" )
+
+    def __create_tokenizer( self ) -> c_tokenizer | None:
+        """
+            Returns tokenizer of the document (None for plain text and mapped files)
+        """
+
+        # Tokenizer keeps a copy of all lines, a mapped file would be read whole
+        if self._lexer is None or not isinstance( self._document, c_document ):
+            return None
+
+        return c_tokenizer( self._document, self._lexer )
+
+    def __complete_setup( self ) -> None:
+        """
+            Set up all the data for the editor
+        """
+
+        self._is_hovered        = False
+        self._is_typing         = False
+
+        self._lines             = { }
+        self._visible           = ( 0, 0 )
+        self._line_height       = 0
+        self._gutter            = 0
+
+        self._wrap              = False
+        self._wrap_width        = 0
+        self._heights           = None
+
+        self._caret             = 0
+        self._caret_column      = 0
+        self._scroll            = 0
+        self._mouse_position    = vector( )
+        self._click             = None
+
+        self._animations.prepare( "Scroll",         0 )
+        self._animations.prepare( "Background",     50 )
+        self._animations.prepare( "PointerShow",    0 )
+
+    def index( self ) -> int:
+        """
+            Returns element handle in the parent scene
+        """
+
+        return self._index
+
+    def release( self ) -> None:
+        """
+            Release resources used by the editor
+        """
+
+        self._parent.unset_event( "mouse_position",   f"CodeEditor::{ self._index }" )
+        self._parent.unset_event( "mouse_input",      f"CodeEditor::{ self._index }" )
+        self._parent.unset_event( "mouse_scroll",     f"CodeEditor::{ self._index }" )
+        self._parent.unset_event( "char_input",       f"CodeEditor::{ self._index }" )
+        self._parent.unset_event( "keyboard_input",   f"CodeEditor::{ self._index }" )
+
+        self._document.unset_event( "change", f"CodeEditor::{ self._index }" )
+
+        if self._tokenizer is not None:
+            self._tokenizer.release( )
+            self._tokenizer = None
+
+        self._history.release( )
+
+        self._lines.clear( )
+
+    def document( self, new_document: c_document = None ) -> c_document | None:
+        """
+            Returns / Sets edited document
+        """
+
+        if new_document is None:
+            return self._document
+
+        self._document.unset_event( "change", f"CodeEditor::{ self._index }" )
+
+        self._document = new_document
+        self._document.set_event( "change", self.__event_document_change, f"CodeEditor::{ self._index }" )
+
+        if self._tokenizer is not None:
+            self._tokenizer.release( )
+
+        self._tokenizer = self.__create_tokenizer( )
+
+        self._history.release( )
+        self._history = c_history( self._document )
+
+        self._lines.clear( )
+
+        # New lines heights on the next frame
+        self._heights = None
+
+        self._caret     = 0
+        self._scroll    = 0
+        self._animations.value( "Scroll", 0 )
+
+    def open( self, path: str, encoding: str = "utf-8" ) -> any:
+        """
+            Open file in the editor. big files are mapped read only (c_mapped_file) and
+            not highlighted. returns the document, the caller releases a mapped file
+        """
+
+        document = open_document( path, encoding )
+        self.document( document )
+
+        return document
+
+    def visible_lines( self ) -> tuple:
+        """
+            Returns [first, last) lines drawn in the last frame
+        """
+
+        return self._visible
+
+    def presence( self, new_presence: any = None ) -> any:
+        """
+            Returns / Sets c_presence to show remote users (None to hide them)
+        """
+
+        if new_presence is None:
+            return self._presence
+
+        self._presence = new_presence
+
+    def history( self, new_history: c_history = None ) -> c_history | None:
+        """
+            Returns / Sets undo history. a shared document needs c_history( document, replica ),
+            so only the local edits are undone
+        """
+
+        if new_history is None:
+            return self._history
+
+        if new_history is not self._history:
+            self._history.release( )
+
+        self._history = new_history
+
+    def search( self, new_search: any = None ) -> any:
+        """
+            Returns / Sets c_search to highlight its matches (None to hide them)
+        """
+
+        if new_search is None:
+            return self._search
+
+        self._search = new_search
+
+    def caret( self, new_offset: int = None ) -> int | None:
+        """
+            Returns / Sets caret offset
+        """
+
+        if new_offset is None:
+            return self._caret
+
+        self._caret         = max( 0, min( new_offset, len( self._document ) ) )
+        self._caret_column  = self._document.position( self._caret )[ 1 ]
+
+        # Typing after the caret moved is a new undo group
+        self._history.break_group( )
+
+        self.__scroll_to_caret( )
+
+    def wrap( self, new_value: bool = None ) -> bool | None:
+        """
+            Returns / Sets word wrap of long lines
+        """
+
+        if new_value is None:
+            return self._wrap
+
+        self._wrap          = new_value
+        self._wrap_width    = 0
+        self._heights       = None
+        self._lines         = { }
+
+    def goto( self, line: int, column: int = 0 ) -> None:
+        """
+            Move the caret to ( line, column ) and scroll to it
+        """
+
+        self.caret( self._document.offset( line, column ) )
+
+    # region : Render
+
+    def draw( self, fade: float ) -> None:
+        """
+            Editor main draw function
+        """
+
+        self.__draw_animations( )
+
+        background  = self._animations.value( "Background" )
+        scroll      = self._animations.value( "Scroll" )
+
+        end_position = self._position + self._size
+
+        self._render.rect( self._position, end_position, COLOR_EDITOR_BACK.alpha_override( background ) * fade, 10 )
+
+        line_height = self.__line_height( )
+
+        # Gutter fits the biggest line number
+        self._gutter = self._render.measure_text( self._font, str( self._document.line_count( ) ) ).x + EDITOR_PADDING * 2
+
+        self.__update_wrap( )
+
+        first, last = self.__visible_lines( scroll )
+
+        self._visible = ( first, last )
+
+        self._render.push_clip_rect( self._position, end_position )
+
+        text_x = self._position.x + self._gutter
+
+        # Fade the palette once per frame, not per run
+        text_color  = COLOR_EDITOR_TEXT * fade
+        palette     = { token: clr * fade for token, clr in COLOR_EDITOR_TOKENS.items( ) }
+
+        y = self._position.y + EDITOR_PADDING + self.__line_y( first ) - scroll
+
+        for line in range( first, last ):
+            self._render.text_line( self._font, vector( self._position.x + EDITOR_PADDING, y ), COLOR_EDITOR_LINE_NUMBER * fade, str( line + 1 ) )
+            self.__draw_line( line, vector( text_x, y ), text_color, palette )
+
+            # Wrapped line takes a row for each part
+            y += len( self.__layout_line( line )[ 2 ] ) * line_height
+
+        self.__draw_search( fade, scroll, first, last )
+        self.__draw_presence( fade, scroll, first, last )
+        self.__draw_caret( fade, scroll )
+
+        self._render.pop_clip_rect( )
+
+        self.__release_hidden_lines( first, last )
+        self.__preform_click( scroll )
+
+    def __draw_line( self, line: int, position: vector, text_color: color, palette: dict ) -> None:
+        """
+            Draw single line, highlighted if spans are known
+        """
+
+        text, offsets, breaks = self.__layout_line( line )
+
+        spans = self._tokenizer is not None and self._tokenizer.spans( line ) or None
+
+        if not spans:
+            if len( breaks ) == 1:
+                return self._render.text_line( self._font, position, text_color, text )
+
+            for row, ( start, end ) in enumerate( zip( breaks, breaks[ 1: ] + [ len( text ) ] ) ):
+                self._render.text_line( self._font, vector( position.x, position.y + row * self._line_height ), text_color, text[ start:end ] )
+
+            return
+
+        # Fill the gaps between spans with plain text color
+        runs    = [ ]
+        length  = len( text )
+        last    = 0
+
+        for start, end, token in spans:
+            # Spans can be one edit behind until the line is lexed again
+            end = min( end, length )
+            if start >= end:
+                continue
+
+            if start > last:
+                runs.append( ( last, start, text_color ) )
+
+            runs.append( ( start, end, palette.get( token, text_color ) ) )
+            last = end
+
+        if last < length:
+            runs.append( ( last, length, text_color ) )
+
+        if len( breaks ) == 1:
+            return self._render.text_runs( self._font, position, text, offsets, runs )
+
+        # Each row draws the runs parts inside it, moved to the row start
+        for row, ( start, end ) in enumerate( zip( breaks, breaks[ 1: ] + [ length ] ) ):
+            row_runs = [ ( max( run_start, start ), min( run_end, end ), clr ) for run_start, run_end, clr in runs if run_start < end and run_end > start ]
+
+            self._render.text_runs( self._font, vector( position.x - offsets[ start ], position.y + row * self._line_height ), text, offsets, row_runs )
+
+    def __draw_caret( self, fade: float, scroll: float ) -> None:
+        """
+            Draw the caret
+        """
+
+        pointer_alpha = self._animations.value( "PointerShow" )
+
+        if not self._is_typing and pointer_alpha == 0:
+            return
+
+        line, column    = self._document.position( self._caret )
+        line_height     = self.__line_height( )
+        point           = self.__point( line, column )
+
+        x = self._position.x + self._gutter + point.x
+        y = self._position.y + EDITOR_PADDING + point.y - scroll
+
+        self._render.rect(
+            vector( x, y ),
+            vector( x + 1, y + line_height * pointer_alpha ),
+            COLOR_EDITOR_CARET * fade * pointer_alpha
+        )
+
+    def __draw_search( self, fade: float, scroll: float, first: int, last: int ) -> None:
+        """
+            Draw search matches of visible lines in one batch
+        """
+
+        if self._search is None:
+            return
+
+        matches = self._search.matches( self._document, first, last )
+
+        if not matches:
+            return
+
+        origin  = vector( self._position.x + self._gutter, self._position.y + EDITOR_PADDING - scroll )
+        clr     = COLOR_EDITOR_MATCH * fade
+        rects   = [ ]
+
+        for line, start, end in matches:
+            offset = self._document.line_start( line )
+            self.__selection_rects( rects, offset + start, offset + end, first, last, origin, clr )
+
+        self._render.rects( rects )
+
+    def __draw_presence( self, fade: float, scroll: float, first: int, last: int ) -> None:
+        """
+            Draw carets and selections of remote users in one batch
+        """
+
+        if self._presence is None:
+            return
+
+        # The editor has no selection yet, anchor is the caret
+        self._presence.local( self._caret )
+
+        line_height = self.__line_height( )
+        origin      = vector( self._position.x + self._gutter, self._position.y + EDITOR_PADDING - scroll )
+        rects       = [ ]
+
+        top     = self.__line_y( first )
+        bottom  = self.__line_y( last )
+
+        for site, caret, anchor in self._presence.peers( ):
+            clr = COLOR_EDITOR_PEERS[ site % len( COLOR_EDITOR_PEERS ) ] * fade
+
+            if caret != anchor:
+                self.__selection_rects( rects, min( caret, anchor ), max( caret, anchor ), first, last, origin, clr.alpha_override( EDITOR_PEER_ALPHA * fade ) )
+
+            # Caret moves smoothly in document space, scroll does not animate it
+            line, column    = self._document.position( caret )
+            target          = self.__point( line, column )
+            target_x        = target.x
+            target_y        = target.y
+
+            self._animations.prepare( f"Peer::{ site }::x", target_x )
+            self._animations.prepare( f"Peer::{ site }::y", target_y )
+
+            x = self._animations.preform( f"Peer::{ site }::x", target_x, EDITOR_PEER_SPEED, 0.5 )
+            y = self._animations.preform( f"Peer::{ site }::y", target_y, EDITOR_PEER_SPEED, 0.5 )
+
+            if y + line_height < top or y > bottom:
+                continue
+
+            position = origin + vector( x, y )
+
+            rects.append( ( position, position + vector( 2, line_height ), clr ) )
+
+        if rects:
+            self._render.rects( rects )
+
+    def __selection_rects( self, rects: list, start: int, end: int, first: int, last: int, origin: vector, clr: color ) -> None:
+        """
+            Add rects of a selection, only for visible lines
+        """
+
+        line_height = self.__line_height( )
+
+        start_line, start_column    = self._document.position( start )
+        end_line, end_column        = self._document.position( end )
+
+        for line in range( max( start_line, first ), min( end_line + 1, last ) ):
+            text, offsets, breaks = self.__layout_line( line )
+
+            line_y  = self.__line_y( line )
+            left    = start_column if line == start_line else 0
+            right   = end_column if line == end_line else len( text )
+
+            for row, ( row_start, row_end ) in enumerate( zip( breaks, breaks[ 1: ] + [ len( text ) ] ) ):
+                row_left    = max( left, row_start )
+                row_right   = min( right, row_end )
+
+                if row_right < row_left:
+                    continue
+
+                x1 = offsets[ row_left ] - offsets[ row_start ]
+                x2 = offsets[ row_right ] - offsets[ row_start ]
+
+                # Selected newline
+                if line != end_line and row_end == len( text ):
+                    x2 += EDITOR_PADDING
+
+                if x2 <= x1:
+                    continue
+
+                y = line_y + row * line_height
+
+                rects.append( ( origin + vector( x1, y ), origin + vector( x2, y + line_height ), clr ) )
+
+    def __draw_animations( self ) -> None:
+        """
+            Do the animations process
+        """
+
+        self._animations.update( )
+
+        self._animations.preform( "Background",     self._is_typing and 200 or ( self._is_hovered and 100 or 50 ), DEFAULT_SPEED )
+        self._animations.preform( "PointerShow",    self._is_typing and 1 or 0, DEFAULT_SPEED )
+
+        # Smooth scrolling
+        self._animations.preform( "Scroll", self._scroll, EDITOR_SCROLL_SPEED, 0.5 )
+
+    def __line_height( self ) -> float:
+        """
+            Returns line height. measured once while drawing
+        """
+
+        if self._line_height == 0:
+            self._line_height = self._render.text_height( self._font )
+
+        return self._line_height
+
+    def __visible_lines( self, scroll: float ) -> tuple:
+        """
+            Returns [first, last) lines to draw. O(1), O(log n) while wrapping
+        """
+
+        line_height = self.__line_height( )
+
+        if self._heights is not None:
+            first   = self._heights.line_at( scroll )[ 0 ] - EDITOR_OVERSCAN
+            last    = self._heights.line_at( scroll + self._size.y )[ 0 ] + 1 + EDITOR_OVERSCAN
+
+        else:
+            first   = int( scroll / line_height ) - EDITOR_OVERSCAN
+            last    = int( ( scroll + self._size.y ) / line_height ) + 1 + EDITOR_OVERSCAN
+
+        return max( first, 0 ), min( last, self._document.line_count( ) )
+
+    def __line_y( self, line: int ) -> float:
+        """
+            Returns top of a line in document space
+        """
+
+        if self._heights is not None:
+            return self._heights.y( line )
+
+        return line * self.__line_height( )
+
+    def __point( self, line: int, column: int ) -> vector:
+        """
+            Returns position of ( line, column ) in document space, from the text start
+        """
+
+        _, offsets, breaks = self.__layout_line( line )
+
+        column  = min( column, len( offsets ) - 1 )
+        row     = bisect.bisect_right( breaks, column ) - 1
+
+        return vector( offsets[ column ] - offsets[ breaks[ row ] ], self.__line_y( line ) + row * self.__line_height( ) )
+
+    def __update_wrap( self ) -> None:
+        """
+            Keep wrap width and lines heights up to date
+        """
+
+        if not self._wrap:
+            return
+
+        width       = max( self._size.x - self._gutter - EDITOR_PADDING, self.__line_height( ) )
+        line_count  = self._document.line_count( )
+
+        # Heights of lines that were not laid out yet are one row, they are set when drawn
+        if self._heights is None or width != self._wrap_width:
+            self._wrap_width    = width
+            self._lines         = { }
+            self._heights       = c_line_heights( line_count, self.__line_height( ) )
+
+            return
+
+        # Lines count of mapped files changes while they are indexed
+        if len( self._heights ) != line_count:
+            self._heights.resize( line_count )
+
+    def __wrap_breaks( self, text: str, offsets: list ) -> list:
+        """
+            Returns columns where rows of a wrapped line start, breaks after spaces when it can
+        """
+
+        width   = self._wrap_width
+        breaks  = [ 0 ]
+        start   = 0
+
+        while offsets[ -1 ] - offsets[ start ] > width:
+            # Last column that fits, at least one char per row
+            end = max( bisect.bisect_right( offsets, offsets[ start ] + width ) - 1, start + 1 )
+
+            space = text.rfind( " ", start, end )
+
+            if space >= start:
+                end = space + 1
+
+            breaks.append( end )
+            start = end
+
+        return breaks
+
+    def __layout_line( self, line: int ) -> tuple:
+        """
+            Returns cached ( text, x offsets, rows start columns ) of a line.
+            x offsets has one more item than text (line end)
+        """
+
+        layout = self._lines.get( line )
+
+        if layout is None:
+            text        = self._document.line( line )
+            advances    = self._render.advances( self._font )
+            offsets     = [ 0.0 ]
+            offset      = 0.0
+
+            for char in text:
+                advance = advances.get( char )
+
+                if advance is None:
+                    advance = self._render.advance( self._font, char )
+
+                offset += advance
+                offsets.append( offset )
+
+            breaks = [ 0 ]
+
+            # Wrapped height is known only now, O(log n) update
+            if self._heights is not None:
+                breaks = self.__wrap_breaks( text, offsets )
+
+                if line < len( self._heights ):
+                    self._heights.set( line, len( breaks ) * self.__line_height( ) )
+
+            layout = ( text, offsets, breaks )
+            self._lines[ line ] = layout
+
+        return layout
+
+    def __release_hidden_lines( self, first: int, last: int ) -> None:
+        """
+            Keep the line cache close to the view size
+        """
+
+        if len( self._lines ) <= ( last - first ) * 4 + EDITOR_OVERSCAN:
+            return
+
+        self._lines = { line: layout for line, layout in self._lines.items( ) if first <= line < last }
+
+    def __scroll_to_caret( self ) -> None:
+        """
+            Scroll so the caret line is visible
+        """
+
+        if self._line_height == 0:
+            return
+
+        line, column    = self._document.position( self._caret )
+        top             = self.__line_y( line )
+
+        # Row of a wrapped line, only if it was laid out (this can be called outside of a frame)
+        layout = self._lines.get( line )
+
+        if layout is not None:
+            top += ( bisect.bisect_right( layout[ 2 ], column ) - 1 ) * self._line_height
+
+        bottom = top + self._line_height + EDITOR_PADDING * 2
+
+        if top < self._scroll:
+            self._scroll = top
+
+        elif bottom > self._scroll + self._size.y:
+            self._scroll = bottom - self._size.y
+
+    def __clamp_scroll( self ) -> None:
+        """
+            Keep scroll inside the document
+        """
+
+        if self._heights is not None:
+            height = self._heights.total( ) + EDITOR_PADDING * 2
+        else:
+            height = self._document.line_count( ) * self.__line_height( ) + EDITOR_PADDING * 2
+
+        self._scroll = max( 0, min( self._scroll, height - self._size.y ) )
+
+    def __preform_click( self, scroll: float ) -> None:
+        """
+            Resolve pending click to caret offset
+        """
+
+        if self._click is None:
+            return
+
+        click       = self._click
+        self._click = None
+
+        line_height = self.__line_height( )
+        y           = click.y - self._position.y - EDITOR_PADDING + scroll
+
+        if self._heights is not None:
+            line, inside = self._heights.line_at( y )
+        else:
+            line    = int( y / line_height )
+            inside  = y - line * line_height
+
+        line = max( 0, min( line, self._document.line_count( ) - 1 ) )
+
+        _, offsets, breaks = self.__layout_line( line )
+
+        row     = max( 0, min( int( inside / line_height ), len( breaks ) - 1 ) )
+        start   = breaks[ row ]
+
+        # Row end. the last column of a wrapped row is drawn on the next row
+        end = row + 1 < len( breaks ) and breaks[ row + 1 ] - 1 or len( offsets ) - 1
+
+        # Binary search on the row x offsets
+        x       = click.x - self._position.x - self._gutter + offsets[ start ]
+        column  = max( bisect.bisect_right( offsets, x, start, end + 1 ) - 1, start )
+
+        if column < end and x >= ( offsets[ column ] + offsets[ column + 1 ] ) * 0.5:
+            column += 1
+
+        self._caret         = self._document.offset( line, column )
+        self._caret_column  = column
+
+        self._history.break_group( )
+
+    def position( self, new_position: vector = None ) -> vector | None:
+        """
+            Updates / returns current editor position
+        """
+
+        if new_position is None:
+            return self._position
+
+        self._position.x = new_position.x
+        self._position.y = new_position.y
+
+    def size( self ) -> vector:
+        """
+            Returns current editor size
+        """
+
+        return self._size.copy( )
+
+    def layout( self, node: any = None ) -> any:
+        """
+            Returns / Sets layout node that places the editor
+        """
+
+        if node is None:
+            return self._layout
+
+        self._layout = node
+
+    # endregion
+
+    # region : Input
+
+    def insert( self, text: str ) -> None:
+        """
+            Inserts text at the caret
+        """
+
+        if self._document.is_read_only( ):
+            return
+
+        self._document.insert( self._caret, text )
+
+        self._caret         += len( text )
+        self._caret_column  = self._document.position( self._caret )[ 1 ]
+
+        self.__scroll_to_caret( )
+
+    def pop( self ) -> str | None:
+        """
+            Removes char before the caret
+        """
+
+        if self._caret == 0 or self._document.is_read_only( ):
+            return None
+
+        self._caret -= 1
+        char = self._document.delete( self._caret, 1 )
+
+        self._caret_column = self._document.position( self._caret )[ 1 ]
+        self.__scroll_to_caret( )
+
+        return char
+
+    def undo( self ) -> None:
+        """
+            Undo the last edits group
+        """
+
+        if self._document.is_read_only( ):
+            return
+
+        caret = self._history.undo( )
+
+        if caret is not None:
+            self.caret( caret )
+
+    def redo( self ) -> None:
+
+        if self._document.is_read_only( ):
+            return
+
+        caret = self._history.redo( )
+
+        if caret is not None:
+            self.caret( caret )
+
+    def __event_document_change( self, event ) -> None:
+        """
+            Document was changed, drop only the affected lines layout
+        """
+
+        line    = event( "line" )
+        offset  = event( "offset" )
+
+        # Edits before the caret (remote users) move it. own edits are at the caret
+        if offset < self._caret:
+            self._caret = max( offset, self._caret - event( "removed" ) ) + event( "inserted" )
+
+        if event( "removed_lines" ) == 0 and event( "inserted_lines" ) == 0:
+            self._lines.pop( line, None )
+            return
+
+        # Lines after the edit keep their heights, new lines are one row until drawn
+        if self._heights is not None:
+            self._heights.remove( line + 1, event( "removed_lines" ) )
+            self._heights.insert( line + 1, event( "inserted_lines" ) )
+
+        # Lines after the edit moved
+        self._lines = { index: layout for index, layout in self._lines.items( ) if index < line }
+
+        if self._caret > len( self._document ):
+            self._caret = len( self._document )
+
+    def __event_mouse_position( self, event ) -> None:
+        """
+            Mouse Position change callback
+        """
+
+        self._mouse_position.x = event( "x" )
+        self._mouse_position.y = event( "y" )
+
+        self._is_hovered = self._mouse_position.is_in_bounds( self._position, self._size.x, self._size.y )
+
+    def __event_mouse_input( self, event ) -> None:
+        """
+            Mouse buttons input callback
+        """
+
+        button = event( "button" )
+        action = event( "action" )
+
+        if button != glfw.MOUSE_BUTTON_LEFT or action != glfw.PRESS:
+            return
+
+        if not self._is_hovered:
+            self._is_typing = False
+            return
+
+        self._is_typing = True
+
+        # Resolved on draw, where line layout can be measured
+        self._click = self._mouse_position.copy( )
+
+    def __event_mouse_scroll( self, event ) -> None:
+        """
+            Mouse scroll input callback
+        """
+
+        if not self._is_hovered or self._line_height == 0:
+            return
+
+        self._scroll -= event( "y_offset" ) * self._line_height * EDITOR_SCROLL_LINES
+        self.__clamp_scroll( )
+
+    def __event_char_input( self, event ) -> None:
+        """
+            Captures what char was pressed
+        """
+
+        if not self._is_typing:
+            return
+
+        self.insert( chr( event( "char" ) ) )
+
+    def __event_keyboard_input( self, event ) -> None:
+        """
+            General keyboard input handle
+        """
+
+        if not self._is_typing:
+            return
+
+        key     = event( "key" )
+        action  = event( "action" )
+        mods    = event( "mods" )
+
+        if action != glfw.PRESS and action != glfw.REPEAT:
+            return
+
+        if key == glfw.KEY_ENTER:
+            self.insert( "\n" )
+
+        elif key == glfw.KEY_TAB:
+            self.insert( EDITOR_TAB )
+
+        elif key == glfw.KEY_BACKSPACE:
+            self.pop( )
+
+        elif key == glfw.KEY_DELETE:
+            if not self._document.is_read_only( ):
+                self._document.delete( self._caret, 1 )
+
+        elif key == glfw.KEY_V and mods & glfw.MOD_CONTROL and action == glfw.PRESS:
+            result: bytes = glfw.get_clipboard_string( None )
+
+            if result:
+                self.insert( result.decode( ).replace( "\r\n", "\n" ) )
+
+        elif key == glfw.KEY_Z and mods & glfw.MOD_CONTROL:
+            if mods & glfw.MOD_SHIFT:
+                self.redo( )
+            else:
+                self.undo( )
+
+        elif key == glfw.KEY_Y and mods & glfw.MOD_CONTROL:
+            self.redo( )
+
+        elif key == glfw.KEY_ESCAPE:
+            self._is_typing = False
+
+        else:
+            self.__move_handle( key )
+
+    def __move_handle( self, key ) -> None:
+        """
+            Caret movement keys
+        """
+
+        document        = self._document
+        line, column    = document.position( self._caret )
+
+        # By chars of the line, offsets of mapped files are bytes
+        if key == glfw.KEY_LEFT:
+            if column > 0:
+                self.caret( document.offset( line, column - 1 ) )
+
+            elif line > 0:
+                self.caret( document.line_end( line - 1 ) )
+
+        elif key == glfw.KEY_RIGHT:
+            if self._caret < document.line_end( line ):
+                self.caret( document.offset( line, column + 1 ) )
+
+            elif line + 1 < document.line_count( ):
+                self.caret( document.line_start( line + 1 ) )
+
+        elif key == glfw.KEY_HOME:
+            self.caret( document.line_start( line ) )
+
+        elif key == glfw.KEY_END:
+            self.caret( document.line_end( line ) )
+
+        elif key in ( glfw.KEY_UP, glfw.KEY_DOWN, glfw.KEY_PAGE_UP, glfw.KEY_PAGE_DOWN ):
+            step = 1
+
+            if key in ( glfw.KEY_PAGE_UP, glfw.KEY_PAGE_DOWN ) and self._line_height > 0:
+                step = max( int( self._size.y / self._line_height ) - 1, 1 )
+
+            if key in ( glfw.KEY_UP, glfw.KEY_PAGE_UP ):
+                step = -step
+
+            # Keep the wanted column while moving between short lines
+            wanted          = self._caret_column
+            self._caret     = document.offset( line + step, wanted )
+            self._caret_column = wanted
+
+            self._history.break_group( )
+            self.__scroll_to_caret( )
+
+    # endregion
+
+
+class c_tree_row:
+    """
+        Drawn row of c_tree_view. Rows are reused for other nodes while scrolling
+    """
+
+    _node:      int     # Shown node
+    _text:      str     # Marker and name
+    _indent:    float   # Text x from the row start
+
+    def __init__( self ):
+
+        self._node      = INVALID
+        self._text      = ""
+        self._indent    = 0
+
+    def bind( self, model: c_tree_model, node: int ) -> None:
+        """
+            Show node in this row
+        """
+
+        self._node      = node
+        self._indent    = model.depth( node ) * TREE_INDENT
+
+        if model.is_folder( node ):
+            self._text = ( model.is_expanded( node ) and TREE_FOLDER_OPEN or TREE_FOLDER_CLOSED ) + model.name( node )
+        else:
+            self._text = model.name( node )
+
+    def node( self ) -> int:
+
+        return self._node
+
+    def text( self ) -> str:
+
+        return self._text
+
+    def indent( self ) -> float:
+
+        return self._indent
+
+
+class c_tree_view:
+    """
+        Scrollable tree of paths (project files browser).
+
+        Only the rows inside the view are drawn, and their row objects
+        are reused for new rows when scrolling, so frame time does not
+        depend on the number of files. Expanded state lives in the
+        c_tree_model, rows of nodes are O(log n) away.
+    """
+
+    _parent:            any             # c_scene parent
+    _index:             int             # tree handle
+
+    _position:          vector          # current tree position
+    _size:              vector          # current tree size
+
+    _font:              any             # Rows font
+    _model:             c_tree_model    # Shown tree
+    _callback:          any             # Called with the path of a clicked file
+
+    _render:            c_render        # parents render instance
+    _animations:        c_animations    # current tree animations handle
+    _layout:            any             # c_layout_item that places the tree (can be None)
+
+    # Private tree data
+    _is_hovered:        bool            # Is mouse over the tree
+    _row_height:        float           # Height of a row (0 until first draw)
+
+    _rows:              dict            # node -> c_tree_row drawn in the last frame
+    _pool:              list            # Unused c_tree_row objects
+    _visible:           tuple           # [first, last) rows drawn in the last frame
+
+    _selected:          int             # Selected node (INVALID if none)
+    _hovered:           int             # Node under the mouse (INVALID if none)
+    _scroll:            float           # Wanted scroll (animated)
+    _mouse_position:    vector          # Last mouse position
+    _click:             vector          # Pending click to resolve on draw (None if none)
+
+    def __init__( self, parent: any, font: any, position: vector, size: vector, model: c_tree_model = None, callback: any = None ):
+        """
+            Create new tree view instance
+        """
+
+        self._parent        = parent
+        self._index         = INVALID
+
+        self._position      = position.copy( )
+        self._size          = size.copy( )
+
+        self._font          = font
+        self._model         = model is not None and model or c_tree_model( )
+        self._callback      = callback
+
+        self._render        = self._parent.render( )
+        self._animations    = c_animations( )
+        self._layout        = None
+
+        # Finish set up process
+        self.__complete_attach( )
+        self.__complete_setup( )
+
+    def __complete_attach( self ) -> None:
+        """
+            Complete attach of current tree to its parent
+        """
+
+        # Attach this element instance
+        self._index = self._parent.attach_element( self )
+
+        # Attach events
+        self._parent.set_event( "mouse_position",   self.__event_mouse_position,    f"TreeView::{ self._index }" )
+        self._parent.set_event( "mouse_input",      self.__event_mouse_input,       f"TreeView::{ self._index }" )
+        self._parent.set_event( "mouse_scroll",     self.__event_mouse_scroll,      f"TreeView::{ self._index }" )
+
+    def __complete_setup( self ) -> None:
+        """
+            Set up all the data for the tree
+        """
+
+        self._is_hovered        = False
+        self._row_height        = 0
+
+        self._rows              = { }
+        self._pool              = [ ]
+        self._visible           = ( 0, 0 )
+
+        self._selected          = INVALID
+        self._hovered           = INVALID
+        self._scroll            = 0
+        self._mouse_position    = vector( )
+        self._click             = None
+
+        self._animations.prepare( "Scroll",         0 )
+        self._animations.prepare( "Background",     50 )
+
+    def index( self ) -> int:
+        """
+            Returns element handle in the parent scene
+        """
+
+        return self._index
+
+    def release( self ) -> None:
+        """
+            Release resources used by the tree
+        """
+
+        self._parent.unset_event( "mouse_position",   f"TreeView::{ self._index }" )
+        self._parent.unset_event( "mouse_input",      f"TreeView::{ self._index }" )
+        self._parent.unset_event( "mouse_scroll",     f"TreeView::{ self._index }" )
+
+        self._rows.clear( )
+        self._pool.clear( )
+
+    def model( self, new_model: c_tree_model = None ) -> c_tree_model | None:
+        """
+            Returns / Sets shown tree
+        """
+
+        if new_model is None:
+            return self._model
+
+        self._model = new_model
+        self.refresh( )
+
+        self._selected  = INVALID
+        self._scroll    = 0
+        self._animations.value( "Scroll", 0 )
+
+    def refresh( self ) -> None:
+        """
+            Bind all rows again. call after the model nodes changed
+        """
+
+        self._pool.extend( self._rows.values( ) )
+        self._rows.clear( )
+
+        if self._selected >= len( self._model ):
+            self._selected = INVALID
+
+        self.__clamp_scroll( )
+
+    def selected( self ) -> str | None:
+        """
+            Returns path of the selected node (None if none)
+        """
+
+        if self._selected == INVALID:
+            return None
+
+        return self._model.path( self._selected )
+
+    def reveal( self, path: str ) -> bool:
+        """
+            Expand the folders of path, select it and scroll to it. O(log n) per folder
+        """
+
+        row = self._model.reveal( path )
+
+        if row is None:
+            return False
+
+        self._selected = self._model.find( path )
+
+        # Expanded folders show new rows
+        self.refresh( )
+
+        if self._row_height == 0:
+            return True
+
+        top     = row * self._row_height
+        bottom  = top + self._row_height + TREE_PADDING * 2
+
+        if top < self._scroll or bottom > self._scroll + self._size.y:
+            self._scroll = top - ( self._size.y - self._row_height ) * 0.5
+            self.__clamp_scroll( )
+
+        return True
+
+    def visible_rows( self ) -> tuple:
+        """
+            Returns [first, last) rows drawn in the last frame
+        """
+
+        return self._visible
+
+    # region : Render
+
+    def draw( self, fade: float ) -> None:
+        """
+            Tree main draw function
+        """
+
+        self.__draw_animations( )
+
+        background  = self._animations.value( "Background" )
+        scroll      = self._animations.value( "Scroll" )
+
+        end_position = self._position + self._size
+
+        self._render.rect( self._position, end_position, COLOR_TREE_BACK.alpha_override( background ) * fade, 10 )
+
+        row_height  = self.__row_height( )
+        model       = self._model
+
+        # Click can expand / collapse a folder, before the rows are picked
+        self.__preform_click( scroll )
+
+        first   = max( int( scroll / row_height ) - TREE_OVERSCAN, 0 )
+        last    = min( int( ( scroll + self._size.y ) / row_height ) + 1 + TREE_OVERSCAN, model.rows( ) )
+
+        self._visible = ( first, last )
+
+        self.__update_rows( first, last )
+
+        self._render.push_clip_rect( self._position, end_position )
+
+        origin  = vector( self._position.x + TREE_PADDING, self._position.y + TREE_PADDING - scroll )
+        width   = self._size.x - TREE_PADDING * 2
+        offset  = ( row_height - self.__text_height( ) ) * 0.5
+
+        rects   = [ ]
+        texts   = [ ]
+
+        text_color      = COLOR_TREE_TEXT * fade
+        folder_color    = COLOR_TREE_FOLDER * fade
+
+        node = model.node( first ) if first < last else INVALID
+
+        # Next visible node is O(1) from the previous one
+        for row in range( first, last ):
+            y = origin.y + row * row_height
+
+            if node == self._selected:
+                rects.append( ( vector( origin.x, y ), vector( origin.x + width, y + row_height ), COLOR_TREE_SELECTED * fade ) )
+
+            elif node == self._hovered:
+                rects.append( ( vector( origin.x, y ), vector( origin.x + width, y + row_height ), COLOR_TREE_HOVER * fade ) )
+
+            row_object: c_tree_row = self._rows[ node ]
+            texts.append( ( vector( origin.x + row_object.indent( ), y + offset ), model.is_folder( node ) and folder_color or text_color, row_object.text( ) ) )
+
+            node = model.next( node )
+
+        self._render.rects( rects )
+
+        for position, clr, text in texts:
+            self._render.text_line( self._font, position, clr, text )
+
+        self._render.pop_clip_rect( )
+
+    def __update_rows( self, first: int, last: int ) -> None:
+        """
+            Give each visible node a row object. rows that left the view are reused
+        """
+
+        model   = self._model
+        rows    = { }
+
+        node = model.node( first ) if first < last else INVALID
+
+        for row in range( first, last ):
+            row_object = self._rows.pop( node, None )
+
+            if row_object is None:
+                row_object = self._pool and self._pool.pop( ) or c_tree_row( )
+                row_object.bind( model, node )
+
+            rows[ node ] = row_object
+            node = model.next( node )
+
+        # What is left scrolled out of the view
+        self._pool.extend( self._rows.values( ) )
+        self._rows = rows
+
+    def __draw_animations( self ) -> None:
+        """
+            Do the animations process
+        """
+
+        self._animations.update( )
+
+        self._animations.preform( "Background", self._is_hovered and 100 or 50, DEFAULT_SPEED )
+
+        # Smooth scrolling
+        self._animations.preform( "Scroll", self._scroll, TREE_SCROLL_SPEED, 0.5 )
+
+    def __text_height( self ) -> float:
+
+        return self._render.text_height( self._font )
+
+    def __row_height( self ) -> float:
+        """
+            Returns row height. measured once while drawing
+        """
+
+        if self._row_height == 0:
+            self._row_height = self.__text_height( ) + TREE_ROW_SPACING
+
+        return self._row_height
+
+    def __node_at( self, position: vector, scroll: float ) -> int:
+        """
+            Returns node under position (INVALID if none). O(log n)
+        """
+
+        if self._row_height == 0:
+            return INVALID
+
+        row = int( ( position.y - self._position.y - TREE_PADDING + scroll ) // self._row_height )
+
+        if row < 0 or row >= self._model.rows( ):
+            return INVALID
+
+        return self._model.node( row )
+
+    def __clamp_scroll( self ) -> None:
+        """
+            Keep scroll inside the rows
+        """
+
+        height = self._model.rows( ) * self._row_height + TREE_PADDING * 2
+
+        self._scroll = max( 0, min( self._scroll, height - self._size.y ) )
+
+    def __preform_click( self, scroll: float ) -> None:
+        """
+            Resolve pending click. folders toggle, files are selected
+        """
+
+        self._hovered = self.__node_at( self._mouse_position, scroll ) if self._is_hovered else INVALID
+
+        if self._click is None:
+            return
+
+        node        = self.__node_at( self._click, scroll )
+        self._click = None
+
+        if node == INVALID:
+            return
+
+        self._selected = node
+
+        if self._model.is_folder( node ):
+            self._model.toggle( node )
+
+            # Rows after the folder changed
+            self.refresh( )
+            return
+
+        if self._callback is not None:
+            self._callback( self._model.path( node ) )
+
+    def position( self, new_position: vector = None ) -> vector | None:
+        """
+            Updates / returns current tree position
+        """
+
+        if new_position is None:
+            return self._position
+
+        self._position.x = new_position.x
+        self._position.y = new_position.y
+
+    def size( self ) -> vector:
+        """
+            Returns current tree size
+        """
+
+        return self._size.copy( )
+
+    def layout( self, node: any = None ) -> any:
+        """
+            Returns / Sets layout node that places the tree
+        """
+
+        if node is None:
+            return self._layout
+
+        self._layout = node
+
+    # endregion
+
+    # region : Input
+
+    def __event_mouse_position( self, event ) -> None:
+        """
+            Mouse Position change callback
+        """
+
+        self._mouse_position.x = event( "x" )
+        self._mouse_position.y = event( "y" )
+
+        self._is_hovered = self._mouse_position.is_in_bounds( self._position, self._size.x, self._size.y )
+
+    def __event_mouse_input( self, event ) -> None:
+        """
+            Mouse buttons input callback
+        """
+
+        button = event( "button" )
+        action = event( "action" )
+
+        if button != glfw.MOUSE_BUTTON_LEFT or action != glfw.PRESS or not self._is_hovered:
+            return
+
+        # Resolved on draw, where the scroll of the frame is known
+        self._click = self._mouse_position.copy( )
+
+    def __event_mouse_scroll( self, event ) -> None:
+        """
+            Mouse scroll input callback
+        """
+
+        if not self._is_hovered or self._row_height == 0:
+            return
+
+        self._scroll -= event( "y_offset" ) * self._row_height * TREE_SCROLL_ROWS
+        self.__clamp_scroll( )
+
+    # endregion